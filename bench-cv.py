@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+CV Benchmark
+Times parse, validate, group, render and write of generate-html.py on synthetic CVs
+(same markdown conventions as CV_Jan_Musiedlak_final.md), keeps a JSON history and
+flags regressions against a saved baseline.
+"""
+
+import sys
+import io
+import json
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+import contextlib
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Callable
+
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_HISTORY = SCRIPT_DIR / '.cv-bench' / 'history.json'
+DEFAULT_BASELINE = SCRIPT_DIR / '.cv-bench' / 'baseline.json'
+STAGES = ('parse', 'validate', 'group', 'render', 'write', 'end_to_end')
+MIN_REGRESSION_MS = 0.5     # smaller slowdowns are timer and scheduler noise on ~1 ms stages
+
+
+def load_generator():
+    """Import generate-html.py (hyphenated file name → importlib)"""
+    spec = importlib.util.spec_from_file_location('generate_html', SCRIPT_DIR / 'generate-html.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# --- Synthetic corpus ---
+
+_WORDS = ('Produkt Strategie Organisation Entscheidung Priorisierung Outcome Hypothese Team Plattform '
+          'Discovery Kunden Zielbild Führung Verantwortung Experiment Roadmap Stakeholder Wachstum '
+          'Struktur Klarheit Fokus Umsetzung Markt Innovation Qualität Daten Analyse Kontext').split()
+_CITIES = ('Köln', 'Essen', 'Berlin', 'Hamburg', 'München', 'Dortmund', 'Solingen', 'Bochum')
+_MONTHS = ('Jan', 'Feb', 'Mär', 'Apr', 'Mai', 'Jun', 'Jul', 'Aug', 'Sep', 'Okt', 'Nov', 'Dez')
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = ' '.join(rng.choice(_WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + '.'
+
+
+def synthetic_cv(jobs: int = 10, bullets: int = 5, seed: int = 0) -> str:
+    """Markdown CV with `jobs` stations of `bullets` bullets each (deterministic per seed)"""
+    rng = random.Random(seed)
+    lines = [
+        '# Max Mustermann',
+        '**Product Leader**',
+        f'*{_sentence(rng, 8)[:-1]}*',
+        '',
+        'Köln, Deutschland',
+        '📧 max@example.com',
+        '📞 +49 170 1234567',
+        '🔗 https://www.linkedin.com/in/max-mustermann',
+        '',
+        '---',
+        '',
+        '## Profil',
+        '',
+    ]
+    for _ in range(3):
+        lines += [_sentence(rng, 40), '']
+
+    lines += ['---', '', '## Berufserfahrung', '']
+    year = 2024
+    for j in range(jobs):
+        start = year - rng.randint(1, 4)
+        lines += [
+            f'### {rng.choice(_WORDS)} {rng.choice(_WORDS)} GmbH',
+            f'**{rng.choice(_WORDS)} Lead**',
+            f'*{rng.choice(_MONTHS)} {start} – {rng.choice(_MONTHS)} {year} | {rng.choice(_CITIES)}*',
+            '',
+        ]
+        if j % 2 == 0:
+            lines.append(_sentence(rng, 25))
+        lines += [f'- {_sentence(rng, 20)}' for _ in range(bullets)]
+        lines += ['', '---', '']
+        year = start
+
+    lines += ['## Ausbildung', '', '### Ruhr-Universität Bochum', 'Bachelor of Science (B.Sc.), Informatik',
+              f'*{year - 4} – {year}*', '', '---', '', '## Schwerpunkte', '', _sentence(rng, 30), '']
+    for _ in range(4):
+        lines += [f'### {rng.choice(_WORDS)} & {rng.choice(_WORDS)}', '', _sentence(rng, 35), '']
+    lines += ['### Prinzipien & Fokus', '']
+    lines += [f'- {rng.choice(_WORDS)} vor {rng.choice(_WORDS)}' for _ in range(max(3, bullets))]
+    lines += ['- ~']
+    lines += [f'- {rng.choice(_WORDS)} {rng.choice(_WORDS)}' for _ in range(max(3, bullets))]
+    lines += ['---', '## Haltung', '', _sentence(rng, 30), '']
+    for _ in range(4):
+        lines += [f'### {rng.choice(_WORDS)} vor {rng.choice(_WORDS)}', '', _sentence(rng, 30), '']
+    lines += ['---', '## Sprachen', '', '- Deutsch (Muttersprache)', '- Englisch (fließend)', '']
+    return '\n'.join(lines)
+
+
+# --- Measurement ---
+
+def _time(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Wall time of fn over `repeat` runs (ms)"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {'min_ms': round(min(samples), 3), 'median_ms': round(statistics.median(samples), 3)}
+
+
+def bench_case(gen, markdown: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Time every pipeline stage separately and end to end for one markdown document"""
+
+    template = gen.load_template()
+    with tempfile.TemporaryDirectory() as tmp:
+        md_path = Path(tmp) / 'cv.md'
+        out_path = Path(tmp) / 'index.html'
+        md_path.write_text(markdown, encoding='utf-8')
+
+        # Warnings from _validate would only add terminal I/O to the numbers
+        with contextlib.redirect_stderr(io.StringIO()):
+            parser = gen.CVParser(str(md_path))
+            generator = gen.HTMLGenerator(parser.data, template=template)
+            groups = generator._group_sections()
+            html = generator.generate()
+
+            def end_to_end():
+                data = gen.CVParser(str(md_path)).data
+                with open(out_path, 'w', encoding='utf-8') as stream:
+                    gen.HTMLGenerator(data, template=template).write_to(stream)
+
+            return {
+                'parse': _time(lambda: gen.CheckParser(str(md_path)), repeat),
+                'validate': _time(lambda: parser._validate(parser.data), repeat),
+                'group': _time(generator._group_sections, repeat),
+                'render': _time(lambda: generator._template(groups), repeat),
+                'write': _time(lambda: out_path.write_text(html, encoding='utf-8'), repeat),
+                'end_to_end': _time(end_to_end, repeat),
+            }
+
+
+def run(sizes: List[int], bullets: int, repeat: int) -> Dict[str, Any]:
+    gen = load_generator()
+    results = {}
+    for jobs in sizes:
+        markdown = synthetic_cv(jobs, bullets)
+        results[f'jobs={jobs},bullets={bullets}'] = {
+            'bytes': len(markdown.encode('utf-8')),
+            'stages': bench_case(gen, markdown, repeat),
+        }
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Stages more than `threshold` and MIN_REGRESSION_MS slower than the baseline – in the best run (the least
+    noisy) and in the median, so a single lucky baseline run doesn't fail the check"""
+    regressions = []
+    for case, current in results.items():
+        base = baseline.get('results', {}).get(case)
+        if not base:
+            continue
+        for stage in STAGES:
+            now = current['stages'][stage]['min_ms']
+            before = base['stages'].get(stage, {}).get('min_ms')
+            median_now = current['stages'][stage]['median_ms']
+            median_before = base['stages'].get(stage, {}).get('median_ms')
+            if not before or not median_before:
+                continue
+            if all(new > old * (1 + threshold) and new - old > MIN_REGRESSION_MS
+                   for new, old in ((now, before), (median_now, median_before))):
+                regressions.append(f'{case} {stage}: {before:.3f} ms → {now:.3f} ms (+{(now / before - 1) * 100:.0f} %)')
+    return regressions
+
+
+def print_table(results: Dict[str, Any]) -> None:
+    print(f"{'case':<24}{'KB':>7}" + ''.join(f'{s:>12}' for s in STAGES))
+    for case, r in results.items():
+        print(f"{case:<24}{r['bytes'] / 1024:>7.0f}" + ''.join(
+            f"{r['stages'][s]['median_ms']:>12.3f}" for s in STAGES))
+    print('(median ms)')
+
+
+def main():
+    """Main entry point"""
+    sizes = [10, 100, 1000]
+    bullets = 5
+    repeat = 5
+    history = DEFAULT_HISTORY
+    baseline_path = DEFAULT_BASELINE
+    save_baseline = False
+    threshold = 0.10
+    as_json = False
+
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '--jobs' and i+1 < len(sys.argv):
+            sizes = [int(n) for n in sys.argv[i+1].split(',')]
+            i += 2
+        elif sys.argv[i] == '--bullets' and i+1 < len(sys.argv):
+            bullets = int(sys.argv[i+1])
+            i += 2
+        elif sys.argv[i] == '--repeat' and i+1 < len(sys.argv):
+            repeat = int(sys.argv[i+1])
+            i += 2
+        elif sys.argv[i] == '--history' and i+1 < len(sys.argv):
+            history = Path(sys.argv[i+1])
+            i += 2
+        elif sys.argv[i] == '--baseline' and i+1 < len(sys.argv):
+            baseline_path = Path(sys.argv[i+1])
+            i += 2
+        elif sys.argv[i] == '--save-baseline':
+            save_baseline = True
+            i += 1
+        elif sys.argv[i] == '--threshold' and i+1 < len(sys.argv):
+            threshold = float(sys.argv[i+1])
+            i += 2
+        elif sys.argv[i] == '--json':
+            as_json = True
+            i += 1
+        elif sys.argv[i] in ('-h', '--help'):
+            print("Usage: python3 bench-cv.py [--jobs 10,100,1000] [--bullets N] [--repeat N] [--threshold 0.1]")
+            print("                           [--history FILE] [--baseline FILE] [--save-baseline] [--json]")
+            sys.exit(0)
+        else:
+            i += 1
+
+    record = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'repeat': repeat,
+        'results': run(sizes, bullets, repeat),
+    }
+
+    # Append to history
+    history.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        entries = json.loads(history.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        entries = []
+    entries.append(record)
+    history.write_text(json.dumps(entries, indent=1) + '\n', encoding='utf-8')
+
+    if as_json:
+        print(json.dumps(record, indent=1))
+    else:
+        print_table(record['results'])
+
+    if save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(record, indent=1) + '\n', encoding='utf-8')
+        print(f"✓ Baseline gespeichert: {baseline_path}")
+        return
+
+    try:
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        print(f"ℹ  Keine Baseline ({baseline_path}) – mit --save-baseline anlegen", file=sys.stderr)
+        return
+
+    regressions = compare(record['results'], baseline, threshold)
+    if regressions:
+        print(f"✗ Regressionen gegenüber Baseline {baseline.get('commit', '')} (> {threshold * 100:.0f} %):",
+              file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✓ Keine Regression gegenüber Baseline {baseline.get('commit', '')}")
+
+
+if __name__ == '__main__':
+    main()
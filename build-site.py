@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+CV Site Build
+Builds every page of the site from one dependency graph – markdown, templates, generator
+scripts and the assets each page references → output – and rebuilds only the pages whose
+inputs changed (content hashes, kept in .cv-build/state.json). Pages are independent of
+each other and render in parallel on a thread pool inside this one process.
+"""
+
+import sys
+import os
+import json
+import hashlib
+import time
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+
+SCRIPT_DIR = Path(__file__).parent
+STATE_PATH = SCRIPT_DIR / '.cv-build' / 'state.json'
+PAPER_TEMPLATE = 'positionierung-template.html'
+
+
+def load_generator():
+    """Import generate-html.py (hyphenated file name → importlib)"""
+    spec = importlib.util.spec_from_file_location('generate_html', SCRIPT_DIR / 'generate-html.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# --- Site graph: pages, their declared inputs and build options ---
+
+class Page:
+    """One output of the site (paths relative to SCRIPT_DIR)"""
+
+    __slots__ = ('output', 'kind', 'source', 'lang', 'photo')
+
+    def __init__(self, output: str, kind: str, source: Optional[str] = None, lang: str = 'de',
+                 photo: Optional[str] = None):
+        self.output = output
+        self.kind = kind            # 'cv' (generate-html.py), 'paper' (positioning paper) or 'static'
+        self.source = source
+        self.lang = lang
+        self.photo = photo          # relative to the output's directory, as written into the page
+
+    def inputs(self) -> List[str]:
+        """Declared inputs; the assets a page references are discovered when it is built"""
+        if self.kind == 'cv':
+            return [self.source, 'template.html', 'generate-html.py']
+        if self.kind == 'paper':
+            return [self.source, PAPER_TEMPLATE, 'build-site.py', 'generate-html.py']
+        return [self.output]        # checked in without a source: only its references are tracked
+
+    def options(self, stages: Dict[str, Any]) -> Dict[str, Any]:
+        """Everything besides file contents that changes the output"""
+        if self.kind == 'cv':
+            return {'lang': self.lang, 'photo': self.photo, 'stages': stages}
+        if self.kind == 'paper':
+            return {'stages': stages}
+        return {}
+
+
+PAGES = (
+    Page('index.html', 'cv', 'CV_Jan_Musiedlak_final.md', 'de', 'assets/Jan_Musiedlak_Foto.jpeg'),
+    Page('en/index.html', 'cv', 'CV_Jan_Musiedlak_en.md', 'en', '../assets/Jan_Musiedlak_Foto.jpeg'),
+    Page('positionierung.html', 'paper', 'positionierung.md'),
+    Page('plancraft/index.html', 'static'),     # tailored CV snapshot, its markdown is not in the tree
+)
+
+
+class Hashes:
+    """Content hash per file, computed at most once per build ('' for missing files)"""
+
+    def __init__(self):
+        self.digests: Dict[str, str] = {}
+
+    def __call__(self, rel: str) -> str:
+        digest = self.digests.get(rel)
+        if digest is None:
+            try:
+                digest = hashlib.sha256((SCRIPT_DIR / rel).read_bytes()).hexdigest()[:16]
+            except OSError:
+                digest = ''
+            self.digests[rel] = digest
+        return digest
+
+    def forget(self, rel: str) -> None:
+        self.digests.pop(rel, None)
+
+
+def _rel(path: Path) -> str:
+    return Path(os.path.relpath(path, SCRIPT_DIR)).as_posix()
+
+
+def stale_inputs(page: Page, entry: Optional[Dict[str, Any]], options: Dict[str, Any], hashes: Hashes) -> List[str]:
+    """Why page needs a rebuild – empty when every recorded input still has its recorded hash"""
+    if entry is None:
+        return ['neu']
+    if entry.get('options') != options:
+        return ['Optionen']
+    if page.kind != 'static' and hashes(page.output) != entry.get('output'):
+        return [f'{page.output} (Ausgabe geändert oder fehlt)']
+    deps = entry.get('deps', {})
+    return [rel for rel in page.inputs() if rel not in deps] + \
+           [rel for rel, digest in deps.items() if hashes(rel) != digest]
+
+
+# --- Positioning paper: positionierung.md → positionierung-template.html ---
+
+_LABEL = '<p class="font-mono text-[0.72rem] font-medium uppercase tracking-wider text-zinc-400 mb-{gap}">{title}</p>'
+_DIVIDER = '\n\n    <div class="border-t border-zinc-100 mb-10"></div>\n\n'
+_CONTAINERS = {
+    'text': '<div class="text-zinc-700 max-w-[44em] leading-relaxed space-y-3">',
+    'item': '<div class="space-y-5 max-w-[44em]">',
+    'bullet': '<div class="space-y-2 max-w-[44em]">',
+    'table': '<div class="grid grid-cols-[9rem_1fr] gap-x-6 gap-y-2.5 text-[0.88rem] max-w-[40em]">',
+}
+
+
+def _emphasis(text: str, mark: str) -> Optional[str]:
+    """Inner text of *text* / **text** (None if text isn't wrapped in exactly that mark)"""
+    if len(text) > 2 * len(mark) and text.startswith(mark) and text.endswith(mark):
+        inner = text[len(mark):-len(mark)]
+        if not inner.startswith('*') and not inner.endswith('*'):
+            return inner
+    return None
+
+
+def _paper_block(lines: List[str]) -> Tuple[str, Any]:
+    """Classify one markdown block: bullet list, table, **Title** + text item, or paragraph"""
+    if all(line.startswith('- ') for line in lines):
+        return 'bullet', [line[2:].strip() for line in lines]
+    if all(line.startswith('|') for line in lines):
+        rows = []
+        for line in lines:
+            cells = [cell.strip() for cell in line.strip().strip('|').split('|')]
+            if any(cells) and not all(set(cell) <= set('-: ') for cell in cells):
+                rows.append(cells)
+        return 'table', rows
+    title = _emphasis(lines[0], '**')
+    if title is not None and len(lines) > 1:
+        return 'item', (title, ' '.join(lines[1:]))
+    return 'text', ' '.join(lines)
+
+
+def parse_paper(markdown: str) -> Dict[str, Any]:
+    """# Title, **Role**, then ## sections separated by ---; lines after the last --- are the footer"""
+    paper: Dict[str, Any] = {'title': '', 'role': '', 'sections': [], 'footer': []}
+    blocks: Optional[List[Tuple[str, Any]]] = None
+    lines: List[str] = []
+
+    def flush():
+        if lines:
+            if blocks is not None:
+                blocks.append(_paper_block(lines))
+            elif paper['sections']:
+                paper['footer'] += lines
+            elif _emphasis(lines[0], '**') is not None:
+                paper['role'] = _emphasis(lines[0], '**')
+            lines.clear()
+
+    for raw in markdown.splitlines():
+        line = raw.strip()
+        if line.startswith('# '):
+            flush()
+            paper['title'] = line[2:].strip()
+        elif line.startswith('## '):
+            flush()
+            blocks = []
+            paper['sections'].append((line[3:].strip(), blocks))
+        elif line == '---':
+            flush()
+            blocks = None
+        elif not line:
+            flush()
+        else:
+            lines.append(line)
+    flush()
+    return paper
+
+
+def _paper_section(gen, title: str, blocks: List[Tuple[str, Any]], footer: List[str], last: bool) -> str:
+    esc = gen.html_escape
+    gap = 5 if any(kind == 'table' for kind, _ in blocks) else 4
+    out = [f'    <!-- {esc(title.split(",")[0])} -->',
+           f'    <section class="{"no-break" if last else "mb-10 no-break"}">',
+           '      ' + _LABEL.format(gap=gap, title=esc(title))]
+
+    # Consecutive blocks of the same kind share one container
+    groups: List[Tuple[str, List[Any]]] = []
+    for kind, value in blocks:
+        if groups and groups[-1][0] == kind:
+            groups[-1][1].append(value)
+        else:
+            groups.append((kind, [value]))
+
+    for kind, values in groups:
+        out.append('      ' + _CONTAINERS[kind])
+        for value in values:
+            if kind == 'text':
+                italic = _emphasis(value, '*')
+                out.append(f'        <p>{esc(value)}</p>' if italic is None
+                           else f'        <p class="text-zinc-500 italic">{esc(italic)}</p>')
+            elif kind == 'item':
+                out += ['        <div>',
+                        f'          <p class="font-medium text-zinc-900 mb-1">{esc(value[0])}</p>',
+                        f'          <p class="text-zinc-600 leading-relaxed">{esc(value[1])}</p>',
+                        '        </div>']
+            elif kind == 'bullet':
+                out += [f'        <div class="flex gap-3"><span class="text-zinc-300 mt-1 shrink-0">·</span>'
+                        f'<p class="text-zinc-600">{esc(bullet)}</p></div>' for bullet in value]
+            else:
+                for key, cell in value:
+                    strong = _emphasis(cell, '**')
+                    out.append(f'        <p class="text-zinc-400">{esc(_emphasis(key, "**") or key)}</p>')
+                    out.append(f'        <p class="text-zinc-800">{esc(cell)}</p>' if strong is None
+                               else f'        <p class="text-zinc-800 font-medium">{esc(strong)}</p>')
+        out.append('      </div>')
+
+    for i, line in enumerate(footer):
+        italic = _emphasis(line, '*')
+        margin = 'mt-1' if i else 'mt-8'
+        out.append(f'      <p class="text-zinc-400 text-[0.75rem] {margin}">{esc(line)}</p>' if italic is None
+                   else f'      <p class="text-zinc-400 text-[0.75rem] {margin} italic">{esc(italic)}</p>')
+    out.append('    </section>')
+    return '\n'.join(out)
+
+
+def render_paper(gen, markdown: str, template) -> str:
+    """Positioning paper page from its markdown (layout as in positionierung-template.html)"""
+    paper = parse_paper(markdown)
+    name, _, label = paper['title'].partition(' – ')
+    sections = paper['sections']
+    html_sections = [
+        _paper_section(gen, title, blocks, paper['footer'] if i == len(sections) - 1 else [], i == len(sections) - 1)
+        for i, (title, blocks) in enumerate(sections)
+    ]
+    return template.render({
+        'HEAD_TITLE': gen.html_escape(paper['title']),
+        'LABEL': gen.html_escape(label),
+        'NAME': gen.html_escape(name),
+        'ROLE': gen.html_escape(paper['role']),
+        'SECTIONS': _DIVIDER.join(html_sections),
+    })
+
+
+# --- Build ---
+
+def build_page(gen, page: Page, stages: Dict[str, Any], cache_dir: Optional[str],
+               fragments, write: bool = True) -> Tuple[List[Path], str, bool]:
+    """Render one page and write it unless unchanged (or write=False: the fingerprint pass writes it).
+    Returns the assets referenced before post-processing (stage inputs), the HTML and whether the file changed."""
+    output = SCRIPT_DIR / page.output
+    if page.kind == 'static':
+        return [], '', False
+    if page.kind == 'cv':
+        parser = gen.parse_markdown(SCRIPT_DIR / page.source, gen.model_cache_for(cache_dir))
+        variants = gen.prepare_photo(page.photo, stages['images'], str(output)) if stages.get('images') else None
+        sw_url = gen.service_worker_url(str(output), str(SCRIPT_DIR)) if stages.get('sw') else ''
+        template = gen.load_template(cache_dir=cache_dir)
+        stamp = None
+        if stages.get('reproducible') and gen.source_date_clock() is None:
+            markdown = (SCRIPT_DIR / page.source).read_bytes()
+            stamp = gen.input_stamp(markdown, template, page.photo, page.lang, stages, variants, sw_url)
+        generator = gen.HTMLGenerator(parser.data, page.photo, page.lang, template=template, fragment_cache=fragments,
+                                      photo_variants=variants, service_worker=sw_url, stamp=stamp)
+        raw = generator.generate()
+    else:
+        markdown = (SCRIPT_DIR / page.source).read_text(encoding='utf-8')
+        raw = render_paper(gen, markdown, gen.load_template(SCRIPT_DIR / PAPER_TEMPLATE, cache_dir))
+    html = gen.postprocess(raw, str(output), stages)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    changed = gen.write_if_changed(output, html) if write else False
+    refs = gen.local_refs(raw, output.parent)
+    if page.kind == 'cv' and stages.get('images'):
+        refs.append(output.parent / page.photo)     # the page only references its variants
+    return refs, html, changed
+
+
+def build_site(pages: List[Page], stages: Dict[str, Any], jobs: Optional[int] = None,
+               cache_dir: Optional[str] = None, force: bool = False, dry_run: bool = False) -> int:
+    """Rebuild the out-of-date pages in parallel, record their inputs; returns the number of failures"""
+    gen = load_generator()
+    fingerprint = bool(stages.get('fingerprint'))
+    try:
+        state = json.loads(STATE_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        state = {}
+    hashes = Hashes()
+
+    todo = []
+    for page in pages:
+        options = page.options(stages)
+        reasons = ['--force'] if force else stale_inputs(page, state.get(page.output), options, hashes)
+        if reasons:
+            todo.append(page)
+            print(f"↻ {page.output}: {', '.join(reasons)}")
+        else:
+            print(f"· {page.output}: aktuell")
+    if dry_run or not todo:
+        return 0
+
+    fragments = gen.fragment_cache_for(cache_dir) or gen.FragmentCache()
+    start = time.perf_counter()
+
+    documents: Dict[str, str] = {}
+    changed = set()
+
+    def run(page: Page) -> Tuple[Page, Optional[List[Path]], str, float]:
+        began = time.perf_counter()
+        try:
+            refs, html, written = build_page(gen, page, stages, cache_dir, fragments, write=not fingerprint)
+        except Exception as e:
+            return page, None, f'{type(e).__name__}: {e}', 0.0
+        if fingerprint and page.kind != 'static':
+            documents[str(SCRIPT_DIR / page.output)] = html
+        if written:
+            changed.add(str(SCRIPT_DIR / page.output))
+        return page, refs, '', (time.perf_counter() - began) * 1000
+
+    with ThreadPoolExecutor(max_workers=jobs or len(todo)) as pool:
+        results = list(pool.map(run, todo))
+    fragments.save()
+
+    built = [page for page, refs, error, _ in results if not error]
+    if fingerprint:
+        # Sequential pass: all pages share the asset manifest; each page is written once, with hashed names
+        changed.update(gen.fingerprint_pages(list(documents), str(SCRIPT_DIR), documents))
+    gen.report_pruned_subsets(gen.prune_font_subsets())
+    if stages.get('sw'):
+        # After fingerprinting: the precache lists the hashed names; pages built earlier keep their entries
+        gen.write_service_worker([str(SCRIPT_DIR / page.output) for page in built if page.kind == 'cv'],
+                                 str(SCRIPT_DIR))
+
+    failures = 0
+    for page, refs, error, ms in results:
+        if error:
+            failures += 1
+            print(f"✗ {page.output}: {error}", file=sys.stderr)
+            continue
+        output = SCRIPT_DIR / page.output
+        hashes.forget(page.output)
+        refs += gen.local_refs(output.read_text(encoding='utf-8'), output.parent)
+        deps = page.inputs() + [_rel(ref) for ref in refs]
+        for rel in dict.fromkeys(deps):
+            hashes.forget(rel)      # written by this build (subsets, photo variants, hashed copies)
+        record = {rel: hashes(rel) for rel in dict.fromkeys(deps)}
+        for rel, digest in record.items():
+            if not digest:
+                print(f"⚠  {page.output}: referenzierte Datei fehlt: {rel}", file=sys.stderr)
+        state[page.output] = {'options': page.options(stages), 'output': hashes(page.output), 'deps': record}
+        if page.kind == 'static':
+            print(f"✓ Geprüft: {page.output}")
+        elif str(output) in changed:
+            print(f"✓ Built: {page.output} ({ms:.0f} ms)")
+        else:
+            print(f"· Unverändert: {page.output} ({ms:.0f} ms, Datei nicht angefasst)")
+
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    gen.write_if_changed(STATE_PATH, json.dumps(state, indent=1, sort_keys=True) + '\n')
+    print(f"✓ {len(todo) - failures}/{len(pages)} Seiten neu gebaut ({(time.perf_counter() - start) * 1000:.0f} ms)")
+    return failures
+
+
+def main():
+    """Main entry point"""
+    stages = {}
+    jobs = None
+    cache_dir = None
+    force = False
+    dry_run = False
+    budget = False
+    budgets_file = None
+    only = None
+
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '-j' and i+1 < len(sys.argv):
+            jobs = int(sys.argv[i+1])
+            i += 2
+        elif sys.argv[i] == '--cache' and i+1 < len(sys.argv):
+            cache_dir = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--css' and i+1 < len(sys.argv):
+            stages['css'] = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--fonts' and i+1 < len(sys.argv):
+            stages['fonts'] = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--images' and i+1 < len(sys.argv):
+            stages['images'] = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--minify':
+            stages['minify'] = True
+            i += 1
+        elif sys.argv[i] == '--fingerprint':
+            stages['fingerprint'] = True        # part of the page options: switching it forces a rebuild
+            i += 1
+        elif sys.argv[i] == '--sw':
+            stages['sw'] = True
+            i += 1
+        elif sys.argv[i] == '--reproducible':
+            stages['reproducible'] = True
+            i += 1
+        elif sys.argv[i] == '--budget':
+            budget = True
+            i += 1
+        elif sys.argv[i] == '--budgets' and i+1 < len(sys.argv):
+            budget = True
+            budgets_file = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--force':
+            force = True
+            i += 1
+        elif sys.argv[i] in ('-n', '--dry-run'):
+            dry_run = True
+            i += 1
+        elif sys.argv[i] in ('-h', '--help'):
+            print("Usage: python3 build-site.py [PAGE...] [--force] [--dry-run] [-j JOBS] [--cache DIR]")
+            print("                             [--css inline] [--fonts SUBSET_DIR] [--images DIR] [--minify]")
+            print("                             [--fingerprint] [--sw] [--reproducible] [--budget] [--budgets FILE]")
+            print("Seiten: " + ', '.join(page.output for page in PAGES))
+            sys.exit(0)
+        elif not sys.argv[i].startswith('-'):
+            only = (only or []) + [sys.argv[i]]
+            i += 1
+        else:
+            i += 1
+
+    if stages.get('css', 'inline') != 'inline':
+        print("✗ Nur --css inline (alle Seiten würden dieselbe CSS-Datei überschreiben)", file=sys.stderr)
+        sys.exit(1)
+    pages = list(PAGES)
+    if only:
+        unknown = [name for name in only if name not in {page.output for page in PAGES}]
+        if unknown:
+            print(f"✗ Unbekannte Seite: {', '.join(unknown)} (bekannt: {', '.join(p.output for p in PAGES)})",
+                  file=sys.stderr)
+            sys.exit(1)
+        pages = [page for page in PAGES if page.output in only]
+
+    failures = build_site(pages, stages, jobs, cache_dir, force, dry_run)
+    if budget and not failures and not dry_run:
+        # Up-to-date pages are checked too: a budget file may have changed without any input
+        gen = load_generator()
+        try:
+            failures = gen.budget_pages([str(SCRIPT_DIR / page.output) for page in pages if page.kind != 'static'],
+                                        budgets_file)
+        except (OSError, ValueError) as e:
+            print(f"✗ Budgets: {e}", file=sys.stderr)
+            failures = 1
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
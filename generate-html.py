@@ -6,157 +6,571 @@ Generates HTML CV from structured markdown using Zinc-Teal Brand Kit (Geist font
 
 import sys
 import re
+import os
+import glob
+import json
+import hashlib
+import io
+import base64
+import gzip
+import shutil
+import contextlib
+import marshal
+import zlib
+import time
+import threading
+import textwrap
+import tracemalloc
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, TextIO, Tuple, Union
+from urllib.parse import quote, unquote
+
+
+TEMPLATE_PATH = Path(__file__).parent / 'template.html'
+
+
+class TemplateError(ValueError):
+    """Template placeholders and supplied values don't match"""
+
+
+class CompiledTemplate:
+    """template.html tokenized once into static segments and {{PLACEHOLDER}} slots"""
+
+    PLACEHOLDER = re.compile(r'\{\{([A-Z0-9_]+)\}\}')
+
+    def __init__(self, segments: List[str], slots: List[str], digest: str):
+        # len(segments) == len(slots) + 1: segment, slot, segment, slot, …, segment
+        self.segments = segments
+        self.slots = slots
+        self.digest = digest
+        self.placeholders = frozenset(slots)
+
+    @classmethod
+    def compile(cls, source: str) -> 'CompiledTemplate':
+        """Split template source on placeholders"""
+        parts = cls.PLACEHOLDER.split(source)
+        return cls(parts[0::2], parts[1::2], hashlib.sha256(source.encode('utf-8')).hexdigest())
+
+    def _check(self, values: Dict[str, Any]) -> None:
+        unknown = values.keys() - self.placeholders
+        if unknown:
+            raise TemplateError(f"Unbekannte Platzhalter: {', '.join(sorted(unknown))}")
+        missing = self.placeholders - values.keys()
+        if missing:
+            raise TemplateError(f"Fehlende Platzhalter: {', '.join(sorted(missing))}")
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Fill all slots with a single join – unknown or missing placeholders raise TemplateError"""
+        self._check(values)
+        parts = [self.segments[0]]
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            parts.append(values[slot])
+            parts.append(segment)
+        return ''.join(parts)
+
+    def iter_render(self, values: Dict[str, Union[str, Callable[[], Iterable[str]]]]) -> Iterator[str]:
+        """Yield the document chunk by chunk; a value may be a callable producing chunks (called per slot)"""
+        self._check(values)
+        yield self.segments[0]
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            value = values[slot]
+            if callable(value):
+                yield from value()
+            else:
+                yield value
+            yield segment
+
+
+# In-memory template cache: path → (mtime_ns, size, compiled)
+_template_cache: Dict[str, Tuple[int, int, CompiledTemplate]] = {}
+
+
+def load_template(path: Path = TEMPLATE_PATH, cache_dir: Optional[str] = None) -> CompiledTemplate:
+    """Load and compile template.html, cached in memory (by mtime) and optionally on disk (by content hash)"""
+    path = Path(path)
+    stat = path.stat()
+    key = str(path.resolve())
+    cached = _template_cache.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    source = path.read_text(encoding='utf-8')
+    compiled = None
+    if cache_dir:
+        digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        cache_file = Path(cache_dir) / f'template-{digest[:16]}.json'
+        try:
+            payload = json.loads(cache_file.read_text(encoding='utf-8'))
+            if payload['digest'] == digest:
+                compiled = CompiledTemplate(payload['segments'], payload['slots'], digest)
+        except (OSError, ValueError, KeyError):
+            pass
+        if compiled is None:
+            compiled = CompiledTemplate.compile(source)
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps({
+                'digest': digest, 'segments': compiled.segments, 'slots': compiled.slots,
+            }), encoding='utf-8')
+    else:
+        compiled = CompiledTemplate.compile(source)
+
+    _template_cache[key] = (stat.st_mtime_ns, stat.st_size, compiled)
+    return compiled
+
+
+def _tmp_path(target: Path) -> Path:
+    """Sibling temp file for an atomic write – unique per process and thread (both may race on one target)"""
+    return target.with_name(f'{target.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+
+
+def write_if_changed(target: Path, data: Union[str, bytes]) -> bool:
+    """Write via temp file + rename, or not at all when the file already holds these bytes; True if written"""
+    target = Path(target)
+    payload = data.encode('utf-8') if isinstance(data, str) else data
+    try:
+        if target.stat().st_size == len(payload) and target.read_bytes() == payload:
+            return False
+    except OSError:
+        pass
+    tmp = _tmp_path(target)
+    tmp.write_bytes(payload)
+    os.replace(tmp, target)
+    return True
+
+
+def _replace_if_changed(tmp: Path, target: Path) -> bool:
+    """Move a finished temp file over target – dropped instead when target is byte-identical; True if replaced"""
+    try:
+        same = target.stat().st_size == tmp.stat().st_size and target.read_bytes() == tmp.read_bytes()
+    except OSError:
+        same = False
+    if same:
+        tmp.unlink()
+        return False
+    os.replace(tmp, target)
+    return True
+
+
+# Fingerprint of this file: any change to the generators invalidates cached fragments
+GENERATOR_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+
+def source_date_clock() -> Optional[Callable[[], datetime]]:
+    """Clock fixed at $SOURCE_DATE_EPOCH (reproducible-builds.org), None when unset or invalid"""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH', '').strip()
+    if not epoch.isdigit():
+        return None
+    moment = datetime.fromtimestamp(int(epoch), timezone.utc)
+    return lambda: moment
+
+
+def input_stamp(markdown: bytes, template: 'CompiledTemplate', photo: str, lang: str, stages: Dict[str, Any],
+                photo_variants: Optional[Dict[str, Any]] = None, service_worker: str = '') -> str:
+    """Source-comment stamp derived from everything the page is built from – same input, same bytes.
+    Only the names of the content stages count: their directories are absolute paths that differ between checkouts."""
+    options = [photo, lang, sorted(key for key in ('css', 'fonts', 'images', 'minify') if stages.get(key)),
+               photo_variants, service_worker]
+    digest = hashlib.sha256()
+    for part in (markdown, template.digest.encode(), GENERATOR_VERSION.encode(),
+                 json.dumps(options, sort_keys=True).encode('utf-8')):
+        digest.update(hashlib.sha256(part).digest())
+    return f'input {digest.hexdigest()[:12]}'
+
+
+class FragmentCache:
+    """Content-addressed LRU cache for rendered section HTML, optionally persisted as JSON.
+    Safe to share between threads (build-site.py, CVRenderer)."""
+
+    def __init__(self, max_entries: int = 512, path: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self.entries: 'OrderedDict[str, str]' = OrderedDict()
+        self.lock = threading.Lock()    # get() reorders too
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self.fresh: Optional[Dict[str, str]] = None    # {} = collect put() entries for take_fresh() (batch workers)
+        if self.path:
+            self.load()
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Hash of the generator version and all inputs a fragment depends on"""
+        payload = json.dumps([GENERATOR_VERSION, *parts], sort_keys=True, ensure_ascii=False, default=_Record.astuple)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            html = self.entries.get(key)
+            if html is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return html
+
+    def put(self, key: str, html: str) -> None:
+        with self.lock:
+            self.entries[key] = html
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            if self.fresh is not None:
+                self.fresh[key] = html
+            self.dirty = True
+
+    def take_fresh(self) -> Dict[str, str]:
+        """Entries added since the last call (batch workers return these; the parent merges and saves once)"""
+        with self.lock:
+            fresh, self.fresh = self.fresh or {}, {}
+        return fresh
+
+    def merge(self, entries: Dict[str, str]) -> None:
+        """Add entries rendered elsewhere (another batch worker)"""
+        for key, html in entries.items():
+            self.put(key, html)
+
+    def load(self) -> None:
+        """Read persisted entries (least recently used first); a broken file just means a cold cache"""
+        try:
+            items = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        for key, html in items[-self.max_entries:]:
+            self.entries[key] = html
+
+    def save(self) -> None:
+        """Persist entries in LRU order (atomic replace)"""
+        if not self.path or not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            items = list(self.entries.items())
+        tmp = _tmp_path(self.path)
+        tmp.write_text(json.dumps(items, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+# Contact lines are recognized by these markers within the first CONTACT_SCAN_LINES lines
+_CONTACT_MARKERS = ('📧', '📞', '🔗', 'Deutschland', 'Germany')
+CONTACT_SCAN_LINES = 20
+_CONTACT_FIELDS = (('location', 'Ort'), ('email', 'E-Mail'), ('phone', 'Telefon'), ('linkedin', 'LinkedIn'))
+
+
+# --- Data model: compact records built by CVParser (optional fields are None when absent) ---
+
+class _Record:
+    """Base for the model records: fixed fields (__slots__), plain-tuple form for hashing and caching"""
+    __slots__ = ()
+
+    def astuple(self) -> tuple:
+        """Field values in __slots__ order, nested records and lists converted (marshal/JSON safe)"""
+        return tuple(_plain(getattr(self, field)) for field in self.__slots__)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: _plain_dict(getattr(self, field)) for field in self.__slots__}
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and self.astuple() == other.astuple()
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{field}={getattr(self, field)!r}' for field in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, _Record):
+        return value.astuple()
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _plain_dict(value: Any) -> Any:
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain_dict(v) for v in value]
+    return value
+
+
+class Contact(_Record):
+    __slots__ = ('location', 'email', 'phone', 'linkedin')
+
+    def __init__(self, location: Optional[str] = None, email: Optional[str] = None,
+                 phone: Optional[str] = None, linkedin: Optional[str] = None):
+        self.location = location
+        self.email = email
+        self.phone = phone
+        self.linkedin = linkedin
+
+
+class Header(_Record):
+    __slots__ = ('name', 'title', 'tagline', 'contact')
+
+    def __init__(self, name: Optional[str] = None, title: Optional[str] = None,
+                 tagline: Optional[str] = None, contact: Optional[Contact] = None):
+        self.name = name
+        self.title = title
+        self.tagline = tagline
+        self.contact = contact if contact is not None else Contact()
+
+
+class Item(_Record):
+    """Section-level content line: type 'text' (paragraph) or 'bullet'"""
+    __slots__ = ('type', 'text')
+
+    def __init__(self, type: str, text: str):
+        self.type = type
+        self.text = text
 
 
-class CVParser:
-    """Parse structured markdown CV into data model"""
+class Subsection(_Record):
+    """### entry – content holds paragraphs before the period, description the ones after it"""
+    __slots__ = ('title', 'content', 'job_title', 'period', 'description', 'bullets')
+
+    def __init__(self, title: str, content: Optional[List[str]] = None, job_title: Optional[str] = None,
+                 period: Optional[str] = None, description: Optional[List[str]] = None,
+                 bullets: Optional[List[str]] = None):
+        self.title = title
+        self.content = content if content is not None else []
+        self.job_title = job_title
+        self.period = period
+        self.description = description
+        self.bullets = bullets
 
-    def __init__(self, markdown_path: str):
-        self.markdown = Path(markdown_path).read_text(encoding='utf-8')
-        self.data = self._parse()
 
-    def _parse(self) -> Dict[str, Any]:
-        """Parse markdown into structured data"""
-        lines = self.markdown.split('\n')
-        data = {
-            'header': self._parse_header(lines),
-            'sections': self._parse_sections(lines)
-        }
-        self._validate(data)
-        return data
+class Section(_Record):
+    __slots__ = ('title', 'type', 'content', 'subsections')
 
-    def _parse_header(self, lines: List[str]) -> Dict[str, str]:
-        """Extract header information (name, title, tagline, contact)"""
-        header = {}
-
-        # Name (# Title)
-        for i, line in enumerate(lines):
-            if line.startswith('# '):
-                header['name'] = line[2:].strip()
-                # Title (**bold**)
-                if i+1 < len(lines) and lines[i+1].startswith('**'):
-                    title_text = lines[i+1]
-                    while '**' in title_text:
-                        title_text = title_text.replace('**', '')
-                    header['title'] = title_text.strip()
-                # Tagline (*italic*)
-                if i+2 < len(lines) and lines[i+2].startswith('*'):
-                    header['tagline'] = lines[i+2].strip('*').strip()
-                break
+    def __init__(self, title: str, type: str, content: Optional[List[Item]] = None,
+                 subsections: Optional[List[Subsection]] = None):
+        self.title = title
+        self.type = type
+        self.content = content if content is not None else []
+        self.subsections = subsections if subsections is not None else []
 
-        # Contact info
-        contact_lines = []
-        for line in lines[:20]:  # First 20 lines
-            if any(x in line for x in ['📧', '📞', '🔗', 'Deutschland', 'Germany']):
-                contact_lines.append(line)
 
-        header['contact'] = self._parse_contact(contact_lines)
-        return header
+class CV(_Record):
+    __slots__ = ('header', 'sections')
 
-    def _parse_contact(self, lines: List[str]) -> Dict[str, str]:
-        """Parse contact information"""
-        contact = {}
-        for line in lines:
-            if 'Deutschland' in line or 'Germany' in line:
-                contact['location'] = line.strip()
-            elif '📧' in line or '@' in line:
-                contact['email'] = line.replace('📧', '').strip()
-            elif '📞' in line or '+49' in line:
-                contact['phone'] = line.replace('📞', '').strip()
-            elif '🔗' in line or 'linkedin.com' in line:
-                contact['linkedin'] = line.replace('🔗', '').strip()
-        return contact
+    def __init__(self, header: Header, sections: List[Section]):
+        self.header = header
+        self.sections = sections
+
+    @classmethod
+    def from_tuple(cls, t: tuple) -> 'CV':
+        """Inverse of astuple()"""
+        (name, title, tagline, contact), sections = t
+        return cls(
+            Header(name, title, tagline, Contact(*contact)),
+            [Section(s_title, s_type, [Item(*item) for item in content], [Subsection(*sub) for sub in subs])
+             for s_title, s_type, content, subs in sections],
+        )
 
-    def _parse_sections(self, lines: List[str]) -> List[Dict[str, Any]]:
-        """Parse all sections after header"""
+
+class CVParser:
+    """Parse structured markdown CV into data model"""
+
+    def __init__(self, source: Union[str, Path, TextIO]):
+        """source: path to a markdown file or any readable text stream (consumed line by line)"""
+        # Diagnostics: ('name',) / ('contact', key) / (section_idx,) / (section_idx, sub_idx[, field]) → line
+        self.line_numbers: Dict[tuple, int] = {}
+        if hasattr(source, 'read'):
+            self.data = self._parse(source)
+        else:
+            with open(source, encoding='utf-8') as stream:
+                self.data = self._parse(stream)
+
+    @classmethod
+    def from_text(cls, markdown: str) -> 'CVParser':
+        """Parse markdown given as a string"""
+        return cls(io.StringIO(markdown, newline=None))
+
+    @classmethod
+    def from_model(cls, data: CV, line_numbers: Dict[tuple, int]) -> 'CVParser':
+        """Parser for an already parsed model (see ModelCache) – validation warnings still apply"""
+        parser = cls.__new__(cls)
+        parser.line_numbers = line_numbers
+        parser.data = data
+        parser._validate(data)
+        return parser
+
+    def _parse(self, stream: Iterable[str]) -> CV:
+        """Single pass over the stream: classify each line once, build header and sections together.
+        Titles, job titles and locations repeat across CVs and are interned."""
+        header = Header()
+        contact_lines = []
         sections = []
-        current_section = None
-        current_subsection = None
-
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-
-            # Section (## Title)
-            if line.startswith('## '):
-                if current_section:
-                    sections.append(current_section)
-
-                title = line[3:].strip()
-                current_section = {
-                    'title': title,
-                    'type': self._section_type(title),
-                    'content': [],
-                    'subsections': []
-                }
-                current_subsection = None
-
-            # Subsection (### Title)
-            elif line.startswith('### '):
-                if current_section:
-                    subtitle = line[4:].strip().strip('*').strip()
-                    current_subsection = {
-                        'title': subtitle,
-                        'content': []
-                    }
-                    current_section['subsections'].append(current_subsection)
-
-            # Job title (bold)
-            elif line.startswith('**') and current_subsection:
-                current_subsection['job_title'] = line.strip('*').strip()
-
-            # Period (italic)
-            elif line.startswith('*') and current_subsection and not line.startswith('**'):
-                current_subsection['period'] = line.strip('*').strip()
-
-            # Bullet point
-            elif line.startswith('- ') and current_section:
-                bullet = line[2:].strip()
-                if current_subsection:
-                    if 'bullets' not in current_subsection:
-                        current_subsection['bullets'] = []
-                    current_subsection['bullets'].append(bullet)
+        section = None
+        subsection = None
+        si = ssi = -1               # index of current section / subsection
+        name_line = 0
+        header_open = True          # until name, title, tagline and contact scan are done
+        lines = self.line_numbers
+        section_type = self._section_type
+        intern = sys.intern
+
+        for lineno, raw in enumerate(stream, 1):
+            # --- Header: name (# ), title (**bold**) and tagline (*italic*) on the two lines below
+            if header_open:
+                raw = raw.rstrip('\n')
+                if not name_line:
+                    if raw.startswith('# '):
+                        name_line = lineno
+                        header.name = raw[2:].strip()
+                        lines[('name',)] = lineno
+                elif lineno == name_line + 1:
+                    if raw.startswith('**'):
+                        header.title = intern(raw.replace('**', '').strip())
+                        lines[('title',)] = lineno
+                elif lineno == name_line + 2:
+                    if raw.startswith('*'):
+                        header.tagline = raw.strip('*').strip()
+                        lines[('tagline',)] = lineno
+
+                if lineno <= CONTACT_SCAN_LINES:
+                    if any(m in raw for m in _CONTACT_MARKERS):
+                        contact_lines.append((lineno, raw))
+                elif name_line and lineno > name_line + 2:
+                    header_open = False
+
+            # --- Body: dispatch on the first character of the stripped line
+            line = raw.strip()
+            if not line:
+                continue
+            first = line[0]
+
+            if first == '#':
+                # Section (## Title)
+                if line.startswith('## '):
+                    title = intern(line[3:].strip())
+                    section = Section(title, section_type(title))
+                    subsection = None
+                    si += 1
+                    ssi = -1
+                    lines[(si,)] = lineno
+                    sections.append(section)
+                # Subsection (### Title)
+                elif line.startswith('### ') and section is not None:
+                    subsection = Subsection(intern(line[4:].strip().strip('*').strip()))
+                    ssi += 1
+                    lines[(si, ssi)] = lineno
+                    section.subsections.append(subsection)
+                continue
+
+            if first == '*' and subsection is not None:
+                if line.startswith('**'):
+                    subsection.job_title = intern(line.strip('*').strip())
+                    lines[(si, ssi, 'job_title')] = lineno
                 else:
-                    current_section['content'].append({'type': 'bullet', 'text': bullet})
+                    subsection.period = line.strip('*').strip()
+                    lines[(si, ssi, 'period')] = lineno
+                continue
+
+            if first == '-':
+                # Bullet point
+                if line.startswith('- '):
+                    if section is not None:
+                        if subsection is None:
+                            section.content.append(Item('bullet', line[2:].strip()))
+                        elif subsection.bullets is not None:
+                            subsection.bullets.append(line[2:].strip())
+                        else:
+                            subsection.bullets = [line[2:].strip()]
+                    continue
+                if line.startswith('---'):
+                    continue
 
             # Regular paragraph
-            elif line and not line.startswith('#') and not line.startswith('---'):
-                if current_subsection:
-                    if 'period' in current_subsection and 'bullets' not in current_subsection:
-                        if 'description' not in current_subsection:
-                            current_subsection['description'] = []
-                        current_subsection['description'].append(line)
-                    elif 'bullets' not in current_subsection and 'period' not in current_subsection:
-                        current_subsection['content'].append(line)
-                elif current_section:
-                    current_section['content'].append({'type': 'text', 'text': line})
-
-            i += 1
-
-        if current_section:
-            sections.append(current_section)
+            if subsection is not None:
+                if subsection.bullets is None:
+                    if subsection.period is None:
+                        subsection.content.append(line)
+                    elif subsection.description is not None:
+                        subsection.description.append(line)
+                    else:
+                        subsection.description = [line]
+            elif section is not None:
+                section.content.append(Item('text', line))
+
+        header.contact = self._parse_contact(contact_lines)
+        data = CV(header, sections)
+        self._validate(data)
+        return data
 
-        return sections
+    def _parse_contact(self, lines: List[Tuple[int, str]]) -> Contact:
+        """Parse contact information from (line number, line) pairs"""
+        contact = Contact()
+        for lineno, line in lines:
+            if 'Deutschland' in line or 'Germany' in line:
+                key, value = 'location', line.strip()
+            elif '📧' in line or '@' in line:
+                key, value = 'email', line.replace('📧', '').strip()
+            elif '📞' in line or '+49' in line:
+                key, value = 'phone', line.replace('📞', '').strip()
+            elif '🔗' in line or 'linkedin.com' in line:
+                key, value = 'linkedin', line.replace('🔗', '').strip()
+            else:
+                continue
+            setattr(contact, key, sys.intern(value) if key == 'location' else value)
+            self.line_numbers[('contact', key)] = lineno
+        return contact
 
-    def _validate(self, data: Dict) -> None:
-        """Warn about likely markdown format issues (writes to stderr, never stops generation)"""
-        for section in data['sections']:
-            if section['type'] == 'berufserfahrung':
-                for sub in section['subsections']:
-                    if not sub.get('job_title'):
-                        print(f"⚠  Kein Jobtitel in Station: {sub['title']}", file=sys.stderr)
-                    if not sub.get('period'):
-                        print(f"⚠  Kein Zeitraum in Station: {sub['title']}", file=sys.stderr)
-            elif section['type'] == 'ausbildung':
-                for sub in section['subsections']:
-                    has_period = sub.get('period') or any(
+    def diagnostics(self, data: CV) -> List[Tuple[str, int, str, str]]:
+        """Format issues as (severity 'error'|'warning', line or 0, code, message) – errors make --check fail"""
+        found = []
+        line = self.line_numbers.get
+
+        def report(severity: str, key: tuple, code: str, message: str) -> None:
+            found.append((severity, line(key, 0), code, message))
+
+        h = data.header
+        if not h.name:
+            report('error', (), 'missing-name', 'Kein Name (erste Überschrift "# Name")')
+        elif not h.title:
+            report('warning', ('name',), 'missing-title', 'Kein Titel (**Titel** in der Zeile unter dem Namen)')
+        for key, label in _CONTACT_FIELDS:
+            if getattr(h.contact, key) is None:
+                report('warning', ('name',), 'missing-contact', f'Kontaktangabe fehlt: {label}')
+
+        for si, section in enumerate(data.sections):
+            if section.type == 'generic':
+                report('warning', (si,), 'generic-section',
+                       f'Unbekannter Abschnitt "{section.title}" – wird generisch dargestellt')
+            elif section.type == 'berufserfahrung':
+                for ssi, sub in enumerate(section.subsections):
+                    if not sub.job_title:
+                        report('warning', (si, ssi), 'missing-job-title', f'Kein Jobtitel in Station: {sub.title}')
+                    if not sub.period:
+                        report('warning', (si, ssi), 'missing-period', f'Kein Zeitraum in Station: {sub.title}')
+                    else:
+                        problem = _period_problem(sub.period)
+                        if problem:
+                            severity, message = problem
+                            report(severity, (si, ssi, 'period'),
+                                   'malformed-period' if severity == 'error' else 'unknown-period-word',
+                                   f'Zeitraum "{sub.period}" in Station {sub.title}: {message}')
+            elif section.type == 'ausbildung':
+                for ssi, sub in enumerate(section.subsections):
+                    has_period = sub.period or any(
                         '–' in l or re.match(r'\d{4}', l)
-                        for l in sub.get('content', [])
+                        for l in sub.content
                     )
                     if not has_period:
-                        print(f"⚠  Kein Zeitraum in Ausbildung: {sub['title']}", file=sys.stderr)
+                        report('warning', (si, ssi), 'missing-period', f'Kein Zeitraum in Ausbildung: {sub.title}')
+        return found
+
+    def _validate(self, data: CV) -> None:
+        """Warn about likely markdown format issues (writes to stderr, never stops generation)"""
+        for severity, lineno, code, message in self.diagnostics(data):
+            where = f' (Zeile {lineno})' if lineno else ''
+            print(f"{'✗ ' if severity == 'error' else '⚠ '} {message}{where}", file=sys.stderr)
 
     def _section_type(self, title: str) -> str:
         """Determine section type from title"""
@@ -177,6 +591,69 @@ class CVParser:
             return 'generic'
 
 
+# Bump whenever CVParser or the model records change what a markdown file parses to (cached models, index-cv.py)
+PARSER_VERSION = 1
+
+
+class ModelCache:
+    """Parsed CV models on disk (zlib-compressed marshal, one file per markdown hash), bounded by size"""
+
+    def __init__(self, directory: Path, max_bytes: int = 8 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.size: Optional[int] = None    # bytes on disk, counted once; other processes' writes show at evict()
+
+    def parse(self, markdown_file: Union[str, Path]) -> CVParser:
+        """CVParser for the file – loaded from the cache when content and parser version match"""
+        raw = Path(markdown_file).read_bytes()
+        # marshal's format depends on the Python version
+        version = f'{PARSER_VERSION}:{marshal.version}:{sys.version_info[0]}.{sys.version_info[1]}:'
+        key = hashlib.sha256(version.encode('ascii') + raw).hexdigest()[:32]
+        entry = self.directory / f'{key}.bin'
+        try:
+            data, line_numbers = marshal.loads(zlib.decompress(entry.read_bytes()))
+            os.utime(entry)        # mtime = last use, for eviction
+            self.hits += 1
+            return CVParser.from_model(CV.from_tuple(data), line_numbers)
+        except (OSError, EOFError, ValueError, TypeError, zlib.error):
+            pass
+
+        self.misses += 1
+        parser = CVParser.from_text(raw.decode('utf-8'))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.size is None:
+            self.evict()
+        tmp = _tmp_path(entry)
+        payload = zlib.compress(marshal.dumps((parser.data.astuple(), parser.line_numbers)), 6)
+        tmp.write_bytes(payload)
+        os.replace(tmp, entry)
+        self.size += len(payload)
+        if self.size > self.max_bytes:
+            self.evict()
+        return parser
+
+    def evict(self) -> None:
+        """Over max_bytes: drop least recently used models down to 3/4 of it, so a full cache isn't rescanned
+        on every miss. parse() scans once, then only when its running size passes the limit."""
+        entries = []
+        for path in self.directory.glob('*.bin'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes if total <= self.max_bytes else self.max_bytes * 3 // 4
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self.size = total
+
+
 # SVG icon strings for contact badges
 _SVG_LOCATION = (
     '<svg class="text-teal-400" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" width="14" height="14" fill="currentColor">'
@@ -211,13 +688,182 @@ _SVG_LINKEDIN = (
 )
 
 
+# --- Shared by all output formats: escaping, contact links, job periods, education entries ---
+
+_DEGREE_MARKERS = ('Bachelor', 'Master', 'B.Sc', 'M.Sc', 'Diplom')
+_METHOD_KEYWORDS = ('Methoden', 'Methods', 'Prinzipien', 'Principles')   # subsection titles rendered as pills
+_MONTHS = {'jan': 1, 'feb': 2, 'mär': 3, 'mar': 3, 'apr': 4, 'mai': 5, 'may': 5, 'jun': 6, 'jul': 7,
+           'aug': 8, 'sep': 9, 'okt': 10, 'oct': 10, 'nov': 11, 'dez': 12, 'dec': 12}
+# A word before a year is a month only when it starts with a _MONTHS key ("Sommer 2019" is just 2019)
+_DATE = re.compile(r'(?:\b(' + '|'.join(_MONTHS) + r')[a-zäöü]*\.?\s+)?(\d{4})', re.I)
+_WORD_BEFORE_YEAR = re.compile(r'([A-Za-zÄÖÜäöü]+)\.?\s+\d{4}')
+_OPEN_START = ('seit', 'since', 'ab', 'from')                       # "seit 2020": start of a current position
+_END_ONLY = ('bis', 'until')                                        # "bis 2019": end only
+_PERIOD_PREFIXES = _OPEN_START + _END_ONLY
+_PERIOD_SPLIT = re.compile(r'\s+[–-]\s+|\s*–\s*')
+OPEN_END = ('heute', 'today', 'present', 'now', 'jetzt')       # period end of a current position
+_PERIOD_WORD = re.compile(r'[a-zäöü]+')
+
+
+def html_escape(text: str) -> str:
+    """Escape HTML special characters"""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def contact_links(contact: Contact) -> List[Tuple[str, str, str]]:
+    """(kind, text, href) for each present contact field, in badge order – href is '' for the location"""
+    links = []
+    if contact.location is not None:
+        links.append(('location', contact.location, ''))
+    if contact.email is not None:
+        links.append(('email', contact.email, f'mailto:{contact.email}'))
+    if contact.phone is not None:
+        links.append(('phone', contact.phone, f'tel:{contact.phone.replace(" ", "")}'))
+    if contact.linkedin is not None:
+        url = contact.linkedin if contact.linkedin.startswith('http') else f'https://{contact.linkedin}'
+        links.append(('linkedin', url, url))
+    return links
+
+
+def split_period(period: Optional[str]) -> Tuple[str, str]:
+    """Job period line "Zeitraum | Ort" → (period, location)"""
+    period = period or ''
+    if '|' in period:
+        span, location = period.split('|', 1)
+        return span.strip(), location.strip()
+    return period, ''
+
+
+def iso_dates(period: str) -> Tuple[str, str]:
+    """"Jan 2021 – heute" → ('2021-01', ''): ISO 8601 year(-month) of start and end, '' when open/unknown"""
+    dates = []
+    for month, year in _DATE.findall(period):
+        number = _MONTHS.get(month.lower())
+        dates.append(f'{year}-{number:02d}' if number else year)
+    if len(dates) == 1 and period.strip().lower().startswith(_END_ONLY):     # "bis 2019": end only
+        return '', dates[0]
+    return (dates[0] if dates else ''), (dates[1] if len(dates) > 1 else '')
+
+
+def is_open_ended(period: str) -> bool:
+    """A current position: "2021 – heute" or "seit 2021" (whole words – "Nowhere 2021" is not open)"""
+    words = _PERIOD_WORD.findall(period.lower())
+    if not words:
+        return False
+    return words[-1] in OPEN_END or (words[0] in _OPEN_START and len(_DATE.findall(period)) == 1)
+
+
+def _period_problem(period: str) -> Optional[Tuple[str, str]]:
+    """What is wrong with a job period line "Zeitraum | Ort" as (severity, message), None if it parses cleanly.
+    'error' when no usable dates come out; 'warning' for a word before a year that is neither a month nor
+    seit/since/ab/from/bis/until ("Sommer 2019") – the year still counts."""
+    if period.count('|') > 1:
+        return 'error', "mehr als ein '|' (erwartet: Zeitraum | Ort)"
+    span, location = split_period(period)
+    if '|' in period and not location:
+        return 'error', "Ort nach '|' fehlt"
+    if not span:
+        return 'error', "Zeitraum vor '|' fehlt"
+    start, end = iso_dates(span)
+    if not start and not end:
+        return 'error', 'keine Jahreszahl'
+    parts = _PERIOD_SPLIT.split(span)
+    if len(parts) > 2:
+        return 'error', 'mehr als zwei Datumsangaben'
+    if len(parts) == 2 and not end and parts[1].strip().lower() not in OPEN_END:
+        return 'error', f'Ende "{parts[1].strip()}" ist weder Datum noch "heute"'
+    if start and end and (end[:4] < start[:4] or (len(end) > 4 and len(start) > 4 and end < start)):
+        return 'error', 'Ende liegt vor dem Beginn'
+    for word in _WORD_BEFORE_YEAR.findall(span):
+        if word[:3].lower() not in _MONTHS and word.lower() not in _PERIOD_PREFIXES:
+            return 'warning', f'unbekanntes Wort "{word}" vor der Jahreszahl'
+    return None
+
+
+def is_method_list(sub: Subsection) -> bool:
+    """Schwerpunkte subsection rendered as pills (Methoden, Prinzipien, …) rather than as a card"""
+    return any(kw in sub.title for kw in _METHOD_KEYWORDS)
+
+
+def method_pills(bullets: Optional[List[str]]) -> List[str]:
+    """Methoden bullets without the '~' colour switch"""
+    return [b for b in bullets or [] if b.strip() != '~']
+
+
+def job_heading(job: Subsection) -> str:
+    """"Jobtitel, Firma" – ### = Firma, **bold** = Jobtitel"""
+    job_title = job.job_title or ''
+    if job_title and job.title:
+        return f'{job_title}, {job.title}'
+    return job_title or job.title
+
+
+def zone_sections(sections: List[Section]) -> Dict[str, List[Section]]:
+    """Sections by background zone, in page order (white1: Profil, zinc50: jobs + education, white2: rest)"""
+    groups = {'white1': [], 'zinc50': [], 'white2': []}
+
+    for section in sections:
+        t = section.type
+        if t in ('profil',):
+            groups['white1'].append(section)
+        elif t in ('berufserfahrung', 'ausbildung'):
+            groups['zinc50'].append(section)
+        elif t in ('schwerpunkte', 'haltung', 'sprachen', 'generic'):
+            groups['white2'].append(section)
+
+    return groups
+
+
+def education_entries(section: Section) -> List[Tuple[str, str, str]]:
+    """(institution, degree, period) per entry – ### subsections, or a flat **Uni** / *period* fallback"""
+    entries = []
+    if section.subsections:
+        for edu in section.subsections:
+            degree = ''
+            period = ''
+            for line in edu.content:
+                if any(x in line for x in _DEGREE_MARKERS):
+                    degree = line
+                elif '–' in line or ' - ' in line or re.match(r'\d{4}', line):
+                    period = line
+            # If period is still empty, use the italic period parsed by the parser
+            if not period and edu.period is not None:
+                period = edu.period
+            entries.append((edu.title, degree, period))
+    else:
+        uni = ''
+        degree = ''
+        period = ''
+        for item in section.content:
+            text = item.text
+            if text.startswith('**') and text.endswith('**'):
+                uni = text.strip('*').strip()
+            elif text.startswith('*') and text.endswith('*'):
+                period = text.strip('*').strip()
+            elif any(x in text for x in _DEGREE_MARKERS):
+                degree = text
+        if uni:
+            entries.append((uni, degree, period))
+    return entries
+
+
 class HTMLGenerator:
     """Generate HTML from parsed CV data using Zinc-Teal Brand Kit"""
 
-    def __init__(self, data: Dict[str, Any], photo_path: str = 'assets/Jan_Musiedlak_Foto.jpeg', lang: str = 'de'):
+    def __init__(self, data: CV, photo_path: str = 'assets/Jan_Musiedlak_Foto.jpeg', lang: str = 'de',
+                 template: Optional[CompiledTemplate] = None, fragment_cache: Optional[FragmentCache] = None,
+                 photo_variants: Optional[Dict[str, Any]] = None, clock: Optional[Callable[[], datetime]] = None,
+                 service_worker: str = '', stamp: Optional[str] = None):
         self.data = data
         self.photo = photo_path
+        self.photo_variants = photo_variants  # From prepare_photo(): pre-cropped greyscale 1x/2x + placeholder
         self.lang = lang
+        self.template = template  # Pre-compiled template.html, else loaded via load_template()
+        self.fragment_cache = fragment_cache
+        # Source-comment timestamp: a fixed stamp (input_stamp), else the clock – $SOURCE_DATE_EPOCH when set
+        self.stamp = stamp
+        self.clock = clock or source_date_clock() or datetime.now
+        self.service_worker = service_worker  # sw.js URL relative to the page (service_worker_url), '' = no registration
         self.labels = self._get_labels()
 
     def _get_labels(self) -> Dict[str, str]:
@@ -241,12 +887,11 @@ class HTMLGenerator:
 
     def _get_timestamp(self) -> str:
         """Get current timestamp for source comment"""
-        from datetime import datetime
-        return datetime.now().strftime('%Y-%m-%d %H:%M')
+        return self.stamp or self.clock().strftime('%Y-%m-%d %H:%M')
 
     def _html_escape(self, text: str) -> str:
         """Escape HTML special characters"""
-        return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        return html_escape(text)
 
     def _badge(self, svg: str, text: str, href: str = '') -> str:
         """Render a teal contact badge – linked (href) or plain span"""
@@ -279,69 +924,79 @@ class HTMLGenerator:
 
     def generate(self) -> str:
         """Generate complete HTML"""
+        return ''.join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
+        """Generate the document as chunks (template segments and single sections)"""
         sections_by_group = self._group_sections()
-        return self._template(sections_by_group)
+        return self._template_chunks(sections_by_group)
+
+    def write_to(self, stream: TextIO) -> None:
+        """Stream the document into a text stream (file, socket.makefile('w'), …) section by section"""
+        for chunk in self.iter_chunks():
+            stream.write(chunk)
 
     def _group_sections(self) -> Dict[str, List]:
         """Group sections into the three background zones"""
-        groups = {'white1': [], 'zinc50': [], 'white2': []}
-
-        for section in self.data['sections']:
-            t = section['type']
-            if t in ('profil',):
-                groups['white1'].append(section)
-            elif t in ('berufserfahrung', 'ausbildung'):
-                groups['zinc50'].append(section)
-            elif t in ('schwerpunkte', 'haltung', 'sprachen', 'generic'):
-                groups['white2'].append(section)
-
-        return groups
+        return zone_sections(self.data.sections)
 
     def _template(self, sections_by_group: Dict) -> str:
-        """Load template.html and replace placeholders with generated content"""
-        lang_attr = 'en' if self.lang == 'en' else 'de'
-        name = self._html_escape(self.data['header'].get('name', ''))
-        title = self._html_escape(self.data['header'].get('title', ''))
-
-        # Generate section HTML for each zone
-        white1_html = self._generate_header() + '\n'.join(
-            self._generate_section(s) for s in sections_by_group['white1']
-        )
-        zinc50_html = '\n'.join(
-            self._generate_section(s) for s in sections_by_group['zinc50']
-        )
-        white2_html = '\n'.join(
-            self._generate_section(s) for s in sections_by_group['white2']
-        )
-
-        # Load template relative to this script
-        template_path = Path(__file__).parent / 'template.html'
-        html = template_path.read_text(encoding='utf-8')
-
-        replacements = {
-            '{{HEAD_TITLE}}':        f'{name} \u2013 {title}',
-            '{{GENERATED}}':         self._get_timestamp(),
-            '{{PHOTO}}':             self.photo,
-            '{{LANG}}':              lang_attr,
-            '{{ZONE_WHITE1}}':       white1_html,
-            '{{ZONE_ZINC50}}':       zinc50_html,
-            '{{ZONE_WHITE2}}':       white2_html,
-            '{{PRINT_LABEL}}':       self.labels['print'],
-            '{{SHARE_LABEL}}':       self.labels['share'],
-            '{{COPY_LINK_LABEL}}':   self.labels['copy_link'],
-            '{{SHARE_EMAIL_LABEL}}': self.labels['share_email'],
-            '{{LINK_COPIED_LABEL}}': self.labels['link_copied'],
-        }
-
-        for placeholder, value in replacements.items():
-            html = html.replace(placeholder, value)
+        """Fill the compiled template.html with generated content"""
+        return ''.join(self._template_chunks(sections_by_group))
 
+    def _template_chunks(self, sections_by_group: Dict) -> Iterator[str]:
+        """Compiled template.html with zones produced lazily, one section at a time"""
+        lang_attr = 'en' if self.lang == 'en' else 'de'
+        name = self._html_escape(self.data.header.name or '')
+        title = self._html_escape(self.data.header.title or '')
+
+        template = self.template or load_template()
+
+        return template.iter_render({
+            'HEAD_TITLE':        f'{name} \u2013 {title}',
+            'GENERATED':         self._get_timestamp(),
+            'PHOTO':             self.photo,
+            'LANG':              lang_attr,
+            'ZONE_WHITE1':       lambda: self._zone_chunks(sections_by_group['white1'], with_header=True),
+            'ZONE_ZINC50':       lambda: self._zone_chunks(sections_by_group['zinc50']),
+            'ZONE_WHITE2':       lambda: self._zone_chunks(sections_by_group['white2']),
+            'PRINT_LABEL':       self.labels['print'],
+            'SHARE_LABEL':       self.labels['share'],
+            'COPY_LINK_LABEL':   self.labels['copy_link'],
+            'SHARE_EMAIL_LABEL': self.labels['share_email'],
+            'LINK_COPIED_LABEL': self.labels['link_copied'],
+            'SW_REGISTER':       service_worker_script(self.service_worker),
+        })
+
+    def _zone_chunks(self, sections: List[Section], with_header: bool = False) -> Iterator[str]:
+        """One background zone: (header +) sections separated by newlines"""
+        if with_header:
+            yield self._cached(self._generate_header, 'header', self.data.header, self.photo,
+                               self.photo_variants)
+        for i, section in enumerate(sections):
+            if i:
+                yield '\n'
+            yield self._section_html(section)
+
+    def _cached(self, render: Callable[[], str], *inputs: Any) -> str:
+        """Render a fragment, reusing the fragment cache when its inputs are unchanged"""
+        if self.fragment_cache is None:
+            return render()
+        key = self.fragment_cache.key(self.lang, *inputs)
+        html = self.fragment_cache.get(key)
+        if html is None:
+            html = render()
+            self.fragment_cache.put(key, html)
         return html
 
+    def _section_html(self, section: Section) -> str:
+        """Section HTML via the fragment cache – Profil also depends on the header tagline"""
+        tagline = (self.data.header.tagline or '') if section.type == 'profil' else None
+        return self._cached(lambda: self._generate_section(section), 'section', section, tagline)
 
-    def _generate_section(self, section: Dict) -> str:
+    def _generate_section(self, section: Section) -> str:
         """Dispatch to correct section generator"""
-        t = section['type']
+        t = section.type
         if t == 'profil':
             return self._generate_profil(section)
         elif t == 'berufserfahrung':
@@ -359,42 +1014,40 @@ class HTMLGenerator:
 
     def _generate_header(self) -> str:
         """Generate header with portrait, name, title and teal contact badges"""
-        h = self.data['header']
-        contact = h.get('contact', {})
-        name = self._html_escape(h.get('name', ''))
-        title = self._html_escape(h.get('title', ''))
+        h = self.data.header
+        name = self._html_escape(h.name or '')
+        title = self._html_escape(h.title or '')
 
-        # Contact badges
+        # Contact badges – LinkedIn shows a label (print CSS appends the URL)
+        icons = {'location': _SVG_LOCATION, 'email': _SVG_EMAIL, 'phone': _SVG_PHONE, 'linkedin': _SVG_LINKEDIN}
         badges = []
-
-        if 'location' in contact:
-            loc = self._html_escape(contact['location'])
-            badges.append(self._badge(_SVG_LOCATION, loc))
-
-        if 'email' in contact:
-            email = self._html_escape(contact['email'])
-            badges.append(self._badge(_SVG_EMAIL, email, href=f'mailto:{email}'))
-
-        if 'phone' in contact:
-            phone = self._html_escape(contact['phone'])
-            phone_href = phone.replace(' ', '')
-            badges.append(self._badge(_SVG_PHONE, phone, href=f'tel:{phone_href}'))
-
-        if 'linkedin' in contact:
-            linkedin_url = contact['linkedin']
-            if not linkedin_url.startswith('http'):
-                linkedin_url = f'https://{linkedin_url}'
-            linkedin_url = self._html_escape(linkedin_url)
-            badges.append(self._badge(_SVG_LINKEDIN, 'LinkedIn', href=linkedin_url))
+        for kind, text, href in contact_links(h.contact):
+            label = 'LinkedIn' if kind == 'linkedin' else self._html_escape(text)
+            badges.append(self._badge(icons[kind], label, href=self._html_escape(href)))
 
         badges_html = '\n'.join(badges)
 
+        # Portrait: pre-cropped greyscale variants (responsive) or the original photo filtered by CSS
+        v = self.photo_variants
+        if v:
+            img_html = (
+                f'          <img src="{v["src"]}" srcset="{v["srcset"]}" sizes="{v["sizes"]}" alt="{name}"\n'
+                f'            width="{v["width"]}" height="{v["height"]}" decoding="async" fetchpriority="high"\n'
+                f'            class="w-[110px] h-[110px] rounded-full object-cover object-top flex-shrink-0"\n'
+                f'            style="-webkit-print-color-adjust: exact; print-color-adjust: exact; '
+                f'background-size: cover; background-image: url({v["placeholder"]});">'
+            )
+        else:
+            img_html = (
+                f'          <img src="{self.photo}" alt="{name}"\n'
+                f'            class="w-[110px] h-[110px] rounded-full object-cover object-top flex-shrink-0 grayscale"\n'
+                f'            style="-webkit-print-color-adjust: exact; print-color-adjust: exact;">'
+            )
+
         return f'''      <!-- Header -->
       <header class="mb-10">
         <div class="flex items-start gap-8">
-          <img src="{self.photo}" alt="{name}"
-            class="w-[110px] h-[110px] rounded-full object-cover object-top flex-shrink-0 grayscale"
-            style="-webkit-print-color-adjust: exact; print-color-adjust: exact;">
+{img_html}
           <div class="flex-1">
             <h1 class="text-[1.5em] font-medium text-zinc-900 mb-3 leading-[1.1]">{name}</h1>
             <p class="text-[1rem] text-zinc-700">{title}</p>
@@ -406,16 +1059,16 @@ class HTMLGenerator:
       </header>
 '''
 
-    def _generate_profil(self, section: Dict) -> str:
+    def _generate_profil(self, section: Section) -> str:
         """Generate Profil: tagline as hero statement, all content paragraphs as body"""
         # Tagline from header = hero statement
-        tagline = self.data['header'].get('tagline', '')
+        tagline = self.data.header.tagline or ''
         hero_html = ''
         if tagline:
             hero_html = f'      <p class="text-zinc-900 leading-[1.35] text-[1.4em] font-medium">\n        {self._html_escape(tagline)}\n      </p>\n'
 
         # All profil paragraphs → body (no special treatment for first)
-        paragraphs = [item['text'] for item in section['content'] if item['type'] == 'text']
+        paragraphs = [item.text for item in section.content if item.type == 'text']
         body_html = ''
         if paragraphs:
             body_items = [f'          <p>{self._html_escape(p)}</p>' for p in paragraphs]
@@ -426,46 +1079,31 @@ class HTMLGenerator:
 {hero_html}{body_html}      </section>
 '''
 
-    def _generate_berufserfahrung(self, section: Dict) -> str:
+    def _generate_berufserfahrung(self, section: Section) -> str:
         """Generate Berufserfahrung with grid timeline layout"""
-        label = self._html_escape(section['title'])
+        label = self._html_escape(section.title)
         jobs_html = []
 
-        for job in section['subsections']:
-            company = self._html_escape(job['title'])
-            job_title = self._html_escape(job.get('job_title', ''))
-            period_raw = job.get('period', '')
-
-            # Period may contain "Zeitraum | Ort" → split on |
-            period = ''
-            location = ''
-            if '|' in period_raw:
-                parts = period_raw.split('|', 1)
-                period = self._html_escape(parts[0].strip())
-                location = self._html_escape(parts[1].strip())
-            else:
-                period = self._html_escape(period_raw)
+        for job in section.subsections:
+            # Period may contain "Zeitraum | Ort"
+            period, location = (self._html_escape(part) for part in split_period(job.period))
 
             # Optional description
             description_html = ''
-            if 'description' in job:
-                desc = self._html_escape(' '.join(job['description']))
+            if job.description is not None:
+                desc = self._html_escape(' '.join(job.description))
                 description_html = f'\n              <p class="mt-2 text-zinc-600 max-w-[44em] leading-relaxed">{desc}</p>'
 
             # Bullets
             bullets_html = ''
-            if 'bullets' in job:
+            if job.bullets is not None:
                 items = '\n'.join([
                     f'                <li>{self._html_escape(b)}</li>'
-                    for b in job['bullets']
+                    for b in job.bullets
                 ])
                 bullets_html = f'\n              <ul class="mt-2 text-zinc-600 max-w-[44em] list-disc list-outside ml-4 space-y-1 leading-relaxed">\n{items}\n              </ul>'
 
-            # Heading: "Jobtitel, Firma" – ### = Firma, **bold** = Jobtitel
-            if job_title and company:
-                heading = f'{job_title}, {company}'
-            else:
-                heading = job_title or company
+            heading = self._html_escape(job_heading(job))
 
             location_html = ''
             if location:
@@ -489,51 +1127,16 @@ class HTMLGenerator:
       </section>
 '''
 
-    def _generate_ausbildung(self, section: Dict) -> str:
+    def _generate_ausbildung(self, section: Section) -> str:
         """Generate Ausbildung section"""
-        label = self._html_escape(section['title'])
+        label = self._html_escape(section.title)
         items_html = []
 
-        if section['subsections']:
-            for edu in section['subsections']:
-                uni = self._html_escape(edu['title'])
-                degree = ''
-                period = ''
-
-                for line in edu.get('content', []):
-                    if any(x in line for x in ['Bachelor', 'Master', 'B.Sc', 'M.Sc', 'Diplom']):
-                        degree = self._html_escape(line)
-                    elif '–' in line or ' - ' in line or re.match(r'\d{4}', line):
-                        period = self._html_escape(line)
-
-                # If period is still empty, check for italic period parsed by parser
-                if not period and 'period' in edu:
-                    period = self._html_escape(edu['period'])
-
-                degree_html = f'\n          <p class="text-zinc-600 text-[0.85rem]">{degree}</p>' if degree else ''
-                period_html = f'\n          <p class="text-zinc-500 text-[0.85rem]">{period}</p>' if period else ''
-
-                items_html.append(f'''        <div>
-          <p class="font-medium text-zinc-900 text-[1rem]">{uni}</p>{degree_html}{period_html}
-        </div>''')
-        else:
-            # Flat content fallback
-            uni = ''
-            degree = ''
-            period = ''
-            for item in section['content']:
-                text = item['text']
-                if text.startswith('**') and text.endswith('**'):
-                    uni = self._html_escape(text.strip('*').strip())
-                elif text.startswith('*') and text.endswith('*'):
-                    period = self._html_escape(text.strip('*').strip())
-                elif any(x in text for x in ['Bachelor', 'Master', 'B.Sc', 'M.Sc', 'Diplom']):
-                    degree = self._html_escape(text)
-
-            if uni:
-                degree_html = f'\n          <p class="text-zinc-600 text-[0.85rem]">{degree}</p>' if degree else ''
-                period_html = f'\n          <p class="text-zinc-500 text-[0.85rem]">{period}</p>' if period else ''
-                items_html.append(f'''        <div>
+        for uni, degree, period in education_entries(section):
+            uni, degree, period = self._html_escape(uni), self._html_escape(degree), self._html_escape(period)
+            degree_html = f'\n          <p class="text-zinc-600 text-[0.85rem]">{degree}</p>' if degree else ''
+            period_html = f'\n          <p class="text-zinc-500 text-[0.85rem]">{period}</p>' if period else ''
+            items_html.append(f'''        <div>
           <p class="font-medium text-zinc-900 text-[1rem]">{uni}</p>{degree_html}{period_html}
         </div>''')
 
@@ -546,12 +1149,12 @@ class HTMLGenerator:
       </section>
 '''
 
-    def _generate_schwerpunkte(self, section: Dict) -> str:
+    def _generate_schwerpunkte(self, section: Section) -> str:
         """Generate Schwerpunkte with hero intro, ref-card grid, ref-tag pills"""
-        label = self._html_escape(section['title'])
+        label = self._html_escape(section.title)
 
         # Intro paragraph(s)
-        intro_paragraphs = [item['text'] for item in section['content'] if item['type'] == 'text']
+        intro_paragraphs = [item.text for item in section.content if item.type == 'text']
         hero_html = ''
         if intro_paragraphs:
             hero = self._html_escape(intro_paragraphs[0])
@@ -561,19 +1164,19 @@ class HTMLGenerator:
         cards_html = []
         methoden_html = ''
 
-        for sub in section['subsections']:
-            if any(kw in sub['title'] for kw in ('Methoden', 'Methods', 'Prinzipien', 'Principles')):
+        for sub in section.subsections:
+            if is_method_list(sub):
                 # Pills — '~' in bullet list switches to alt color class
                 pills = []
                 tag_class = 'ref-tag'
-                for b in sub.get('bullets', []):
+                for b in sub.bullets or []:
                     if b.strip() == '~':
                         tag_class = 'ref-tag-alt'
                         continue
                     escaped_b = self._html_escape(b)
                     pills.append(f'            <span class="{tag_class}">{escaped_b}</span>')
                 pills_html = '\n'.join(pills)
-                methoden_title = self._html_escape(sub['title'])
+                methoden_title = self._html_escape(sub.title)
                 methoden_html = f'''        <div class="no-break">
           <p class="font-medium text-zinc-900 text-[1rem] mb-3">{methoden_title}</p>
           <div class="flex flex-wrap gap-2">
@@ -581,8 +1184,8 @@ class HTMLGenerator:
           </div>
         </div>'''
             else:
-                sub_title = self._html_escape(sub['title'])
-                description = self._html_escape(' '.join(sub.get('content', [])))
+                sub_title = self._html_escape(sub.title)
+                description = self._html_escape(' '.join(sub.content))
                 cards_html.append(self._render_card(sub_title, description))
 
         cards_section = '\n'.join(cards_html)
@@ -597,12 +1200,12 @@ class HTMLGenerator:
       </section>
 '''
 
-    def _generate_haltung(self, section: Dict) -> str:
+    def _generate_haltung(self, section: Section) -> str:
         """Generate Haltung with page-break label, hero intro, ref-card 2x2 grid"""
-        label = self._html_escape(section['title'])
+        label = self._html_escape(section.title)
 
         # Intro paragraph(s)
-        intro_paragraphs = [item['text'] for item in section['content'] if item['type'] == 'text']
+        intro_paragraphs = [item.text for item in section.content if item.type == 'text']
         hero_html = ''
         if intro_paragraphs:
             hero = self._html_escape(intro_paragraphs[0])
@@ -610,9 +1213,9 @@ class HTMLGenerator:
 
         # Cards
         cards_html = []
-        for sub in section['subsections']:
-            sub_title = self._html_escape(sub['title'])
-            description = self._html_escape(' '.join(sub.get('content', [])))
+        for sub in section.subsections:
+            sub_title = self._html_escape(sub.title)
+            description = self._html_escape(' '.join(sub.content))
             cards_html.append(self._render_card(sub_title, description))
 
         cards_section = '\n'.join(cards_html)
@@ -626,10 +1229,10 @@ class HTMLGenerator:
       </section>
 '''
 
-    def _generate_sprachen(self, section: Dict) -> str:
+    def _generate_sprachen(self, section: Section) -> str:
         """Generate Sprachen as simple text with · separator"""
-        label = self._html_escape(section['title'])
-        languages = [item['text'] for item in section['content'] if item['type'] == 'bullet']
+        label = self._html_escape(section.title)
+        languages = [item.text for item in section.content if item.type == 'bullet']
         languages_text = ' · '.join(self._html_escape(l) for l in languages)
 
         return f'''      <!-- Sprachen -->
@@ -639,15 +1242,15 @@ class HTMLGenerator:
       </section>
 '''
 
-    def _generate_generic(self, section: Dict) -> str:
+    def _generate_generic(self, section: Section) -> str:
         """Generate generic section"""
-        label = self._html_escape(section['title'])
+        label = self._html_escape(section.title)
         content_html = []
-        for item in section['content']:
-            if item['type'] == 'text':
-                content_html.append(f'        <p class="text-zinc-700 text-[0.95rem] mb-3">{self._html_escape(item["text"])}</p>')
-            elif item['type'] == 'bullet':
-                content_html.append(f'        <li class="text-zinc-700 text-[0.95rem]">• {self._html_escape(item["text"])}</li>')
+        for item in section.content:
+            if item.type == 'text':
+                content_html.append(f'        <p class="text-zinc-700 text-[0.95rem] mb-3">{self._html_escape(item.text)}</p>')
+            elif item.type == 'bullet':
+                content_html.append(f'        <li class="text-zinc-700 text-[0.95rem]">• {self._html_escape(item.text)}</li>')
 
         content_section = '\n'.join(content_html)
 
@@ -659,19 +1262,2132 @@ class HTMLGenerator:
 '''
 
 
+# --- Static CSS: build-time Tailwind subset (replaces the cdn.tailwindcss.com JIT) ---
+
+# Tailwind v3 palette (only the families used by the generators and site pages)
+_TW_PALETTE = {
+    'zinc': {'50': '#fafafa', '100': '#f4f4f5', '200': '#e4e4e7', '300': '#d4d4d8', '400': '#a1a1aa',
+             '500': '#71717a', '600': '#52525b', '700': '#3f3f46', '800': '#27272a', '900': '#18181b',
+             '950': '#09090b'},
+    'gray': {'50': '#f9fafb', '100': '#f3f4f6', '200': '#e5e7eb', '300': '#d1d5db', '400': '#9ca3af',
+             '500': '#6b7280', '600': '#4b5563', '700': '#374151', '800': '#1f2937', '900': '#111827',
+             '950': '#030712'},
+    'teal': {'50': '#f0fdfa', '100': '#ccfbf1', '200': '#99f6e4', '300': '#5eead4', '400': '#2dd4bf',
+             '500': '#14b8a6', '600': '#0d9488', '700': '#0f766e', '800': '#115e59', '900': '#134e4a',
+             '950': '#042f2e'},
+    'indigo': {'50': '#eef2ff', '100': '#e0e7ff', '200': '#c7d2fe', '300': '#a5b4fc', '400': '#818cf8',
+               '500': '#6366f1', '600': '#4f46e5', '700': '#4338ca', '800': '#3730a3', '900': '#312e81',
+               '950': '#1e1b4b'},
+}
+_TW_NAMED_COLORS = {'black': '#000000', 'white': '#ffffff', 'transparent': 'transparent', 'current': 'currentColor'}
+
+# Keep in sync with tailwind.config in template.html
+_TW_FONT_FAMILIES = {
+    'sans': "Geist, system-ui, -apple-system, sans-serif",
+    'mono': "'Geist Mono', ui-monospace, SFMono-Regular, monospace",
+    'pixel': "'Geist Pixel', ui-monospace, SFMono-Regular, monospace",
+}
+_TW_FONT_SIZES = {
+    'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'),
+}
+_TW_FONT_WEIGHTS = {'light': '300', 'normal': '400', 'medium': '500', 'semibold': '600', 'bold': '700'}
+_TW_LEADING = {'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625', 'loose': '2'}
+_TW_TRACKING = {'tighter': '-0.05em', 'tight': '-0.025em', 'normal': '0em', 'wide': '0.025em',
+                'wider': '0.05em', 'widest': '0.1em'}
+_TW_RADIUS = {'': '0.25rem', 'sm': '0.125rem', 'md': '0.375rem', 'lg': '0.5rem', 'xl': '0.75rem',
+              'full': '9999px', 'none': '0px'}
+_TW_MAX_WIDTH = {'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem', '2xl': '42rem',
+                 '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', 'full': '100%', 'none': 'none'}
+_TW_SHADOWS = {
+    '': '0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+    'md': '0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+    'xl': '0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)',
+}
+_TW_TRANSITION_COLORS = ('transition-property:color, background-color, border-color, text-decoration-color, fill, stroke;'
+                         'transition-timing-function:cubic-bezier(0.4, 0, 0.2, 1);transition-duration:150ms')
+
+# Utilities without a value part: class → (order group, declarations)
+_TW_STATIC = {
+    'absolute': ('position', 'position:absolute'), 'fixed': ('position', 'position:fixed'),
+    'relative': ('position', 'position:relative'), 'sticky': ('position', 'position:sticky'),
+    'mx-auto': ('margin', 'margin-left:auto;margin-right:auto'),
+    'block': ('display', 'display:block'), 'inline-block': ('display', 'display:inline-block'),
+    'inline': ('display', 'display:inline'), 'flex': ('display', 'display:flex'),
+    'grid': ('display', 'display:grid'), 'hidden': ('display', 'display:none'),
+    'flex-1': ('flex', 'flex:1 1 0%'), 'flex-shrink-0': ('flex-shrink', 'flex-shrink:0'),
+    'shrink-0': ('flex-shrink', 'flex-shrink:0'),
+    'cursor-pointer': ('cursor', 'cursor:pointer'),
+    'list-disc': ('list-type', 'list-style-type:disc'), 'list-none': ('list-type', 'list-style-type:none'),
+    'list-outside': ('list-position', 'list-style-position:outside'),
+    'list-inside': ('list-position', 'list-style-position:inside'),
+    'flex-wrap': ('flex-wrap', 'flex-wrap:wrap'), 'flex-col': ('flex-direction', 'flex-direction:column'),
+    'items-start': ('align', 'align-items:flex-start'), 'items-center': ('align', 'align-items:center'),
+    'items-end': ('align', 'align-items:flex-end'), 'items-baseline': ('align', 'align-items:baseline'),
+    'justify-start': ('justify', 'justify-content:flex-start'), 'justify-end': ('justify', 'justify-content:flex-end'),
+    'justify-center': ('justify', 'justify-content:center'),
+    'justify-between': ('justify', 'justify-content:space-between'),
+    'whitespace-nowrap': ('whitespace', 'white-space:nowrap'),
+    'border-solid': ('border-style', 'border-style:solid'), 'border-none': ('border-style', 'border-style:none'),
+    'object-cover': ('object-fit', 'object-fit:cover'), 'object-contain': ('object-fit', 'object-fit:contain'),
+    'object-top': ('object-position', 'object-position:top'),
+    'object-center': ('object-position', 'object-position:center'),
+    'text-left': ('text-align', 'text-align:left'), 'text-center': ('text-align', 'text-align:center'),
+    'text-right': ('text-align', 'text-align:right'),
+    'uppercase': ('text-transform', 'text-transform:uppercase'),
+    'italic': ('font-style', 'font-style:italic'),
+    'underline': ('decoration', 'text-decoration-line:underline'),
+    'no-underline': ('decoration', 'text-decoration-line:none'),
+    'grayscale': ('filter', 'filter:grayscale(100%)'),
+    'transition-colors': ('transition', _TW_TRANSITION_COLORS),
+}
+
+# Rule order follows Tailwind's core plugin order, so later groups win on conflicts
+_TW_ORDER = {name: i for i, name in enumerate((
+    'position', 'inset', 'z', 'margin', 'display', 'height', 'width', 'max-width', 'flex', 'flex-shrink',
+    'transform', 'cursor', 'list-position', 'list-type', 'grid-cols', 'flex-direction', 'flex-wrap', 'align',
+    'justify', 'gap', 'space', 'whitespace', 'rounded', 'border-width', 'border-style', 'border-color', 'bg',
+    'object-fit', 'object-position', 'padding', 'text-align', 'font-family', 'font-size', 'font-weight',
+    'text-transform', 'font-style', 'leading', 'tracking', 'color', 'decoration', 'shadow', 'filter',
+    'transition', 'duration',
+))}
+_TW_VARIANTS = {'hover': 1, 'focus': 2, 'print': 3, 'sm': 4, 'md': 5, 'lg': 6}
+_TW_SCREENS = {'sm': '640px', 'md': '768px', 'lg': '1024px'}
+
+# (prefix, order group, CSS properties); sub-order: shorthand < axis < side
+_TW_SPACING = {
+    'p': ('padding', 0, ('padding',)), 'px': ('padding', 1, ('padding-left', 'padding-right')),
+    'py': ('padding', 1, ('padding-top', 'padding-bottom')), 'pt': ('padding', 2, ('padding-top',)),
+    'pr': ('padding', 2, ('padding-right',)), 'pb': ('padding', 2, ('padding-bottom',)),
+    'pl': ('padding', 2, ('padding-left',)),
+    'm': ('margin', 0, ('margin',)), 'mx': ('margin', 1, ('margin-left', 'margin-right')),
+    'my': ('margin', 1, ('margin-top', 'margin-bottom')), 'mt': ('margin', 2, ('margin-top',)),
+    'mr': ('margin', 2, ('margin-right',)), 'mb': ('margin', 2, ('margin-bottom',)),
+    'ml': ('margin', 2, ('margin-left',)),
+    'inset': ('inset', 0, ('top', 'right', 'bottom', 'left')), 'top': ('inset', 2, ('top',)),
+    'right': ('inset', 2, ('right',)), 'bottom': ('inset', 2, ('bottom',)), 'left': ('inset', 2, ('left',)),
+    'gap': ('gap', 0, ('gap',)), 'gap-x': ('gap', 1, ('column-gap',)), 'gap-y': ('gap', 1, ('row-gap',)),
+    'w': ('width', 0, ('width',)), 'h': ('height', 0, ('height',)),
+}
+
+# Tailwind v3 preflight (condensed) – the base reset the CDN build injected
+_TW_PREFLIGHT = '''*,::before,::after{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb}
+html{line-height:1.5;-webkit-text-size-adjust:100%%;tab-size:4;font-family:%(sans)s;-webkit-tap-highlight-color:transparent}
+body{margin:0;line-height:inherit}
+hr{height:0;color:inherit;border-top-width:1px}
+h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}
+a{color:inherit;text-decoration:inherit}
+b,strong{font-weight:bolder}
+code,kbd,samp,pre{font-family:%(mono)s;font-size:1em}
+small{font-size:80%%}
+table{text-indent:0;border-color:inherit;border-collapse:collapse}
+button,input,optgroup,select,textarea{font-family:inherit;font-feature-settings:inherit;font-variation-settings:inherit;font-size:100%%;font-weight:inherit;line-height:inherit;letter-spacing:inherit;color:inherit;margin:0;padding:0}
+button,select{text-transform:none}
+button,input:where([type='button']),input:where([type='reset']),input:where([type='submit']){-webkit-appearance:button;background-color:transparent;background-image:none}
+summary{display:list-item}
+blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre{margin:0}
+ol,ul,menu{list-style:none;margin:0;padding:0}
+button,[role="button"]{cursor:pointer}
+img,svg,video,canvas,audio,iframe,embed,object{display:block;vertical-align:middle}
+img,video{max-width:100%%;height:auto}
+[hidden]{display:none}'''
+
+_TW_BLOCK = re.compile(r'[ \t]*<!-- TAILWIND.*?<!-- /TAILWIND -->\n?', re.S)
+_CLASS_ATTR = re.compile(r'class="([^"]*)"')
+_CLASS_LIST_JS = re.compile(r'classList\.(?:add|remove|toggle)\(\s*\'([^\']+)\'')
+_STYLE_BLOCK = re.compile(r'<style>(.*?)</style>', re.S)
+_CSS_CLASS_SELECTOR = re.compile(r'\.([A-Za-z_][\w-]*)')
+
+
+def _tw_length(value: str) -> Optional[str]:
+    """Spacing scale / fraction / arbitrary value → CSS length"""
+    if value.startswith('[') and value.endswith(']'):
+        return value[1:-1].replace('_', ' ')
+    if value in ('px', 'full', 'auto'):
+        return {'px': '1px', 'full': '100%', 'auto': 'auto'}[value]
+    if '/' in value:
+        a, _, b = value.partition('/')
+        if a.isdigit() and b.isdigit():
+            return f'{int(a) / int(b) * 100:g}%'
+        return None
+    try:
+        n = float(value)
+    except ValueError:
+        return None
+    return f'{n * 0.25:g}rem' if n else '0px'
+
+
+def _tw_color(value: str) -> Optional[str]:
+    """zinc-700 / black/30 / [#hex] → CSS color"""
+    if value.startswith('[') and value.endswith(']'):
+        return value[1:-1]
+    value, _, alpha = value.partition('/')
+    if value in _TW_NAMED_COLORS:
+        hex_color = _TW_NAMED_COLORS[value]
+    else:
+        family, _, shade = value.rpartition('-')
+        hex_color = _TW_PALETTE.get(family, {}).get(shade)
+    if hex_color is None:
+        return None
+    if alpha and hex_color.startswith('#'):
+        r, g, b = (int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+        return f'rgb({r} {g} {b} / {int(alpha) / 100:g})'
+    return hex_color
+
+
+def _tw_is_length(value: str) -> bool:
+    return bool(re.match(r'^-?[\d.]+(px|rem|em|%|vh|vw|mm|pt)?$', value))
+
+
+def _tw_utility(name: str) -> Optional[Tuple[str, int, str, str]]:
+    """Resolve one utility (without variants) → (order group, sub-order, selector suffix, declarations)"""
+    if name in _TW_STATIC:
+        group, decls = _TW_STATIC[name]
+        return group, 0, '', decls
+
+    negative = name.startswith('-')
+    if negative:
+        name = name[1:]
+
+    def neg(v: str) -> str:
+        return f'-{v}' if negative and v not in ('0px', 'auto') else v
+
+    for prefix in ('gap-x', 'gap-y', 'inset', 'translate-x', 'translate-y', 'space-x', 'space-y', 'max-w',
+                   'grid-cols', 'duration', 'leading', 'tracking', 'rounded', 'border', 'shadow', 'font',
+                   'text', 'bg', 'px', 'py', 'pt', 'pr', 'pb', 'pl', 'mx', 'my', 'mt', 'mr', 'mb', 'ml',
+                   'top', 'right', 'bottom', 'left', 'gap', 'p', 'm', 'w', 'h', 'z'):
+        if name == prefix:
+            value = ''
+        elif name.startswith(prefix + '-'):
+            value = name[len(prefix) + 1:]
+        else:
+            continue
+
+        if prefix in _TW_SPACING:
+            length = _tw_length(value)
+            if length is None:
+                return None
+            group, sub, props = _TW_SPACING[prefix]
+            return group, sub, '', ';'.join(f'{p}:{neg(length)}' for p in props)
+        if prefix in ('translate-x', 'translate-y'):
+            length = _tw_length(value)
+            if length is None:
+                return None
+            axis = prefix[-1]
+            return 'transform', 0, '', (f'--tw-translate-{axis}:{neg(length)};'
+                                        'transform:translate(var(--tw-translate-x, 0), var(--tw-translate-y, 0))')
+        if prefix in ('space-x', 'space-y'):
+            length = _tw_length(value)
+            if length is None:
+                return None
+            side = 'left' if prefix == 'space-x' else 'top'
+            return 'space', 0, ' > :not([hidden]) ~ :not([hidden])', f'margin-{side}:{neg(length)}'
+        if prefix == 'max-w':
+            width = _TW_MAX_WIDTH.get(value) or (_tw_length(value) if value.startswith('[') else None)
+            return ('max-width', 0, '', f'max-width:{width}') if width else None
+        if prefix == 'grid-cols':
+            if value.isdigit():
+                return 'grid-cols', 0, '', f'grid-template-columns:repeat({value}, minmax(0, 1fr))'
+            if value.startswith('['):
+                return 'grid-cols', 0, '', f'grid-template-columns:{_tw_length(value)}'
+            return None
+        if prefix == 'duration':
+            return ('duration', 0, '', f'transition-duration:{value}ms') if value.isdigit() else None
+        if prefix == 'leading':
+            height = _TW_LEADING.get(value) or (_tw_length(value) if value.startswith('[') else None)
+            return ('leading', 0, '', f'line-height:{height}') if height else None
+        if prefix == 'tracking':
+            spacing = _TW_TRACKING.get(value)
+            return ('tracking', 0, '', f'letter-spacing:{spacing}') if spacing else None
+        if prefix == 'rounded':
+            radius = _TW_RADIUS.get(value)
+            return ('rounded', 0, '', f'border-radius:{radius}') if radius else None
+        if prefix == 'shadow':
+            shadow = _TW_SHADOWS.get(value)
+            return ('shadow', 0, '', f'box-shadow:{shadow}') if shadow else None
+        if prefix == 'z':
+            return ('z', 0, '', f'z-index:{value}') if value.isdigit() else None
+        if prefix == 'border':
+            sides = {'': ('border-width',), 't': ('border-top-width',), 'r': ('border-right-width',),
+                     'b': ('border-bottom-width',), 'l': ('border-left-width',)}
+            side, _, width = value.partition('-') if value[:2] in ('t-', 'r-', 'b-', 'l-') else (value, '', '')
+            if value.isdigit():
+                side, width = '', value
+            if side in sides:
+                px = f'{width}px' if width else '1px'
+                return 'border-width', 0 if not side else 2, '', ';'.join(f'{p}:{px}' for p in sides[side])
+            color = _tw_color(value)
+            return ('border-color', 0, '', f'border-color:{color}') if color else None
+        if prefix == 'bg':
+            color = _tw_color(value)
+            return ('bg', 0, '', f'background-color:{color}') if color else None
+        if prefix == 'font':
+            if value in _TW_FONT_FAMILIES:
+                return 'font-family', 0, '', f'font-family:{_TW_FONT_FAMILIES[value]}'
+            weight = _TW_FONT_WEIGHTS.get(value)
+            return ('font-weight', 0, '', f'font-weight:{weight}') if weight else None
+        if prefix == 'text':
+            if value in _TW_FONT_SIZES:
+                size, height = _TW_FONT_SIZES[value]
+                return 'font-size', 0, '', f'font-size:{size};line-height:{height}'
+            if value.startswith('[') and _tw_is_length(value[1:-1]):
+                return 'font-size', 0, '', f'font-size:{value[1:-1]}'
+            color = _tw_color(value)
+            return ('color', 0, '', f'color:{color}') if color else None
+        return None
+    return None
+
+
+def _css_escape(cls: str) -> str:
+    """Escape a class name for use in a CSS selector"""
+    return re.sub(r'([^A-Za-z0-9_-])', r'\\\1', cls)
+
+
+def collect_classes(html: str) -> List[str]:
+    """Every class used in class attributes or toggled via classList in inline scripts"""
+    seen = {}
+    for attr in _CLASS_ATTR.findall(html):
+        for cls in attr.split():
+            seen[cls] = None
+    for cls in _CLASS_LIST_JS.findall(html):
+        seen[cls] = None
+    return list(seen)
+
+
+def build_static_css(html: str) -> str:
+    """Compile the minimal stylesheet for all Tailwind classes in html (preflight + used utilities)"""
+    # Classes defined by template.html's own <style> are not Tailwind utilities
+    custom = set()
+    for block in _STYLE_BLOCK.findall(html):
+        custom.update(_CSS_CLASS_SELECTOR.findall(re.sub(r'url\([^)]*\)|/\*.*?\*/', '', block, flags=re.S)))
+
+    rules = []
+    for cls in collect_classes(html):
+        if cls in custom:
+            continue
+        *variants, utility = re.split(r':(?![^\[]*\])', cls)
+        resolved = _tw_utility(utility)
+        if resolved is None or any(v not in _TW_VARIANTS for v in variants):
+            print(f"⚠  Unbekannte Tailwind-Klasse: {cls}", file=sys.stderr)
+            continue
+        group, sub, suffix, decls = resolved
+        selector = '.' + _css_escape(cls)
+        if 'hover' in variants:
+            selector += ':hover'
+        media = next((v for v in variants if v == 'print' or v in _TW_SCREENS), None)
+        variant_rank = max((_TW_VARIANTS[v] for v in variants), default=0)
+        rules.append(((variant_rank, _TW_ORDER[group], sub, cls), media, f'{selector}{suffix}{{{decls}}}'))
+
+    lines = [_TW_PREFLIGHT % _TW_FONT_FAMILIES]
+    for _, media, rule in sorted(rules, key=lambda r: r[0]):
+        if media == 'print':
+            lines.append(f'@media print{{{rule}}}')
+        elif media:
+            lines.append(f'@media (min-width:{_TW_SCREENS[media]}){{{rule}}}')
+        else:
+            lines.append(rule)
+    return '\n'.join(lines) + '\n'
+
+
+def apply_static_css(html: str, mode: str, output_file: str) -> str:
+    """Replace the Tailwind CDN block: mode 'inline' → <style>, otherwise mode is the stylesheet path to write"""
+    if not _TW_BLOCK.search(html):
+        return html
+    css = build_static_css(html)
+    if mode == 'inline':
+        tag = f'  <style>\n{css}  </style>\n'
+    else:
+        Path(mode).parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(Path(mode), css)
+        href = os.path.relpath(Path(mode).resolve(), Path(output_file).resolve().parent).replace(os.sep, '/')
+        tag = f'  <link rel="stylesheet" href="{href}">\n'
+    return _TW_BLOCK.sub(lambda _: tag, html, count=1)
+
+
+# --- Fonts: drop unused @font-face rules, subset the rest, preload above-the-fold faces ---
+
+def _font_subset():
+    """fontTools.subset (optional: pip install fonttools brotli), None if missing – imported on first use,
+    its import alone costs ~150 ms that --check and builds without --fonts don't need"""
+    try:
+        from fontTools import subset
+    except ImportError:
+        return None
+    return subset
+
+
+_FONT_FACE = re.compile(r'[ \t]*@font-face\s*\{([^}]*)\}\n?')
+_CSS_RULE = re.compile(r'([^{}@]+)\{([^{}]*)\}')
+_FONT_WEIGHT_NAMES = {'normal': 400, 'bold': 700}
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+
+def _css_declarations(body: str) -> Dict[str, str]:
+    """'a: b; c: d' → {'a': 'b', 'c': 'd'} (comments removed)"""
+    decls = {}
+    for decl in re.sub(r'/\*.*?\*/', '', body, flags=re.S).split(';'):
+        prop, sep, value = decl.partition(':')
+        if sep:
+            decls[prop.strip().lower()] = value.strip()
+    return decls
+
+
+def _font_weight(value: str) -> int:
+    return _FONT_WEIGHT_NAMES.get(value, int(value) if value.isdigit() else 400)
+
+
+def _first_family(stack: str, known: set) -> Optional[str]:
+    """First family of a font-family list that has an @font-face rule"""
+    for family in stack.split(','):
+        family = family.strip().strip('\'"')
+        if family in known:
+            return family
+    return None
+
+
+def _nearest_weight(desired: int, available: List[int]) -> int:
+    """CSS font matching: which declared weight a browser picks for the desired weight"""
+    if desired in available:
+        return desired
+    lighter = sorted((w for w in available if w < desired), reverse=True)
+    heavier = sorted(w for w in available if w > desired)
+    if desired == 400 and 500 in available:
+        return 500
+    if desired == 500 and 400 in available:
+        return 400
+    if desired <= 500:
+        return (lighter or heavier)[0]
+    return (heavier or lighter)[0]
+
+
+class _FontUsageParser(HTMLParser):
+    """Walk the rendered document tracking the inherited font; collect characters per (family, weight)"""
+
+    def __init__(self, families: set, class_fonts: Dict[str, Dict[str, str]]):
+        super().__init__(convert_charrefs=True)
+        self.families = families
+        self.class_fonts = class_fonts
+        sans = _first_family(_TW_FONT_FAMILIES['sans'], families) or 'Geist'
+        self.stack = [('', (sans, 400, False))]   # (tag, (family, weight, uppercase)); root = preflight font-sans
+        self.skip = 0                               # inside <head>, <script>, <style>
+        self.fold_passed = False
+        self.usage: Dict[Tuple[str, int], set] = {}
+        self.above_fold: set = set()
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            return
+        if tag in ('head', 'script', 'style'):
+            self.skip += 1
+        family, weight, upper = self.stack[-1][1]
+        attrs = dict(attrs)
+        if tag in ('b', 'strong'):
+            weight = 700
+        for cls in (attrs.get('class') or '').split():
+            font = self.class_fonts.get(cls)
+            if font:
+                family = font.get('family', family)
+                weight = font.get('weight', weight)
+                upper = font.get('upper', upper)
+        # Print rule: a[href^="https://"]::after { content: attr(href); font-weight: normal }
+        href = attrs.get('href') or ''
+        if tag == 'a' and href.startswith('https://'):
+            self._use(family, 400, href)
+        self.stack.append((tag, (family, weight, upper)))
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS:
+            return
+        if tag in ('head', 'script', 'style'):
+            self.skip = max(0, self.skip - 1)
+        # Pop to the matching start tag (tolerates unclosed children)
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i][0] == tag:
+                del self.stack[i:]
+                break
+
+    def handle_comment(self, data):
+        if 'ZONE 2' in data:
+            self.fold_passed = True
+
+    def handle_data(self, data):
+        if self.skip or not data.strip():
+            return
+        family, weight, upper = self.stack[-1][1]
+        self._use(family, weight, data.upper() if upper else data)
+
+    def _use(self, family: str, weight: int, text: str) -> None:
+        self.usage.setdefault((family, weight), set()).update(text)
+        if not self.fold_passed:
+            self.above_fold.add((family, weight))
+
+
+def _class_fonts(html: str, families: set) -> Dict[str, Dict[str, Any]]:
+    """Font-relevant classes: Tailwind font-*/uppercase utilities plus simple .class rules in <style>"""
+    fonts: Dict[str, Dict[str, Any]] = {}
+    for name, stack in _TW_FONT_FAMILIES.items():
+        family = _first_family(stack, families)
+        if family:
+            fonts[f'font-{name}'] = {'family': family}
+    for name, weight in _TW_FONT_WEIGHTS.items():
+        fonts[f'font-{name}'] = {'weight': int(weight)}
+    fonts['uppercase'] = {'upper': True}
+    fonts['normal-case'] = {'upper': False}
+
+    for block in _STYLE_BLOCK.findall(html):
+        for selector, body in _CSS_RULE.findall(_FONT_FACE.sub('', block)):
+            selector = selector.strip()
+            if not re.fullmatch(r'\.[\w-]+', selector):
+                continue
+            decls = _css_declarations(body)
+            font = {}
+            if 'font-family' in decls:
+                family = _first_family(decls['font-family'], families)
+                if family:
+                    font['family'] = family
+            if 'font-weight' in decls:
+                font['weight'] = _font_weight(decls['font-weight'])
+            if 'text-transform' in decls:
+                font['upper'] = decls['text-transform'] == 'uppercase'
+            if font:
+                fonts.setdefault(selector[1:], {}).update(font)
+    return fonts
+
+
+def _subset_font(source: Path, codepoints: set, out_dir: Path) -> Path:
+    """Subset one font to the given code points as WOFF2; reuses an existing subset with the same key"""
+    key = hashlib.sha256(source.read_bytes() + ','.join(map(str, sorted(codepoints))).encode()).hexdigest()[:10]
+    target = out_dir / f'{source.stem}.{key}.woff2'
+    if target.exists():
+        return target
+    font_subset = _font_subset()
+    options = font_subset.Options()
+    options.flavor = 'woff2'
+    options.drop_tables += ['meta']
+    font = font_subset.load_font(str(source), options)
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp_path(target)  # batch workers and site builds may race on the same subset
+    font_subset.save_font(font, str(tmp), options)
+    os.replace(tmp, target)
+    return target
+
+
+# Subsets each page references, per subset directory – recorded by optimize_fonts, flushed by prune_font_subsets
+FONT_SUBSET_REGISTRY = 'subsets.json'
+_font_subsets: Dict[str, Dict[str, List[str]]] = {}
+_font_subsets_lock = threading.Lock()
+
+
+def take_font_subsets() -> Dict[str, Dict[str, List[str]]]:
+    """Subsets recorded since the last call: {subset dir: {page relative to it: [subset names]}}"""
+    with _font_subsets_lock:
+        used = dict(_font_subsets)
+        _font_subsets.clear()
+    return used
+
+
+def prune_font_subsets(used: Optional[Dict[str, Dict[str, List[str]]]] = None) -> int:
+    """Merge the recorded subsets into subsets.json of each subset directory and delete the subsets this stage
+    created that no page uses anymore (their names change with every new character); returns the count removed.
+    Call once after a run – pages built earlier (e.g. en/index.html) keep their entries until they disappear."""
+    used = take_font_subsets() if used is None else used
+    removed = 0
+    for subset_dir, pages in used.items():
+        out_dir = Path(subset_dir)
+        registry_path = out_dir / FONT_SUBSET_REGISTRY
+        try:
+            registry = json.loads(registry_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            registry = {}
+        registry.setdefault('pages', {}).update(pages)
+        registry['pages'] = {page: names for page, names in registry['pages'].items() if (out_dir / page).is_file()}
+        live = {name for names in registry['pages'].values() for name in names}
+        created = set(registry.get('subsets', [])) | live
+        for name in sorted(created - live):
+            if (out_dir / name).exists():
+                (out_dir / name).unlink()
+                removed += 1
+        registry['subsets'] = sorted(live)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        write_if_changed(registry_path, json.dumps(registry, indent=2, sort_keys=True) + '\n')
+    return removed
+
+
+def report_pruned_subsets(removed: int) -> None:
+    if removed:
+        print(f"· {removed} veraltete Font-Subsets entfernt")
+
+
+def _resolve_asset(url: str, output_file: str) -> Optional[Path]:
+    """Asset URL as written in the page → file on disk (relative to the page, else to the repo)"""
+    for base in (Path(output_file).resolve().parent, TEMPLATE_PATH.parent):
+        candidate = base / unquote(url)
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _relative_url(target: Path, output_file: str) -> str:
+    return os.path.relpath(Path(target).resolve(), Path(output_file).resolve().parent).replace(os.sep, '/')
+
+
+def optimize_fonts(html: str, subset_dir: str, output_file: str) -> str:
+    """Drop @font-face rules no rendered text uses, subset the rest (fontTools) and preload above-the-fold faces"""
+    faces = []
+    for match in _FONT_FACE.finditer(html):
+        decls = _css_declarations(match.group(1))
+        url = re.search(r'url\([\'"]?([^\'")]+)', decls.get('src', ''))
+        if 'font-family' in decls and url:
+            faces.append({'span': match.span(), 'family': decls['font-family'].strip('\'"'),
+                          'weight': _font_weight(decls.get('font-weight', '400')), 'url': url.group(1)})
+    if not faces:
+        return html
+
+    families = {f['family'] for f in faces}
+    walker = _FontUsageParser(families, _class_fonts(html, families))
+    walker.feed(html)
+    walker.close()
+
+    # Map every used (family, weight) to the face a browser would pick
+    chars: Dict[int, set] = {}
+    preload: set = set()
+    for (family, weight), used in walker.usage.items():
+        candidates = [i for i, f in enumerate(faces) if f['family'] == family]
+        if not candidates:
+            continue
+        best = _nearest_weight(weight, [faces[i]['weight'] for i in candidates])
+        index = next(i for i in candidates if faces[i]['weight'] == best)
+        chars.setdefault(index, set()).update(used)
+        if (family, weight) in walker.above_fold:
+            preload.add(index)
+
+    font_subset = _font_subset()
+    if font_subset is None:
+        print("⚠  fontTools nicht installiert – ungenutzte Fonts entfernt, aber nicht gesubsettet", file=sys.stderr)
+
+    urls = {}
+    subsets = []
+    for index, used in chars.items():
+        face = faces[index]
+        source = _resolve_asset(face['url'], output_file)
+        if source is None:
+            print(f"⚠  Font nicht gefunden: {face['url']}", file=sys.stderr)
+            urls[index] = face['url']
+        elif font_subset is None:
+            urls[index] = _relative_url(source, output_file)
+        else:
+            codepoints = {ord(c) for c in used} | {0x20}
+            target = _subset_font(source, codepoints, Path(subset_dir))
+            subsets.append(target.name)
+            urls[index] = _relative_url(target, output_file)
+    if font_subset is not None:
+        page = os.path.relpath(Path(output_file).resolve(), Path(subset_dir).resolve()).replace(os.sep, '/')
+        with _font_subsets_lock:
+            _font_subsets.setdefault(str(Path(subset_dir).resolve()), {})[page] = sorted(subsets)
+
+    # Rebuild the document back to front so earlier spans stay valid
+    for index in range(len(faces) - 1, -1, -1):
+        start, end = faces[index]['span']
+        if index in urls:
+            rule = html[start:end].replace(faces[index]['url'], urls[index])
+            html = html[:start] + rule + html[end:]
+        else:
+            html = html[:start] + html[end:]
+
+    # Preload hints go right before the <style> block holding the @font-face rules
+    if preload:
+        links = ''.join(
+            f'  <link rel="preload" href="{urls[i]}" as="font" type="font/woff2" crossorigin>\n'
+            for i in sorted(preload)
+        )
+        style_at = html.rfind('<style>', 0, html.find('@font-face'))
+        line_start = html.rfind('\n', 0, style_at) + 1
+        html = html[:line_start] + links + html[line_start:]
+    return html
+
+
+# --- Photo: pre-cropped greyscale 1x/2x variants + inline placeholder for the 110px portrait ---
+
+try:
+    from PIL import Image, ImageOps  # optional: pip install pillow
+except ImportError:
+    Image = None
+
+PHOTO_SIZE = 110          # CSS px, matches w-[110px] h-[110px] in _generate_header
+PHOTO_DENSITIES = (1, 2)
+PHOTO_PLACEHOLDER_SIZE = 12
+
+
+def _photo_variant(image: 'Image.Image', size: int) -> 'Image.Image':
+    """Square crop like object-cover object-top (top-aligned, horizontally centred), greyscale, resized"""
+    return ImageOps.fit(image.convert('L'), (size, size), method=Image.LANCZOS, centering=(0.5, 0.0))
+
+
+def prepare_photo(photo: str, image_dir: str, output_file: str) -> Optional[Dict[str, Any]]:
+    """Build (or reuse, keyed by source hash) the portrait variants; returns img attributes for HTMLGenerator"""
+    if Image is None:
+        print("⚠  Pillow nicht installiert – Foto wird unverändert eingebunden", file=sys.stderr)
+        return None
+    source = _resolve_asset(photo, output_file)
+    if source is None:
+        print(f"⚠  Foto nicht gefunden: {photo}", file=sys.stderr)
+        return None
+
+    out_dir = Path(image_dir)
+    params = f'{PHOTO_SIZE}:{PHOTO_DENSITIES}:{PHOTO_PLACEHOLDER_SIZE}'
+    key = hashlib.sha256(source.read_bytes() + params.encode()).hexdigest()[:10]
+    manifest = out_dir / f'{source.stem}.{key}.json'
+
+    try:
+        variants = json.loads(manifest.read_text(encoding='utf-8'))
+        if not all((out_dir / name).is_file() for name in variants['files']):
+            raise ValueError('variant missing')
+    except (OSError, ValueError, KeyError):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        with Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            files = []
+            for density in PHOTO_DENSITIES:
+                name = f'{source.stem}-{PHOTO_SIZE * density}.{key}.jpg'
+                tmp = _tmp_path(out_dir / name)
+                _photo_variant(image, PHOTO_SIZE * density).save(tmp, 'JPEG', quality=82, optimize=True,
+                                                                 progressive=True)
+                os.replace(tmp, out_dir / name)
+                files.append(name)
+            buf = io.BytesIO()
+            _photo_variant(image, PHOTO_PLACEHOLDER_SIZE).save(buf, 'JPEG', quality=50)
+        variants = {
+            'files': files,
+            'placeholder': 'data:image/jpeg;base64,' + base64.b64encode(buf.getvalue()).decode('ascii'),
+        }
+        tmp = _tmp_path(manifest)
+        tmp.write_text(json.dumps(variants), encoding='utf-8')
+        os.replace(tmp, manifest)
+
+    urls = [_relative_url(out_dir / name, output_file) for name in variants['files']]
+    return {
+        'src': urls[0],
+        'srcset': ', '.join(f'{url} {PHOTO_SIZE * d}w' for url, d in zip(urls, PHOTO_DENSITIES)),
+        'sizes': f'{PHOTO_SIZE}px',
+        'width': PHOTO_SIZE,
+        'height': PHOTO_SIZE,
+        'placeholder': variants['placeholder'],
+    }
+
+
+# --- Fingerprinting: content-hashed asset names, manifest and .gz/.br siblings for publishing ---
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = 'asset-manifest.json'
+_HASHED_NAME = re.compile(r'\.[0-9a-f]{10}\.[A-Za-z0-9]+$')
+_TEXT_SUFFIXES = {'.html', '.css', '.js', '.svg', '.json', '.txt', '.xml'}
+_URL_ATTR = re.compile(r'(\b(?:src|href)=")([^"]+)(")')
+_SRCSET_ATTR = re.compile(r'(\bsrcset=")([^"]+)(")')
+_CSS_URL = re.compile(r'(url\([\'"]?)([^\'")]+)([\'"]?\))')
+
+
+def _is_local_ref(url: str) -> bool:
+    return not (url.startswith(('#', '/', 'data:', 'mailto:', 'tel:', 'javascript:')) or '://' in url)
+
+
+def _url_path(url: str) -> str:
+    """File part of a local URL, percent-decoded (assets/My%20Font.woff2 → assets/My Font.woff2)"""
+    return unquote(url.partition('?')[0].partition('#')[0])
+
+
+def local_refs(text: str, base: Path) -> List[Path]:
+    """Local asset files referenced by text (src/href/srcset/url()), resolved against base – missing ones included"""
+    urls = [m.group(2) for m in _URL_ATTR.finditer(text)] + [m.group(2) for m in _CSS_URL.finditer(text)]
+    for m in _SRCSET_ATTR.finditer(text):
+        urls += [c.split()[0] for c in m.group(2).split(',') if c.strip()]
+    refs = []
+    for url in urls:
+        path_part = _url_path(url)
+        if path_part and _is_local_ref(path_part) and not path_part.endswith('.html'):
+            refs.append(Path(os.path.normpath(base / path_part)))
+    return list(dict.fromkeys(refs))
+
+
+def _content_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:10]
+
+
+def _rewrite_refs(text: str, base: Path, root: Path, hashed: Dict[str, str]) -> str:
+    """Point every local asset reference in text (HTML or CSS) at its content-hashed copy"""
+
+    def fingerprint(url: str, base: Path = base) -> str:
+        path_part, sep, query = url.partition('?')
+        if not _is_local_ref(path_part):
+            return url
+        target = (base / unquote(path_part)).resolve()
+        if not target.is_file() or target.suffix == '.html' or root not in target.parents:
+            return url
+        rel = target.relative_to(root).as_posix()
+        if rel not in hashed:
+            if _HASHED_NAME.search(target.name):
+                hashed[rel] = rel  # already content-keyed (font subsets, photo variants)
+            else:
+                if target.suffix == '.css':
+                    # CSS first: its own url() references must be hashed before its content hash is taken
+                    css = _CSS_URL.sub(lambda m: m.group(1) + fingerprint(m.group(2), target.parent) + m.group(3),
+                                       target.read_text(encoding='utf-8'))
+                    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:10]
+                    copy = target.with_name(f'{target.stem}.{digest}{target.suffix}')
+                    write_if_changed(copy, css)
+                else:
+                    copy = target.with_name(f'{target.stem}.{_content_hash(target)}{target.suffix}')
+                    if not copy.exists():
+                        shutil.copyfile(target, copy)
+                hashed[rel] = copy.relative_to(root).as_posix()
+        new_name = quote(hashed[rel].rsplit('/', 1)[-1])
+        head = path_part.rsplit('/', 1)[0] + '/' if '/' in path_part else ''
+        return head + new_name + sep + query
+
+    text = _URL_ATTR.sub(lambda m: m.group(1) + fingerprint(m.group(2)) + m.group(3), text)
+    text = _SRCSET_ATTR.sub(lambda m: m.group(1) + ', '.join(
+        ' '.join([fingerprint(c.split()[0])] + c.split()[1:]) for c in m.group(2).split(',') if c.strip()
+    ) + m.group(3), text)
+    return _CSS_URL.sub(lambda m: m.group(1) + fingerprint(m.group(2)) + m.group(3), text)
+
+
+def precompress(path: Path) -> None:
+    """Write deterministic .gz (and .br with the brotli module) siblings – untouched when already current"""
+    data = path.read_bytes()
+    write_if_changed(Path(f'{path}.gz'), gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        write_if_changed(Path(f'{path}.br'), brotli.compress(data, quality=11))
+
+
+def check_under_root(pages: List[str], root_path: Path) -> None:
+    """ValueError naming the first page outside the site root – checked before anything is written"""
+    for page in pages:
+        if root_path not in Path(page).resolve().parents:
+            raise ValueError(f'{page} liegt nicht unter {root_path} (--root angeben)')
+
+
+def fingerprint_pages(pages: List[str], root: Optional[str] = None,
+                      documents: Optional[Dict[str, str]] = None) -> List[str]:
+    """Rewrite the pages to content-hashed asset copies, update the manifest, prune stale copies, precompress.
+    documents: page → HTML not written yet (fingerprint stage of a build). Returns the pages whose file changed.
+    ValueError (nothing written) when a page lies outside the root."""
+    root_path = Path(root or TEMPLATE_PATH.parent).resolve()
+    check_under_root(pages, root_path)
+    manifest_path = root_path / MANIFEST_NAME
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        manifest = {'pages': {}}
+    if brotli is None:
+        print("⚠  brotli nicht installiert – nur .gz-Varianten", file=sys.stderr)
+
+    changed = []
+    for page in pages:
+        page_path = Path(page).resolve()
+        hashed: Dict[str, str] = {}
+        source = documents[page] if documents and page in documents else page_path.read_text(encoding='utf-8')
+        html = _rewrite_refs(source, page_path.parent, root_path, hashed)
+        if write_if_changed(page_path, html):
+            changed.append(page)
+        manifest['pages'][page_path.relative_to(root_path).as_posix()] = hashed
+        if documents is None:
+            print(f"✓ Fingerprinted: {page} ({len(hashed)} Assets)")
+
+    # Prune hashed copies no page references anymore (only files this stage created earlier)
+    live = {dst for refs in manifest['pages'].values() for dst in refs.values()}
+    for dst in manifest.get('assets', []):
+        if dst not in live:
+            for stale in (root_path / dst, Path(f'{root_path / dst}.gz'), Path(f'{root_path / dst}.br')):
+                if stale.exists():
+                    stale.unlink()
+    manifest['assets'] = sorted(live)
+
+    for rel in [p for p in manifest['pages']] + manifest['assets']:
+        path = root_path / rel
+        if path.suffix in _TEXT_SUFFIXES and path.is_file():
+            precompress(path)
+
+    write_if_changed(manifest_path, json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    return changed
+
+
+# --- Minify: SVG sprite, compacted class combinations, insignificant whitespace and comments ---
+
+_PROTECTED = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2>)', re.S | re.I)
+_HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+_SVG_ELEMENT = re.compile(r'<svg\b([^>]*)>(.*?)</svg>', re.S)
+_SVG_VIEWBOX = re.compile(r'\s+viewBox="([^"]*)"')
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_STRING = re.compile(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')')
+_CSS_PRELUDE = re.compile(r'([^{}]+)\{')
+_CSS_SELECTOR_SPLIT = re.compile(r',(?![^(\[]*[)\]])')
+_CSS_CLASS_TOKEN = re.compile(r'\.((?:\\.|[\w-])+)')
+_TAG_NEWLINE = re.compile(r'(<(/?)([A-Za-z][\w-]*)([^<>]*)>)\n(?=<(/?)([A-Za-z][\w-]*)([^<>]*)>)')
+_BLOCK_TAGS = frozenset((
+    'html', 'head', 'body', 'meta', 'link', 'title', 'style', 'script', 'noscript', 'div', 'section', 'header',
+    'footer', 'main', 'nav', 'article', 'aside', 'p', 'ul', 'ol', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'hr', 'form', 'table', 'thead', 'tbody', 'tr', 'td', 'th',
+))
+
+
+def _minify_css(css: str) -> str:
+    """Drop comments and whitespace around CSS punctuation; strings stay untouched"""
+    parts = _CSS_STRING.split(_CSS_COMMENT.sub('', css))
+    for i in range(0, len(parts), 2):
+        text = re.sub(r'\s+', ' ', parts[i])
+        text = re.sub(r' ?([{};,>~]) ?', r'\1', text)
+        parts[i] = text.replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+def _svg_sprite(html: str) -> str:
+    """Emit SVGs that occur more than once as <symbol>s in one hidden sprite, referenced with <use>"""
+    body = html.find('<body')
+    if body < 0:
+        return html
+    counts: Dict[str, int] = {}
+    for m in _SVG_ELEMENT.finditer(html, body):
+        counts[m.group(0)] = counts.get(m.group(0), 0) + 1
+
+    symbols = []
+    for svg, count in counts.items():
+        m = _SVG_ELEMENT.fullmatch(svg)
+        viewbox = _SVG_VIEWBOX.search(m.group(1))
+        if count < 2 or not viewbox:
+            continue
+        icon_id = f'icon-{len(symbols)}'
+        while f'id="{icon_id}"' in html:
+            icon_id += '-'
+        attrs = re.sub(r'\s+xmlns="[^"]*"', '', _SVG_VIEWBOX.sub('', m.group(1)))
+        symbols.append(f'<symbol id="{icon_id}" viewBox="{viewbox.group(1)}">{m.group(2)}</symbol>')
+        html = html[:body] + html[body:].replace(svg, f'<svg{attrs}><use href="#{icon_id}"/></svg>')
+    if not symbols:
+        return html
+
+    body_end = html.index('>', body) + 1
+    sprite = ('<svg width="0" height="0" style="position:absolute" aria-hidden="true">'
+              + ''.join(symbols) + '</svg>')
+    return html[:body_end] + sprite + html[body_end:]
+
+
+def _css_unescape(token: str) -> str:
+    return re.sub(r'\\(.)', r'\1', token)
+
+
+def _compact_classes(html: str) -> str:
+    """Replace class combinations that repeat with one short class added to the same rules.
+
+    `.a{…}` becomes `.a,._1{…}` for every combination `_1` containing `a`, so cascade order and
+    specificity are unchanged. Only classes styled by a single-class selector in the page's own
+    <style> blocks and never mentioned in a script are compacted; needs the static CSS (--css inline).
+    """
+    if 'cdn.tailwindcss.com' in html:
+        return html          # the runtime JIT generates its CSS from the literal class names
+    styles = _STYLE_BLOCK.findall(html)
+    scripts = ''.join(m.group(3) for m in _PROTECTED.finditer(html) if m.group(2).lower() == 'script')
+
+    selectors: Dict[str, List[str]] = {}
+    excluded = set()
+    for css in styles:
+        for prelude in _CSS_PRELUDE.findall(_CSS_COMMENT.sub('', css)):
+            if prelude.strip().startswith('@'):
+                continue
+            for selector in _CSS_SELECTOR_SPLIT.split(prelude):
+                tokens = {_css_unescape(t) for t in _CSS_CLASS_TOKEN.findall(selector)}
+                for cls in tokens:
+                    selectors.setdefault(cls, []).append(selector.strip())
+                if len(tokens) > 1:
+                    excluded |= tokens
+    compactable = {cls for cls in selectors if cls not in excluded and cls not in scripts}
+
+    outside = _PROTECTED.sub('', html)
+    used = {cls for value in _CLASS_ATTR.findall(outside) for cls in value.split()}
+    counts: Dict[str, int] = {}
+    for value in _CLASS_ATTR.findall(outside[outside.find('<body'):]):
+        counts[value] = counts.get(value, 0) + 1
+
+    combos: Dict[str, str] = {}                  # class attribute value → replacement
+    keys_for: Dict[str, List[str]] = {}          # class → generated classes that include it
+    n = 0
+    for value, count in sorted(counts.items(), key=lambda item: -item[1]):
+        compact = [cls for cls in value.split() if cls in compactable]
+        if count < 2 or len(compact) < 2:
+            continue
+        key = f'_{n:x}'
+        while key in used:
+            n += 1
+            key = f'_{n:x}'
+        cost = sum(len(sel) - len(_css_escape(cls)) + len(key) + 1 for cls in compact for sel in selectors[cls])
+        if count * (len(' '.join(compact)) - len(key)) <= cost:
+            continue
+        n += 1
+        combos[value] = ' '.join([key] + [cls for cls in value.split() if cls not in compact])
+        for cls in compact:
+            keys_for.setdefault(cls, []).append(key)
+    if not combos:
+        return html
+
+    def add_selectors(m: re.Match) -> str:
+        prelude = m.group(1)
+        if prelude.strip().startswith('@'):
+            return m.group(0)
+        out = []
+        for selector in _CSS_SELECTOR_SPLIT.split(prelude):
+            out.append(selector)
+            for token in _CSS_CLASS_TOKEN.findall(selector):
+                for key in keys_for.get(_css_unescape(token), ()):
+                    out.append(selector.replace('.' + token, '.' + key, 1))
+        return ','.join(out) + '{'
+
+    def rewrite(segment: str) -> str:
+        return _CLASS_ATTR.sub(lambda m: f'class="{combos.get(m.group(1), m.group(1))}"', segment)
+
+    def rewrite_protected(m: re.Match) -> str:
+        if m.group(2).lower() == 'style':
+            return m.group(1) + _CSS_PRELUDE.sub(add_selectors, _CSS_COMMENT.sub('', m.group(3))) + m.group(4)
+        return m.group(0)
+
+    pieces = []
+    last = 0
+    for m in _PROTECTED.finditer(html):
+        pieces.append(rewrite(html[last:m.start()]))
+        pieces.append(rewrite_protected(m))
+        last = m.end()
+    pieces.append(rewrite(html[last:]))
+    return ''.join(pieces)
+
+
+def _is_block(tag: str, attrs: str) -> bool:
+    return tag.lower() in _BLOCK_TAGS and 'inline' not in attrs
+
+
+def _strip_whitespace(html: str) -> str:
+    """Drop comments and indentation; newlines go away only where a block boundary swallows them"""
+    keep_edges = 'whitespace-pre' in html or re.search(r'white-space:\s*pre', html)
+
+    def text(segment: str) -> str:
+        segment = _HTML_COMMENT.sub('', segment)
+        segment = re.sub(r'[ \t]*\n\s*', '\n', segment)
+        if keep_edges:
+            return segment
+        return _TAG_NEWLINE.sub(
+            lambda m: m.group(1) if _is_block(m.group(3), m.group(4)) or _is_block(m.group(6), m.group(7))
+            else m.group(0),
+            segment,
+        )
+
+    pieces = []
+    last = 0
+    for m in _PROTECTED.finditer(html):
+        pieces.append(text(html[last:m.start()]))
+        if m.group(2).lower() == 'style':
+            pieces.append(m.group(1) + _minify_css(m.group(3)) + m.group(4))
+        else:
+            pieces.append(m.group(0))
+        last = m.end()
+    pieces.append(text(html[last:]))
+    return ''.join(pieces).strip() + '\n'
+
+
+def minify_html(html: str) -> str:
+    """--minify: SVG sprite, compacted class combinations, then whitespace/comment stripping"""
+    return _strip_whitespace(_compact_classes(_svg_sprite(html)))
+
+
+# --- Page weight: bytes per resource type and critical-path position, checked against budgets ---
+
+# Transfer bytes (gzip for text, as served from the .gz siblings) – override with --budgets FILE (JSON, same keys)
+DEFAULT_BUDGETS = {
+    'total': 250_000,               # everything the page loads up front (without lazy/deferred resources)
+    'critical': 60_000,             # document + render-blocking + preloaded
+    'requests': 12,                 # counted requests, including the document
+    'external_blocking': 1,         # third-party render-blocking scripts/styles: room for the Tailwind CDN script
+                                    # (CSS=cdn, positionierung.html)
+    'html': 30_000, 'css': 20_000, 'js': 10_000, 'font': 80_000, 'image': 100_000,
+}
+RESOURCE_TYPES = {
+    '.html': 'html', '.css': 'css', '.js': 'js', '.mjs': 'js',
+    '.woff2': 'font', '.woff': 'font', '.ttf': 'font', '.otf': 'font',
+    '.jpg': 'image', '.jpeg': 'image', '.png': 'image', '.gif': 'image', '.webp': 'image', '.avif': 'image',
+    '.svg': 'image', '.ico': 'image',
+}
+# Load order on the critical path; 'alternate' (unchosen srcset candidates), 'link' (<a href> targets) and
+# 'unused' (@font-face files of a family nothing sets – the browser never fetches them) are checked for
+# existence but not counted
+POSITIONS = ('document', 'blocking', 'preload', 'discovered', 'deferred', 'alternate', 'link', 'unused')
+_COUNTED = ('document', 'blocking', 'preload', 'discovered')
+_CRITICAL = ('document', 'blocking', 'preload')
+_FONT_FACE_BLOCK = re.compile(r'@font-face\s*\{[^}]*\}', re.S)
+
+
+class _ResourceParser(HTMLParser):
+    """(url, type hint, position) for every resource a page references, plus its inline CSS"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.refs: List[Tuple[str, Optional[str], str]] = []
+        self.css: List[str] = []
+        self.scripts: List[str] = []      # inline script text (a Tailwind config names font families)
+        self.in_head = True
+        self.in_style = False
+        self.in_script = False
+
+    def handle_starttag(self, tag: str, attrs_list: List[Tuple[str, Optional[str]]]) -> None:
+        attrs = {key: value or '' for key, value in attrs_list}
+        if tag == 'body':
+            self.in_head = False
+        elif tag == 'style':
+            self.in_style = True
+        elif tag == 'link' and attrs.get('href'):
+            rel = attrs.get('rel', '').lower().split()
+            if 'stylesheet' in rel:
+                late = attrs.get('media', 'all') == 'print' or not self.in_head
+                self.refs.append((attrs['href'], 'css', 'deferred' if late else 'blocking'))
+            elif 'preload' in rel:
+                self.refs.append((attrs['href'], {'style': 'css', 'script': 'js'}.get(attrs.get('as', ''),
+                                                                                   attrs.get('as') or None), 'preload'))
+            elif 'modulepreload' in rel:
+                self.refs.append((attrs['href'], 'js', 'preload'))
+            elif 'icon' in rel:
+                self.refs.append((attrs['href'], 'image', 'deferred'))
+        elif tag == 'script' and not attrs.get('src'):
+            self.in_script = True
+        elif tag == 'script':
+            deferred = 'async' in attrs or 'defer' in attrs or attrs.get('type') == 'module' or not self.in_head
+            self.refs.append((attrs['src'], 'js', 'deferred' if deferred else 'blocking'))
+        elif tag in ('img', 'source'):
+            lazy = attrs.get('loading') == 'lazy'
+            if attrs.get('src'):
+                self.refs.append((attrs['src'], 'image', 'deferred' if lazy else 'discovered'))
+            for candidate in attrs.get('srcset', '').split(','):
+                if candidate.strip():
+                    self.refs.append((candidate.split()[0], 'image', 'alternate'))
+        elif tag == 'a' and attrs.get('href'):
+            self.refs.append((attrs['href'], None, 'link'))
+        if attrs.get('style'):
+            self.css.append(attrs['style'])
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == 'style':
+            self.in_style = False
+        elif tag == 'script':
+            self.in_script = False
+        elif tag == 'head':
+            self.in_head = False
+
+    def handle_data(self, data: str) -> None:
+        if self.in_style:
+            self.css.append(data)
+        elif self.in_script:
+            self.scripts.append(data)
+
+
+def _css_refs(css: str) -> List[Tuple[str, Optional[str], str]]:
+    """(url, type hint, font family) for the url() references in CSS – those inside @font-face are fonts"""
+    families = {}
+    for block in _FONT_FACE_BLOCK.findall(css):
+        family = _css_declarations(block[block.index('{') + 1:-1]).get('font-family', '').strip('\'"').lower()
+        for m in _CSS_URL.finditer(block):
+            families[m.group(2)] = family
+    return [(m.group(2), 'font' if m.group(2) in families else None, families.get(m.group(2), ''))
+            for m in _CSS_URL.finditer(css)]
+
+
+def _used_families(css: str, scripts: str) -> set:
+    """Lower-case font families something sets: font-family outside @font-face, or quoted in an inline script"""
+    used = set()
+    for value in re.findall(r'font-family\s*:\s*([^;}]+)', _FONT_FACE_BLOCK.sub('', css)):
+        used.update(name.strip().strip('\'"').lower() for name in value.split(','))
+    used.update(name.lower() for name in re.findall(r'[\'"]([^\'"\n]+)[\'"]', scripts))
+    return used
+
+
+def _transfer_size(path: Path, data: bytes) -> int:
+    """Bytes on the wire: the precompressed .gz sibling (or gzip -9) for text, the file itself otherwise"""
+    if path.suffix not in _TEXT_SUFFIXES:
+        return len(data)
+    gz = Path(f'{path}.gz')
+    if gz.is_file():
+        return gz.stat().st_size
+    return len(gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def weigh_page(page: str) -> Dict[str, Any]:
+    """Resolve every resource the page references (offline), size it, total per type and position"""
+    page_path = Path(page)
+    data = page_path.read_bytes()
+    parser = _ResourceParser()
+    parser.feed(data.decode('utf-8'))
+    refs = [(url, hint, position, page_path.parent, '') for url, hint, position in parser.refs]
+    refs += [(url, hint, 'discovered', page_path.parent, family)
+             for url, hint, family in _css_refs(''.join(parser.css))]
+    css = list(parser.css)
+    families: Dict[str, set] = {}       # font file → @font-face families it serves
+
+    resources: Dict[str, Dict[str, Any]] = {}
+    document = {'url': page_path.name, 'type': 'html', 'position': 'document', 'external': False,
+                'missing': False, 'bytes': len(data), 'transfer': _transfer_size(page_path, data)}
+    external = []
+    i = 0
+    while i < len(refs):
+        url, hint, position, base, family = refs[i]
+        i += 1
+        path_part = _url_path(url)
+        if '://' in url or url.startswith('//'):
+            if position != 'link':
+                external.append({'url': url, 'type': hint or 'other', 'position': position})
+            continue
+        if not path_part or not _is_local_ref(path_part):
+            continue
+        target = Path(os.path.normpath(base / path_part))
+        if position == 'link' and (target.suffix == '.html' or target == page_path):
+            continue
+        key = target.as_posix()
+        if family:
+            families.setdefault(key, set()).add(family)
+        known = resources.get(key)
+        if known:
+            if POSITIONS.index(position) < POSITIONS.index(known['position']):
+                known['position'] = position          # earliest use wins (preload before @font-face)
+            continue
+        entry = {'url': url, 'path': key, 'type': hint or RESOURCE_TYPES.get(target.suffix.lower(), 'other'),
+                 'position': position, 'external': False, 'missing': not target.is_file(), 'bytes': 0, 'transfer': 0}
+        if not entry['missing']:
+            content = target.read_bytes()
+            entry['bytes'] = len(content)
+            entry['transfer'] = _transfer_size(target, content)
+            if entry['type'] == 'css':                # fonts and images behind a stylesheet
+                text = content.decode('utf-8', 'replace')
+                css.append(text)
+                refs += [(ref, kind, 'discovered' if position != 'deferred' else 'deferred', target.parent, family)
+                         for ref, kind, family in _css_refs(text)]
+        resources[key] = entry
+
+    # Fonts are only fetched for families some rule uses (e.g. Geist Pixel's @font-face without FONTS stage)
+    used = _used_families(''.join(css), ''.join(parser.scripts))
+    for key, served in families.items():
+        entry = resources[key]
+        if entry['position'] == 'discovered' and not served & used:
+            entry['position'] = 'unused'
+
+    counted = [document] + [r for r in resources.values() if r['position'] in _COUNTED]
+    totals = {'types': {}, 'positions': {}}
+    for r in counted:
+        for group, key in (('types', r['type']), ('positions', r['position'])):
+            bucket = totals[group].setdefault(key, {'requests': 0, 'bytes': 0, 'transfer': 0})
+            bucket['requests'] += 1
+            bucket['bytes'] += r['bytes']
+            bucket['transfer'] += r['transfer']
+    return {
+        'page': page,
+        'resources': [document] + list(resources.values()),
+        'external': external,
+        'missing': [r['path'] for r in resources.values() if r['missing']],
+        'totals': totals,
+        'requests': len(counted) + sum(e['position'] in _COUNTED for e in external),
+        'transfer': sum(r['transfer'] for r in counted),
+        'bytes': sum(r['bytes'] for r in counted),
+        'critical': sum(r['transfer'] for r in counted if r['position'] in _CRITICAL),
+    }
+
+
+def load_budgets(path: Optional[str] = None) -> Dict[str, int]:
+    """DEFAULT_BUDGETS, overridden by the keys of a JSON file (unknown keys are an error)"""
+    budgets = dict(DEFAULT_BUDGETS)
+    if path:
+        custom = json.loads(Path(path).read_text(encoding='utf-8'))
+        unknown = custom.keys() - budgets.keys()
+        if unknown:
+            raise ValueError(f"Unbekannte Budgets: {', '.join(sorted(unknown))} (erlaubt: {', '.join(budgets)})")
+        budgets.update(custom)
+    return budgets
+
+
+def check_budgets(report: Dict[str, Any], budgets: Dict[str, int]) -> List[str]:
+    """Exceeded budgets and missing assets of one weighed page, as messages"""
+    problems = [f'Asset fehlt: {path}' for path in report['missing']]
+    actual = {
+        'total': report['transfer'], 'critical': report['critical'], 'requests': report['requests'],
+        'external_blocking': sum(e['position'] == 'blocking' for e in report['external']),
+    }
+    for kind in ('html', 'css', 'js', 'font', 'image'):
+        actual[kind] = report['totals']['types'].get(kind, {}).get('transfer', 0)
+    for key, limit in budgets.items():
+        if actual[key] > limit:
+            unit = '' if key in ('requests', 'external_blocking') else ' B'
+            problems.append(f'Budget {key}: {actual[key]:,}{unit} > {limit:,}{unit}'.replace(',', '.'))
+    return problems
+
+
+def _kb(size: int) -> str:
+    return f'{size / 1024:.1f} KB'
+
+
+def print_weight(report: Dict[str, Any]) -> None:
+    """Human-readable page-weight table"""
+    print(f"{report['page']}: {report['requests']} Requests, {_kb(report['transfer'])} übertragen "
+          f"({_kb(report['bytes'])} unkomprimiert), kritischer Pfad {_kb(report['critical'])}")
+    for group, keys in (('types', sorted(report['totals']['types'])), ('positions', _COUNTED)):
+        for key in keys:
+            bucket = report['totals'][group].get(key)
+            if bucket:
+                print(f"  {key:<11}{bucket['requests']:>4}  {_kb(bucket['transfer']):>10}  {_kb(bucket['bytes']):>10}")
+        print()
+    for e in report['external']:
+        print(f"  extern ({e['position']}): {e['url']} – Größe offline unbekannt")
+
+
+def budget_pages(pages: List[str], budgets_file: Optional[str] = None, as_json: bool = False) -> int:
+    """Weigh every page and check it against the budgets; returns the number of problems"""
+    budgets = load_budgets(budgets_file)
+    reports, failures = [], 0
+    for page in pages:
+        report = weigh_page(page)
+        report['problems'] = check_budgets(report, budgets)
+        failures += len(report['problems'])
+        reports.append(report)
+        if not as_json:
+            print_weight(report)
+            for problem in report['problems']:
+                print(f"✗ {page}: {problem}", file=sys.stderr)
+    if as_json:
+        print(json.dumps({'budgets': budgets, 'pages': reports}, ensure_ascii=False, indent=1))
+    elif not failures:
+        print(f"✓ Budgets eingehalten: {', '.join(pages)}")
+    return failures
+
+
+# --- Service worker: precache every asset the pages reference, one revision (content hash) per entry ---
+
+SERVICE_WORKER_NAME = 'sw.js'       # at the site root: its scope covers index.html and en/
+_SW_SCRIPT = """// Generated by generate-html.py --service-worker – do not edit
+// Precache: URL (relative to this file) → content hash. A changed hash refetches only that entry.
+const PRECACHE = __PRECACHE__;
+const CACHE = 'cv-precache';
+
+function cacheKey(path) {
+  return new URL(path, self.location).href + '?rev=' + PRECACHE[path];
+}
+
+self.addEventListener('install', function (event) {
+  event.waitUntil(caches.open(CACHE).then(function (cache) {
+    return Promise.all(Object.keys(PRECACHE).map(function (path) {
+      return cache.match(cacheKey(path)).then(function (hit) {
+        if (hit) return;
+        return fetch(new URL(path, self.location), { cache: 'no-cache' }).then(function (response) {
+          if (!response.ok) throw new Error(path + ': ' + response.status);
+          return cache.put(cacheKey(path), response);
+        });
+      });
+    }));
+  }).then(function () { return self.skipWaiting(); }));
+});
+
+self.addEventListener('activate', function (event) {
+  var live = new Set(Object.keys(PRECACHE).map(cacheKey));
+  event.waitUntil(caches.open(CACHE).then(function (cache) {
+    return cache.keys().then(function (requests) {
+      return Promise.all(requests.filter(function (request) {
+        return !live.has(request.url);
+      }).map(function (request) { return cache.delete(request); }));
+    });
+  }).then(function () { return self.clients.claim(); }));
+});
+
+self.addEventListener('fetch', function (event) {
+  var url = new URL(event.request.url);
+  var scope = self.registration.scope;
+  if (event.request.method !== 'GET' || !url.href.startsWith(scope)) return;
+  var path = decodeURIComponent((url.origin + url.pathname).slice(scope.length));
+  if (path === '' || path.endsWith('/')) path += 'index.html';
+  if (!(path in PRECACHE)) return;
+  event.respondWith(caches.open(CACHE).then(function (cache) {
+    return cache.match(cacheKey(path)).then(function (hit) {
+      return hit || fetch(event.request);
+    });
+  }));
+});
+"""
+
+
+def service_worker_url(output_file: str, root: Optional[str] = None) -> str:
+    """URL of the site's sw.js relative to a page – '' when the page lies outside the site root"""
+    root_path = Path(root or TEMPLATE_PATH.parent).resolve()
+    page_dir = Path(output_file).resolve().parent
+    if page_dir != root_path and root_path not in page_dir.parents:
+        return ''
+    return Path(os.path.relpath(root_path / SERVICE_WORKER_NAME, page_dir)).as_posix()
+
+
+def service_worker_script(url: str) -> str:
+    """The registration snippet for the template's SW_REGISTER slot – '' (no script at all) without a sw.js URL"""
+    if not url:
+        return ''
+    literal = json.dumps(url).replace('</', '<\\/')  # JSON string, safe inside <script>
+    return ('\n  <script>\n'
+            "    if ('serviceWorker' in navigator) {\n"
+            f'      navigator.serviceWorker.register({literal}).catch(function () {{}});\n'
+            '    }\n'
+            '  </script>\n')
+
+
+def precache_entries(page: str, root: Path) -> Dict[str, str]:
+    """The page and every asset it loads (srcset candidates included, <a href> targets not) → content hash"""
+    entries = {}
+    for resource in weigh_page(page)['resources']:
+        if resource['position'] == 'link' or resource['missing']:
+            continue
+        path = Path(page) if resource['position'] == 'document' else Path(resource['path'])
+        rel = path.resolve().relative_to(root).as_posix()
+        entries[rel] = _content_hash(path)
+    return entries
+
+
+def write_service_worker(pages: List[str], root: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+    """Write sw.js for the pages; entries of pages built earlier (kept in the asset manifest) stay precached"""
+    root_path = Path(root or TEMPLATE_PATH.parent).resolve()
+    check_under_root(pages, root_path)
+    manifest_path = root_path / MANIFEST_NAME
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        manifest = {'pages': {}}
+    precache = {rel: entries for rel, entries in manifest.get('precache', {}).items() if (root_path / rel).is_file()}
+    for page in pages:
+        page_path = Path(page).resolve()
+        entries = precache[page_path.relative_to(root_path).as_posix()] = precache_entries(page, root_path)
+        print(f"✓ Precache: {page} ({len(entries)} Einträge)")
+
+    merged = {rel: digest for entries in precache.values() for rel, digest in entries.items()}
+    script = _SW_SCRIPT.replace('__PRECACHE__', json.dumps(dict(sorted(merged.items())), indent=2))
+    sw_path = root_path / SERVICE_WORKER_NAME
+    written = write_if_changed(sw_path, script)
+    manifest['precache'] = precache
+    write_if_changed(manifest_path, json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    print(f"{'✓ Service Worker' if written else '· Service Worker unverändert'}: {sw_path} ({len(merged)} Einträge)")
+    return precache
+
+
+# --- Output formats: JSON Resume, plain text and vCard rendered from the same parsed model ---
+
+# Format → file suffix; the HTML path names the others (index.html → index.json, index.txt, index.vcf)
+OUTPUT_FORMATS = {'html': '.html', 'json': '.json', 'txt': '.txt', 'vcf': '.vcf'}
+TEXT_WIDTH = 78
+
+_QUALIFIED = re.compile(r'^(.*?)\s*\((.*)\)$')
+JSON_RESUME_SCHEMA = 'https://raw.githubusercontent.com/jsonresume/resume-schema/v1.0.0/schema.json'
+
+
+def _compact(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop empty fields (JSON Resume leaves unknown values out)"""
+    return {key: value for key, value in record.items() if value}
+
+
+def render_json_resume(data: CV) -> str:
+    """JSON Resume (schema v1.0.0). Haltung and free-form sections have no counterpart there."""
+    h = data.header
+    basics: Dict[str, Any] = {'name': h.name or '', 'label': h.title or ''}
+    profiles = []
+    for kind, text, href in contact_links(h.contact):
+        if kind == 'location':
+            basics['location'] = {'address': text, 'city': text.split(',')[0].strip()}
+        elif kind == 'linkedin':
+            profiles.append({'network': 'LinkedIn', 'username': text.rstrip('/').rsplit('/', 1)[-1], 'url': text})
+        else:
+            basics[kind] = text
+
+    summary = [h.tagline] if h.tagline else []
+    work, education, skills, languages = [], [], [], []
+    for section in data.sections:
+        t = section.type
+        if t == 'profil':
+            summary += [item.text for item in section.content if item.type == 'text']
+        elif t == 'berufserfahrung':
+            for job in section.subsections:
+                period, location = split_period(job.period)
+                start, end = iso_dates(period)
+                work.append(_compact({
+                    'name': job.title, 'position': job.job_title, 'location': location,
+                    'startDate': start, 'endDate': end,
+                    'summary': ' '.join(job.description or []), 'highlights': job.bullets,
+                }))
+        elif t == 'ausbildung':
+            for institution, degree, period in education_entries(section):
+                study_type, _, area = degree.rpartition(', ') if ', ' in degree else (degree, '', '')
+                start, end = iso_dates(period)
+                education.append(_compact({'institution': institution, 'studyType': study_type, 'area': area,
+                                           'startDate': start, 'endDate': end}))
+        elif t == 'schwerpunkte':
+            for sub in section.subsections:
+                if is_method_list(sub):
+                    skills.append({'name': sub.title, 'keywords': method_pills(sub.bullets)})
+                else:
+                    skills.append({'name': sub.title})
+        elif t == 'sprachen':
+            for item in section.content:
+                if item.type == 'bullet':
+                    match = _QUALIFIED.match(item.text)
+                    languages.append({'language': match.group(1), 'fluency': match.group(2)} if match
+                                     else {'language': item.text})
+
+    basics['summary'] = '\n\n'.join(summary)
+    if profiles:
+        basics['profiles'] = profiles
+    resume = {'$schema': JSON_RESUME_SCHEMA, 'basics': _compact(basics), 'work': work,
+              'education': education, 'skills': skills, 'languages': languages}
+    return json.dumps(_compact(resume), ensure_ascii=False, indent=2) + '\n'
+
+
+def _wrap(text: str, indent: str = '', first: Optional[str] = None) -> List[str]:
+    return textwrap.wrap(text, TEXT_WIDTH, initial_indent=indent if first is None else first,
+                         subsequent_indent=indent, break_on_hyphens=False) or ['']
+
+
+def render_text(data: CV) -> str:
+    """Plain text, wrapped at TEXT_WIDTH columns – same content and order as the page"""
+    h = data.header
+    out = [line for line in (h.name, h.title) if line]
+    out += [text for _, text, _ in contact_links(h.contact)]
+
+    groups = zone_sections(data.sections)
+    for section in groups['white1'] + groups['zinc50'] + groups['white2']:
+        t = section.type
+        out += ['', '', section.title.upper(), '']
+        paragraphs = [item.text for item in section.content if item.type == 'text']
+        if t == 'profil':
+            for text in ([h.tagline] if h.tagline else []) + paragraphs:
+                out += _wrap(text) + ['']
+        elif t == 'berufserfahrung':
+            for job in section.subsections:
+                period, location = split_period(job.period)
+                out += _wrap(job_heading(job))
+                out += _wrap(' · '.join(part for part in (period, location) if part))
+                if job.description is not None:
+                    out += [''] + _wrap(' '.join(job.description))
+                if job.bullets is not None:
+                    out.append('')
+                    for bullet in job.bullets:
+                        out += _wrap(bullet, '    ', '  • ')
+                out.append('')
+        elif t == 'ausbildung':
+            for entry in education_entries(section):
+                out += [line for line in entry if line] + ['']
+        elif t in ('schwerpunkte', 'haltung'):
+            if paragraphs:
+                out += _wrap(paragraphs[0]) + ['']
+            for sub in section.subsections:
+                if t == 'schwerpunkte' and is_method_list(sub):
+                    out += _wrap(sub.title) + _wrap(', '.join(method_pills(sub.bullets)), '  ') + ['']
+                else:
+                    out += _wrap(sub.title) + _wrap(' '.join(sub.content), '  ') + ['']
+        elif t == 'sprachen':
+            out += _wrap(' · '.join(item.text for item in section.content if item.type == 'bullet'))
+        else:
+            for item in section.content:
+                out += _wrap(item.text) if item.type == 'text' else _wrap(item.text, '  ', '• ')
+        while out[-1] == '':
+            out.pop()
+    return '\n'.join(out) + '\n'
+
+
+def _vcard_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n').replace(',', '\\,').replace(';', '\\;')
+
+
+def _vcard_fold(line: str) -> str:
+    """Fold a content line at 75 octets (RFC 6350 3.2) without splitting UTF-8 sequences"""
+    parts, part, size = [], '', 0
+    for ch in line:
+        n = len(ch.encode('utf-8'))
+        if size + n > 75:
+            parts.append(part)
+            part, size = ' ', 1
+        part += ch
+        size += n
+    parts.append(part)
+    return '\r\n'.join(parts)
+
+
+def render_vcard(data: CV) -> str:
+    """vCard 3.0 contact card: name, title, current employer, contact links, tagline as note"""
+    h = data.header
+    name = h.name or ''
+    given, _, family = name.rpartition(' ')
+    lines = ['BEGIN:VCARD', 'VERSION:3.0', f'N:{_vcard_escape(family)};{_vcard_escape(given)};;;',
+             f'FN:{_vcard_escape(name)}']
+    if h.title:
+        lines.append(f'TITLE:{_vcard_escape(h.title)}')
+    for section in data.sections:
+        if section.type == 'berufserfahrung' and section.subsections:
+            job = section.subsections[0]
+            start, end = iso_dates(split_period(job.period)[0])
+            if start and not end:           # open period: current employer
+                lines.append(f'ORG:{_vcard_escape(job.title)}')
+            break
+    for kind, text, href in contact_links(h.contact):
+        if kind == 'location':
+            parts = [part.strip() for part in text.split(',')]
+            country = parts[-1] if len(parts) > 1 else ''
+            lines.append(f'ADR;TYPE=WORK:;;;{_vcard_escape(parts[0])};;;{_vcard_escape(country)}')
+        elif kind == 'email':
+            lines.append(f'EMAIL;TYPE=INTERNET:{_vcard_escape(text)}')
+        elif kind == 'phone':
+            lines.append(f'TEL;TYPE=VOICE:{_vcard_escape(text)}')
+        elif kind == 'linkedin':
+            lines.append(f'URL:{text}')
+    if h.tagline:
+        lines.append(f'NOTE:{_vcard_escape(h.tagline)}')
+    lines.append('END:VCARD')
+    return ''.join(_vcard_fold(line) + '\r\n' for line in lines)
+
+
+def render_format(fmt: str, data: CV) -> str:
+    """One non-HTML format as text (renderers looked up by name, so --profile can time them).
+    Headings and labels come from the markdown itself, so unlike the page they need no language."""
+    if fmt == 'json':
+        return render_json_resume(data)
+    elif fmt == 'txt':
+        return render_text(data)
+    elif fmt == 'vcf':
+        return render_vcard(data)
+    raise ValueError(f'Unbekanntes Format: {fmt}')
+
+
+# --- Profiling: per-stage wall time, call counts and peak memory (--profile, host hooks) ---
+
+_ProfileHook = Callable[[str, float, int], None]
+_active_profiler: Optional['Profiler'] = None
+_END = object()
+
+
+class Profiler:
+    """Instruments the pipeline while active (`with Profiler() as p:`) – nothing is wrapped otherwise.
+
+    Stages: read, parse, validate, group, template, generate:<type>, images, css, fonts, minify, write,
+    json, txt, vcf.
+    Stages nest (write → template → generate:*), so every stage reports inclusive wall time and
+    self time without its children. Hooks get (stage, seconds, peak_bytes) after each call.
+
+    memory=True adds per-stage peak memory via tracemalloc, which slows every allocation – measure it in
+    a separate pass and take the timings from one without (see add_memory, --profile-mem).
+
+    Not thread-safe: instrumenting patches module functions and CVParser/HTMLGenerator/CompiledTemplate
+    methods process-wide, so don't profile while a CVRenderer renders in other threads.
+    """
+
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.hooks: List[_ProfileHook] = []
+        self.wall = 0.0
+        self.peak = 0
+        self._stack: List[list] = []      # [stage, start, child_seconds, mem_start, mem_peak]
+        self._patched: List[Tuple[Any, str, Any]] = []
+        self._tracing = False
+
+    def subscribe(self, hook: _ProfileHook) -> Callable[[], None]:
+        """Call hook(stage, seconds, peak_bytes) after each instrumented call; returns unsubscribe"""
+        self.hooks.append(hook)
+        return lambda: self.hooks.remove(hook)
+
+    def __enter__(self) -> 'Profiler':
+        global _active_profiler
+        if _active_profiler is not None:
+            raise RuntimeError('Profiler bereits aktiv')
+        _active_profiler = self
+        self._instrument()
+        if self.memory:
+            self._tracing = not tracemalloc.is_tracing()
+            if self._tracing:
+                tracemalloc.start()
+            self._mem_base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _active_profiler
+        self.wall += time.perf_counter() - self._start
+        if self.memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1] - self._mem_base)
+            if self._tracing:
+                tracemalloc.stop()
+        for owner, name, original in reversed(self._patched):
+            if isinstance(owner, dict):
+                owner[name] = original
+            else:
+                setattr(owner, name, original)
+        self._patched.clear()
+        _active_profiler = None
+
+    def enter(self, stage: str) -> None:
+        mem = 0
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1][4] = max(self._stack[-1][4], peak)
+            tracemalloc.reset_peak()
+            mem = current
+        self._stack.append([stage, time.perf_counter(), 0.0, mem, 0])
+
+    def exit(self, count: bool = True) -> None:
+        stage, start, child, mem_start, mem_peak = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        peak = 0
+        if self.memory:
+            traced_peak = max(mem_peak, tracemalloc.get_traced_memory()[1])
+            peak = traced_peak - mem_start
+            self.peak = max(self.peak, traced_peak - self._mem_base)
+            if self._stack:
+                self._stack[-1][4] = max(self._stack[-1][4], traced_peak)
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        stats = self.stages.setdefault(stage, {'calls': 0, 'wall': 0.0, 'self': 0.0, 'peak': 0})
+        stats['calls'] += count
+        stats['wall'] += elapsed
+        stats['self'] += elapsed - child
+        stats['peak'] = max(stats['peak'], peak)
+        for hook in self.hooks:
+            hook(stage, elapsed, peak)
+
+    def add_memory(self, other: 'Profiler') -> None:
+        """Take the peak memory figures from a separate memory=True pass over the same work"""
+        self.memory = True
+        self.peak = other.peak
+        for stage, stats in self.stages.items():
+            stats['peak'] = other.stages.get(stage, {}).get('peak', 0)
+
+    def report(self) -> Dict[str, Any]:
+        """Machine-readable breakdown (ms / bytes), stages in first-call order"""
+        return {
+            'wall_ms': round(self.wall * 1000, 3),
+            'peak_bytes': self.peak if self.memory else None,
+            'stages': {
+                stage: {
+                    'calls': s['calls'],
+                    'wall_ms': round(s['wall'] * 1000, 3),
+                    'self_ms': round(s['self'] * 1000, 3),
+                    'peak_bytes': s['peak'] if self.memory else None,
+                }
+                for stage, s in self.stages.items()
+            },
+        }
+
+    # --- Instrumentation (installed on __enter__, removed on __exit__) ---
+
+    def _patch(self, owner: Any, name: str, wrapper: Callable) -> None:
+        original = owner[name] if isinstance(owner, dict) else getattr(owner, name)
+        self._patched.append((owner, name, original))
+        if isinstance(owner, dict):
+            owner[name] = wrapper(original)
+        else:
+            setattr(owner, name, wrapper(original))
+
+    def _instrument(self) -> None:
+        module = globals()   # module functions are looked up by name at call time
+        for name, stage in (('write_output', 'write'), ('prepare_photo', 'images'),
+                            ('apply_static_css', 'css'), ('optimize_fonts', 'fonts'), ('minify_html', 'minify'),
+                            ('render_json_resume', 'json'), ('render_text', 'txt'), ('render_vcard', 'vcf')):
+            self._patch(module, name, lambda f, stage=stage: self._timed(stage, f))
+        self._patch(CVParser, '_parse', self._timed_parse)
+        self._patch(CVParser, '_validate', lambda f: self._timed('validate', f))
+        self._patch(HTMLGenerator, '_group_sections', lambda f: self._timed('group', f))
+        self._patch(CompiledTemplate, 'render', lambda f: self._timed('template', f))
+        self._patch(CompiledTemplate, 'iter_render', lambda f: self._timed_generator('template', f))
+        for name in dir(HTMLGenerator):
+            if name.startswith('_generate_') and name != '_generate_section':
+                self._patch(HTMLGenerator, name,
+                            lambda f, stage=f"generate:{name[len('_generate_'):]}": self._timed(stage, f))
+
+    def _timed(self, stage: str, func: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            self.enter(stage)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.exit()
+        return timed
+
+    def _timed_iter(self, stage: str, iterator: Iterable) -> Iterator:
+        """Time each resumption of a lazy iterator; counts as one call"""
+        iterator = iter(iterator)
+        first = True
+        while True:
+            self.enter(stage)
+            try:
+                item = next(iterator, _END)
+            finally:
+                self.exit(first)
+            first = False
+            if item is _END:
+                return
+            yield item
+
+    def _timed_generator(self, stage: str, func: Callable) -> Callable:
+        return lambda *args, **kwargs: self._timed_iter(stage, func(*args, **kwargs))
+
+    def _timed_parse(self, func: Callable) -> Callable:
+        """Reading is timed as one stage before parsing – timing each line would cost more than the reading"""
+        timed = self._timed('parse', func)
+
+        def parse(parser, stream):
+            self.enter('read')
+            try:
+                lines = list(stream)
+            finally:
+                self.exit()
+            return timed(parser, iter(lines))
+        return parse
+
+
+# Stages that rewrite the finished document (and therefore need it in one piece)
+POSTPROCESS_STAGES = ('css', 'fonts', 'minify', 'fingerprint')
+
+
+def postprocess(html: str, output_file: str, stages: Dict[str, Any]) -> str:
+    """Optional build stages on the generated document (keys as set by the CLI flags)"""
+    if stages.get('css'):
+        html = apply_static_css(html, stages['css'], output_file)
+    if stages.get('fonts'):
+        html = optimize_fonts(html, stages['fonts'], output_file)
+    if stages.get('minify'):
+        html = minify_html(html)
+    return html
+
+
+def write_output(generator: HTMLGenerator, output_file: str, stages: Dict[str, Any]) -> bool:
+    """Write the page – streamed chunk by chunk unless a build stage needs the whole document.
+    Atomic (temp file + rename) and skipped when the file is already identical; True if it changed."""
+    if any(stages.get(key) for key in POSTPROCESS_STAGES):
+        html = postprocess(generator.generate(), output_file, stages)
+        if stages.get('fingerprint'):
+            # Hashed asset names are set before the single write, so an unchanged page stays untouched
+            return bool(fingerprint_pages([output_file], stages['fingerprint'], {output_file: html}))
+        return write_if_changed(Path(output_file), html)
+    tmp = _tmp_path(Path(output_file))
+    with open(tmp, 'w', encoding='utf-8') as stream:
+        generator.write_to(stream)
+    return _replace_if_changed(tmp, Path(output_file))
+
+
+def format_paths(output_file: str, formats: Iterable[str]) -> Dict[str, str]:
+    """Output path per format: the HTML path itself, the others with their own suffix"""
+    base = Path(output_file)
+    return {fmt: output_file if fmt == 'html' else str(base.with_suffix(OUTPUT_FORMATS[fmt])) for fmt in formats}
+
+
+def write_formats(generator: HTMLGenerator, output_file: str, formats: Iterable[str], stages: Dict[str, Any],
+                  concurrent: bool = True) -> List[Tuple[str, bool]]:
+    """Render every format from generator.data (parsed once, shared read-only) – one thread per format.
+    Returns (path, changed) per format."""
+    paths = format_paths(output_file, formats)
+
+    def write(fmt: str) -> Tuple[str, bool]:
+        if fmt == 'html':
+            return paths[fmt], write_output(generator, paths[fmt], stages)
+        text = render_format(fmt, generator.data)
+        return paths[fmt], write_if_changed(Path(paths[fmt]), text)
+
+    if len(paths) == 1 or not concurrent:
+        return [write(fmt) for fmt in paths]
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        return list(pool.map(write, paths))
+
+
+# Template, fragment cache and build stages set up once per batch worker process (see _init_worker)
+_worker_template: Optional[CompiledTemplate] = None
+_worker_fragments: Optional[FragmentCache] = None
+_worker_models: Optional[ModelCache] = None
+_worker_stages: Dict[str, Any] = {}
+_worker_formats: List[str] = ['html']
+_worker_reproducible = False
+
+
+def fragment_cache_for(cache_dir: Optional[str]) -> Optional[FragmentCache]:
+    """Persistent fragment cache inside the --cache directory (None without --cache)"""
+    return FragmentCache(path=Path(cache_dir) / 'fragments.json') if cache_dir else None
+
+
+def model_cache_for(cache_dir: Optional[str]) -> Optional[ModelCache]:
+    """Parsed-model cache inside the --cache directory (None without --cache)"""
+    return ModelCache(Path(cache_dir) / 'models') if cache_dir else None
+
+
+def parse_markdown(markdown_file: Union[str, Path], models: Optional[ModelCache] = None) -> CVParser:
+    """Parse a markdown CV, skipping the parser when the model cache has it"""
+    return models.parse(markdown_file) if models else CVParser(markdown_file)
+
+
+def _init_worker(template_path: str, cache_dir: Optional[str] = None, stages: Optional[Dict[str, Any]] = None,
+                 formats: Optional[List[str]] = None, reproducible: bool = False) -> None:
+    """Process pool initializer: compile template.html once per worker"""
+    global _worker_template, _worker_fragments, _worker_models, _worker_stages, _worker_formats, _worker_reproducible
+    _worker_template = load_template(Path(template_path), cache_dir)
+    _worker_fragments = fragment_cache_for(cache_dir)
+    if _worker_fragments:
+        _worker_fragments.fresh = {}
+    _worker_models = model_cache_for(cache_dir)
+    _worker_stages = stages or {}
+    _worker_formats = formats or ['html']
+    _worker_reproducible = reproducible
+
+
+def _render_file(markdown_file: str, output_file: str, photo_file: str, lang: str,
+                 sw_url: str = '') -> Tuple[str, str, str, Dict[str, str], Dict[str, Dict[str, List[str]]]]:
+    """Parse + generate + write one CV; returns (markdown, output, error, new fragments, font subsets) – error is
+    '' on success. Workers never write fragments.json or subsets.json themselves: the parent merges and saves once."""
+    try:
+        parser = parse_markdown(markdown_file, _worker_models)
+        variants = prepare_photo(photo_file, _worker_stages['images'], output_file) if _worker_stages.get('images') else None
+        stamp = None
+        if _worker_reproducible and source_date_clock() is None:
+            stamp = input_stamp(Path(markdown_file).read_bytes(), _worker_template, photo_file, lang, _worker_stages,
+                                variants, sw_url)
+        generator = HTMLGenerator(parser.data, photo_file, lang, template=_worker_template,
+                                  fragment_cache=_worker_fragments, photo_variants=variants,
+                                  service_worker=sw_url, stamp=stamp)
+        written = write_formats(generator, output_file, _worker_formats, _worker_stages)
+        fresh = _worker_fragments.take_fresh() if _worker_fragments else {}
+        return markdown_file, ', '.join(path for path, _ in written), '', fresh, take_font_subsets()
+    except Exception as e:
+        return markdown_file, output_file, f'{type(e).__name__}: {e}', {}, take_font_subsets()
+
+
+# --- Check: parse-only lint over many markdown files (--check) ---
+
+# Below this many files per worker a process pool costs more than it saves
+CHECK_FILES_PER_WORKER = 250
+
+
+class CheckParser(CVParser):
+    """CVParser that keeps its diagnostics instead of printing them"""
+
+    def _validate(self, data: CV) -> None:
+        pass
+
+
+def parse_text(markdown: str) -> CVParser:
+    """Parse markdown given as a string without printing warnings – parser.diagnostics(parser.data) lists them"""
+    return CheckParser.from_text(markdown)
+
+
+def check_file(markdown_file: str) -> Tuple[str, List[Tuple[str, int, str, str]]]:
+    """(file, diagnostics) – parse only, nothing is rendered; an unreadable file is one error"""
+    try:
+        parser = CheckParser(markdown_file)
+    except (OSError, UnicodeDecodeError) as e:
+        return markdown_file, [('error', 0, 'unreadable', f'{type(e).__name__}: {e}')]
+    return markdown_file, parser.diagnostics(parser.data)
+
+
+def check_files(inputs: List[Path], jobs: Optional[int] = None) -> List[Tuple[str, List[Tuple[str, int, str, str]]]]:
+    """check_file for every input, in input order – across a process pool once the corpus is large enough"""
+    files = [str(path) for path in inputs]
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(files) // CHECK_FILES_PER_WORKER))
+    if workers == 1:
+        return [check_file(markdown_file) for markdown_file in files]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(check_file, files, chunksize=max(1, len(files) // (workers * 4))))
+
+
+def report_check(results: List[Tuple[str, List[Tuple[str, int, str, str]]]], as_json: bool = False) -> int:
+    """Print file:line diagnostics (text) or one JSON document on stdout; returns the number of errors"""
+    rows = [{'file': markdown_file, 'line': lineno, 'severity': severity, 'code': code, 'message': message}
+            for markdown_file, found in results for severity, lineno, code, message in found]
+    errors = sum(row['severity'] == 'error' for row in rows)
+    warnings = len(rows) - errors
+    if as_json:
+        print(json.dumps({'files': len(results), 'errors': errors, 'warnings': warnings, 'diagnostics': rows},
+                         ensure_ascii=False, indent=1))
+    else:
+        for row in rows:
+            where = f"{row['file']}:{row['line']}" if row['line'] else row['file']
+            print(f"{where}: {row['severity']}: {row['message']} [{row['code']}]")
+        mark = '✗' if errors else '✓'
+        print(f"{mark} {len(results)} Dateien geprüft: {errors} Fehler, {warnings} Warnungen", file=sys.stderr)
+    return errors
+
+
+# --- Library API: reentrant in-memory rendering for embedding (no filesystem access per call) ---
+
+# Build stages that work on the document alone; fonts and images read and write asset files
+CVRENDERER_STAGES = {'css': ('inline',), 'minify': (True, False)}
+
+
+class CVRenderer:
+    """Markdown text in, document out – for a web service or thread pool.
+
+    Template and labels are loaded once in the constructor; render() and iter_render() only touch
+    their arguments and the thread-safe fragment cache, so one instance serves any number of threads.
+    Diagnostics are returned by check() instead of being printed.
+
+        renderer = CVRenderer(clock=lambda: datetime(2026, 1, 1))
+        html = renderer.render(markdown, lang='en', stages={'css': 'inline'})
+    """
+
+    def __init__(self, template: Optional[CompiledTemplate] = None, fragment_cache: Optional[FragmentCache] = None,
+                 clock: Optional[Callable[[], datetime]] = None, photo: str = 'assets/Jan_Musiedlak_Foto.jpeg',
+                 lang: str = 'de', stages: Optional[Dict[str, Any]] = None):
+        self.template = template or load_template()
+        self.fragment_cache = fragment_cache if fragment_cache is not None else FragmentCache()
+        self.clock = clock
+        self.photo = photo
+        self.lang = lang
+        self.stages = self._check_stages(stages or {})
+
+    @staticmethod
+    def _check_stages(stages: Dict[str, Any]) -> Dict[str, Any]:
+        for key, value in stages.items():
+            if value not in CVRENDERER_STAGES.get(key, ()):
+                allowed = ', '.join(f'{k}={v!r}' for k, values in CVRENDERER_STAGES.items() for v in values)
+                raise ValueError(f"Stage {key}={value!r} braucht Dateizugriff oder ist unbekannt (erlaubt: {allowed})")
+        return stages
+
+    def parse(self, markdown: str) -> CVParser:
+        """Parse without printing warnings (see check())"""
+        return CheckParser.from_text(markdown)
+
+    def check(self, markdown: str) -> List[Tuple[str, int, str, str]]:
+        """Diagnostics as in --check: (severity, line, code, message)"""
+        parser = self.parse(markdown)
+        return parser.diagnostics(parser.data)
+
+    def generator(self, markdown: str, lang: Optional[str] = None, photo: Optional[str] = None,
+                  clock: Optional[Callable[[], datetime]] = None) -> HTMLGenerator:
+        """HTMLGenerator for one request – per-call options override the instance defaults"""
+        return HTMLGenerator(self.parse(markdown).data, photo or self.photo, lang or self.lang,
+                             template=self.template, fragment_cache=self.fragment_cache,
+                             clock=clock or self.clock)
+
+    def render(self, markdown: str, lang: Optional[str] = None, photo: Optional[str] = None,
+               clock: Optional[Callable[[], datetime]] = None, stages: Optional[Dict[str, Any]] = None,
+               fmt: str = 'html') -> str:
+        """Complete document; fmt is one of OUTPUT_FORMATS (json, txt and vcf ignore lang, photo, clock and stages)"""
+        if fmt != 'html':
+            if fmt not in OUTPUT_FORMATS:
+                raise ValueError(f"Unbekanntes Format: {fmt} (erlaubt: {', '.join(OUTPUT_FORMATS)})")
+            return render_format(fmt, self.parse(markdown).data)
+        return ''.join(self.iter_render(markdown, lang, photo, clock, stages))
+
+    def iter_render(self, markdown: str, lang: Optional[str] = None, photo: Optional[str] = None,
+                    clock: Optional[Callable[[], datetime]] = None,
+                    stages: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """HTML chunk by chunk (template segments and single sections); one chunk when a stage needs the whole page.
+        Parsing happens up front, so markdown errors surface here and not mid-stream."""
+        stages = self.stages if stages is None else self._check_stages(stages)
+        generator = self.generator(markdown, lang, photo, clock)
+        if any(stages.get(key) for key in POSTPROCESS_STAGES):
+            return iter([postprocess(generator.generate(), '', stages)])
+        return generator.iter_chunks()
+
+
+def batch_inputs(pattern: str) -> List[Path]:
+    """Resolve a directory (all *.md inside) or glob pattern to a sorted list of markdown files"""
+    path = Path(pattern)
+    if path.is_dir():
+        return sorted(path.glob('*.md'))
+    return sorted(Path(p) for p in glob.glob(pattern, recursive=True) if p.endswith('.md'))
+
+
+def batch_outputs(inputs: List[Path], output_dir: str, suffix: str) -> List[Path]:
+    """One output per input, mirroring its path below the inputs' common directory (a/cv.md and b/cv.md
+    → OUT/a/cv.html and OUT/b/cv.html); subdirectories are created"""
+    base = Path(os.path.commonpath([str(md.parent.resolve()) for md in inputs]))
+    outputs = [Path(output_dir) / md.resolve().relative_to(base).with_suffix(suffix) for md in inputs]
+    for parent in {path.parent for path in outputs}:
+        parent.mkdir(parents=True, exist_ok=True)
+    return outputs
+
+
+def render_batch(inputs: List[Path], output_dir: str, photo_file: str, lang: str,
+                 jobs: Optional[int] = None, cache_dir: Optional[str] = None,
+                 stages: Optional[Dict[str, Any]] = None, formats: Optional[List[str]] = None,
+                 reproducible: bool = False, register_sw: bool = False, root: Optional[str] = None) -> int:
+    """Render many CVs across a process pool; prints one status line per file, returns failure count"""
+    if not inputs:
+        return 0
+    outputs = batch_outputs(inputs, output_dir, '.html')
+    sw_urls = [service_worker_url(str(output), root) if register_sw else '' for output in outputs]
+    if register_sw and not all(sw_urls):
+        print(f"⚠  {sw_urls.count('')} Seite(n) außerhalb von --root – ohne Service-Worker-Registrierung",
+              file=sys.stderr)
+    tasks = [(str(md), str(output), photo_file, lang, sw_url) for md, output, sw_url in zip(inputs, outputs, sw_urls)]
+
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(tasks)))
+    # Several files per task keep the IPC overhead low on large corpora
+    chunksize = max(1, len(tasks) // (workers * 4))
+
+    failures = 0
+    fragments = fragment_cache_for(cache_dir)
+    subsets: Dict[str, Dict[str, List[str]]] = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(str(TEMPLATE_PATH), cache_dir, stages, formats, reproducible)) as pool:
+        for markdown_file, output_file, error, fresh, used in pool.map(_render_file, *zip(*tasks),
+                                                                      chunksize=chunksize):
+            if error:
+                failures += 1
+                print(f"✗ Fehler: {markdown_file}: {error}", file=sys.stderr)
+            else:
+                print(f"✓ Generated: {output_file}")
+            if fragments:
+                fragments.merge(fresh)
+            for subset_dir, pages in used.items():
+                subsets.setdefault(subset_dir, {}).update(pages)
+    if fragments:
+        fragments.save()
+    report_pruned_subsets(prune_font_subsets(subsets))
+
+    print(f"{len(tasks) - failures}/{len(tasks)} CVs generated ({workers} workers)")
+    return failures
+
+
 def main():
     """Main entry point"""
     if len(sys.argv) < 2:
-        print("Usage: python3 generate-html.py <markdown> [-o OUTPUT] [-p PHOTO] [-l LANG]")
+        print("Usage: python3 generate-html.py <markdown> [-o OUTPUT] [-p PHOTO] [-l LANG] [--cache DIR]")
+        print("                                [--css inline|FILE] [--fonts SUBSET_DIR] [--images DIR] [--minify]")
+        print("                                [--formats html,json,txt,vcf] [--fingerprint] [--sw] [--root DIR]")
+        print("                                [--reproducible] [--profile FILE|-] [--profile-mem]")
+        print("       python3 generate-html.py --fingerprint <page.html>... [--root DIR]")
+        print("       python3 generate-html.py --service-worker <page.html>... [--root DIR]")
+        print("       python3 generate-html.py --check <markdown|dir|glob>... [--json] [-j JOBS]")
+        print("       python3 generate-html.py --budget <page.html>... [--budgets FILE] [--json]")
+        print("       python3 generate-html.py --batch <dir|glob> -o OUTPUT_DIR [-p PHOTO] [-l LANG] [-j JOBS] [--cache DIR]")
+        print("                                [--css inline] [--fonts SUBSET_DIR] [--images DIR] [--minify]")
+        print("                                [--formats html,json,txt,vcf] [--sw] [--root DIR] [--reproducible]")
         sys.exit(1)
 
     # Parse arguments
     markdown_file = sys.argv[1]
-    output_file = 'index.html'
+    output_file = None
     photo_file = 'assets/Jan_Musiedlak_Foto.jpeg'
     lang = 'de'
-
-    i = 2
+    batch = None
+    jobs = None
+    cache_dir = None
+    stages = {}
+    fingerprint = None
+    root = None
+    profile = None
+    profile_memory = False
+    formats = ['html']
+    check = None
+    budget = None
+    budgets_file = None
+    service_worker = None
+    register_sw = False
+    reproducible = False
+    as_json = False
+
+    i = 1
     while i < len(sys.argv):
         if sys.argv[i] == '-o' and i+1 < len(sys.argv):
             output_file = sys.argv[i+1]
@@ -682,17 +3398,209 @@ def main():
         elif sys.argv[i] == '-l' and i+1 < len(sys.argv):
             lang = sys.argv[i+1]
             i += 2
+        elif sys.argv[i] == '--batch' and i+1 < len(sys.argv):
+            batch = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '-j' and i+1 < len(sys.argv):
+            jobs = int(sys.argv[i+1])
+            i += 2
+        elif sys.argv[i] == '--cache' and i+1 < len(sys.argv):
+            cache_dir = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--css' and i+1 < len(sys.argv):
+            stages['css'] = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--fonts' and i+1 < len(sys.argv):
+            stages['fonts'] = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--minify':
+            stages['minify'] = True
+            i += 1
+        elif sys.argv[i] == '--images' and i+1 < len(sys.argv):
+            stages['images'] = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--fingerprint':
+            fingerprint = []
+            i += 1
+            while i < len(sys.argv) and not sys.argv[i].startswith('-'):
+                fingerprint.append(sys.argv[i])
+                i += 1
+        elif sys.argv[i] == '--check':
+            check = []
+            i += 1
+            while i < len(sys.argv) and not sys.argv[i].startswith('-'):
+                check.append(sys.argv[i])
+                i += 1
+        elif sys.argv[i] == '--budget':
+            budget = []
+            i += 1
+            while i < len(sys.argv) and not sys.argv[i].startswith('-'):
+                budget.append(sys.argv[i])
+                i += 1
+        elif sys.argv[i] == '--service-worker':
+            service_worker = []
+            i += 1
+            while i < len(sys.argv) and not sys.argv[i].startswith('-'):
+                service_worker.append(sys.argv[i])
+                i += 1
+        elif sys.argv[i] == '--sw':
+            register_sw = True
+            i += 1
+        elif sys.argv[i] == '--reproducible':
+            reproducible = True
+            i += 1
+        elif sys.argv[i] == '--budgets' and i+1 < len(sys.argv):
+            budgets_file = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--json':
+            as_json = True
+            i += 1
+        elif sys.argv[i] == '--root' and i+1 < len(sys.argv):
+            root = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--profile' and i+1 < len(sys.argv):
+            profile = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--profile-mem':
+            profile_memory = True
+            i += 1
+        elif sys.argv[i] == '--formats' and i+1 < len(sys.argv):
+            formats = list(dict.fromkeys(f.strip() for f in sys.argv[i+1].split(',') if f.strip()))
+            i += 2
         else:
             i += 1
 
-    # Parse and generate
-    parser = CVParser(markdown_file)
-    generator = HTMLGenerator(parser.data, photo_file, lang)
-    html = generator.generate()
+    # --fingerprint without pages next to a markdown input: fingerprint stage of this build (one write per page)
+    if fingerprint == [] and (batch is not None or not markdown_file.startswith('-')):
+        stages['fingerprint'] = str(Path(root or TEMPLATE_PATH.parent).resolve())
+        fingerprint = None
 
-    # Write output
-    Path(output_file).write_text(html, encoding='utf-8')
-    print(f"✓ Generated: {output_file}")
+    unknown = [fmt for fmt in formats if fmt not in OUTPUT_FORMATS]
+    if unknown or not formats:
+        print(f"✗ Unbekanntes Format: {', '.join(unknown)} (erlaubt: {', '.join(OUTPUT_FORMATS)})", file=sys.stderr)
+        sys.exit(1)
+
+    # Check mode: parse and lint only, exit code 1 on errors
+    if check is not None:
+        # A named file that doesn't exist is reported as unreadable, not silently skipped
+        inputs = [path for pattern in check
+                  for path in ([Path(pattern)] if Path(pattern).is_file() or not glob.has_magic(pattern)
+                               and pattern.endswith('.md') else batch_inputs(pattern))]
+        if not inputs:
+            print(f"✗ Keine Markdown-Dateien gefunden: {' '.join(check)}", file=sys.stderr)
+            sys.exit(1)
+        errors = report_check(check_files(list(dict.fromkeys(inputs)), jobs), as_json)
+        sys.exit(1 if errors else 0)
+
+    # Budget mode: weigh already generated pages, exit code 1 when a budget is exceeded or an asset is missing
+    if budget is not None:
+        missing = [page for page in budget if not Path(page).is_file()]
+        if not budget or missing:
+            print(f"✗ Seite nicht gefunden: {' '.join(missing) or '(keine angegeben)'}", file=sys.stderr)
+            sys.exit(1)
+        try:
+            failures = budget_pages(budget, budgets_file, as_json)
+        except (OSError, ValueError) as e:
+            print(f"✗ Budgets: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(1 if failures else 0)
+
+    # Service worker mode: sw.js precaching everything the (finished) pages load
+    if service_worker is not None:
+        missing = [page for page in service_worker if not Path(page).is_file()]
+        if not service_worker or missing:
+            print(f"✗ Seite nicht gefunden: {' '.join(missing) or '(keine angegeben)'}", file=sys.stderr)
+            sys.exit(1)
+        try:
+            write_service_worker(service_worker, root)
+        except ValueError as e:
+            print(f"✗ Service Worker: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    # Fingerprint mode: post-build pass over already generated pages
+    if fingerprint is not None:
+        try:
+            fingerprint_pages(fingerprint, root)
+        except ValueError as e:
+            print(f"✗ Fingerprint: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    # Batch mode: directory or glob → one HTML per markdown file in OUTPUT_DIR
+    if batch is not None:
+        inputs = batch_inputs(batch)
+        if not inputs:
+            print(f"✗ Keine Markdown-Dateien gefunden: {batch}", file=sys.stderr)
+            sys.exit(1)
+        if profile:
+            print("✗ --profile nur für einzelne Dateien (nicht im Batch-Modus)", file=sys.stderr)
+            sys.exit(1)
+        if stages.get('css', 'inline') != 'inline':
+            print("✗ Im Batch-Modus nur --css inline (Worker würden dieselbe CSS-Datei überschreiben)", file=sys.stderr)
+            sys.exit(1)
+        if stages.get('fingerprint'):
+            print("✗ --fingerprint nicht im Batch-Modus (Worker würden dasselbe Manifest überschreiben)", file=sys.stderr)
+            sys.exit(1)
+        failures = render_batch(inputs, output_file or '.', photo_file, lang, jobs, cache_dir, stages, formats,
+                                reproducible, register_sw, root)
+        sys.exit(1 if failures else 0)
+
+    # Parse and generate (instrumented with --profile)
+    if profile_memory and not profile:
+        print("✗ --profile-mem nur zusammen mit --profile", file=sys.stderr)
+        sys.exit(1)
+    output_file = output_file or 'index.html'
+    if stages.get('fingerprint'):
+        try:
+            check_under_root([output_file], Path(stages['fingerprint']))
+        except ValueError as e:
+            print(f"✗ Fingerprint: {e}", file=sys.stderr)
+            sys.exit(1)
+    if len(set(format_paths(output_file, formats).values())) < len(formats):
+        print(f"✗ Ausgabedatei {output_file} kollidiert mit einem der Formate – -o mit .html angeben", file=sys.stderr)
+        sys.exit(1)
+    sw_url = service_worker_url(output_file, root) if register_sw else ''
+    if register_sw and not sw_url:
+        print(f"⚠  {output_file} liegt außerhalb von --root – keine Service-Worker-Registrierung", file=sys.stderr)
+
+    def build(profiler: Optional[Profiler]) -> Tuple[List[Tuple[str, bool]], Optional[FragmentCache]]:
+        with profiler or contextlib.nullcontext():
+            parser = parse_markdown(markdown_file, model_cache_for(cache_dir))
+            fragments = fragment_cache_for(cache_dir)
+            variants = prepare_photo(photo_file, stages['images'], output_file) if stages.get('images') else None
+            template = load_template(cache_dir=cache_dir)
+            # Reproducible: $SOURCE_DATE_EPOCH wins (HTMLGenerator reads it), else a stamp from the inputs
+            stamp = None
+            if reproducible and source_date_clock() is None:
+                stamp = input_stamp(Path(markdown_file).read_bytes(), template, photo_file, lang, stages,
+                                    variants, sw_url)
+            generator = HTMLGenerator(parser.data, photo_file, lang, template=template, fragment_cache=fragments,
+                                      photo_variants=variants, service_worker=sw_url, stamp=stamp)
+            # The profiler keeps one stage stack, so formats render one after another when profiling
+            return write_formats(generator, output_file, formats, stages, concurrent=profiler is None), fragments
+
+    profiler = Profiler() if profile else None
+    written, fragments = build(profiler)
+    if profiler and profile_memory:
+        # Second pass under tracemalloc for the peaks only – the first pass's timings stay undistorted
+        memory = Profiler(memory=True)
+        with contextlib.redirect_stderr(io.StringIO()):   # warnings were printed by the first pass
+            build(memory)
+        profiler.add_memory(memory)
+    if fragments:
+        fragments.save()
+    for path, changed in written:
+        print(f"✓ Generated: {path}" if changed else f"· Unverändert: {path}")
+    report_pruned_subsets(prune_font_subsets())
+
+    if profiler:
+        report = json.dumps(profiler.report(), indent=1)
+        if profile == '-':
+            print(report)
+        else:
+            Path(profile).write_text(report + '\n', encoding='utf-8')
+            print(f"✓ Profil: {profile}")
 
 
 if __name__ == '__main__':
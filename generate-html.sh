@@ -11,13 +11,68 @@ MARKDOWN_FILE="${MARKDOWN_FILE:-$SCRIPT_DIR/CV_Jan_Musiedlak_final.md}"
 OUTPUT_FILE="${OUTPUT_FILE:-$SCRIPT_DIR/index.html}"
 PHOTO_FILE="${PHOTO_FILE:-assets/Jan_Musiedlak_Foto.jpeg}"
 LANG="${LANG:-de}"
+CSS="${CSS:-inline}"   # inline | <Pfad zur CSS-Datei> | cdn (Tailwind-JIT im Browser)
+FONTS="${FONTS:-$SCRIPT_DIR/assets/fonts/subset}"   # Zielordner für Font-Subsets | off
+IMAGES="${IMAGES:-$SCRIPT_DIR/assets/photo}"        # Zielordner für Foto-Varianten | off
+FINGERPRINT="${FINGERPRINT:-on}"                     # Asset-Hashes + .gz/.br | off
+REPRODUCIBLE="${REPRODUCIBLE:-on}"                   # Stempel aus Eingabe-Hash bzw. $SOURCE_DATE_EPOCH statt Uhrzeit | off
+MINIFY="${MINIFY:-off}"                               # SVG-Sprite, kurze Klassen, ohne Whitespace | on
+FORMATS="${FORMATS:-html}"                            # z. B. html,json,txt,vcf (neben OUTPUT_FILE)
+SW="${SW:-on}"                                        # sw.js: Seiten + Assets offline/sofort aus dem Cache | off
+BUDGET="${BUDGET:-on}"                                # Seitengewicht prüfen, Abbruch bei Überschreitung | off | <budgets.json>
+
+STAGE_ARGS=()
+if [ "$CSS" != "cdn" ]; then
+  STAGE_ARGS+=(--css "$CSS")
+fi
+if [ "$FONTS" != "off" ]; then
+  STAGE_ARGS+=(--fonts "$FONTS")
+fi
+if [ "$IMAGES" != "off" ]; then
+  STAGE_ARGS+=(--images "$IMAGES")
+fi
+if [ "$MINIFY" = "on" ]; then
+  STAGE_ARGS+=(--minify)
+fi
+if [ "$SW" != "off" ]; then
+  STAGE_ARGS+=(--sw)
+fi
+# Content-hashed asset names, manifest and precompressed siblings – applied before the page is written,
+# so an unchanged CV leaves index.html untouched
+if [ "$FINGERPRINT" != "off" ]; then
+  STAGE_ARGS+=(--fingerprint)
+fi
+if [ "$REPRODUCIBLE" != "off" ]; then
+  STAGE_ARGS+=(--reproducible)
+fi
 
 # Run Python generator
 python3 "$SCRIPT_DIR/generate-html.py" \
   "$MARKDOWN_FILE" \
   -o "$OUTPUT_FILE" \
   -p "$PHOTO_FILE" \
-  -l "$LANG"
+  -l "$LANG" \
+  --formats "$FORMATS" \
+  --root "$SCRIPT_DIR" \
+  "${STAGE_ARGS[@]}"
+
+# Service worker: precache list from the finished pages (after fingerprinting, so hashed names are listed)
+if [ "$SW" != "off" ]; then
+  SW_PAGES=("$OUTPUT_FILE")
+  if [ -f "$SCRIPT_DIR/en/index.html" ] && [ "$SCRIPT_DIR/en/index.html" != "$OUTPUT_FILE" ]; then
+    SW_PAGES+=("$SCRIPT_DIR/en/index.html")
+  fi
+  python3 "$SCRIPT_DIR/generate-html.py" --service-worker "${SW_PAGES[@]}" --root "$SCRIPT_DIR"
+fi
+
+# Page-weight budgets: every referenced asset must exist, totals must stay within budget
+if [ "$BUDGET" != "off" ]; then
+  BUDGET_ARGS=()
+  if [ "$BUDGET" != "on" ]; then
+    BUDGET_ARGS+=(--budgets "$BUDGET")
+  fi
+  python3 "$SCRIPT_DIR/generate-html.py" --budget "$OUTPUT_FILE" "${BUDGET_ARGS[@]}"
+fi
 
 echo "✓ HTML CV generated successfully"
 echo "  Open: file://$OUTPUT_FILE"
@@ -0,0 +1,1123 @@
+#!/usr/bin/env python3
+"""
+CV PDF Generator
+Renders the parsed CV model (CVParser from generate-html.py) straight to PDF – no browser.
+Follows the print layout of template.html: A4 with 10mm/18mm margins, Geist fonts from
+assets/fonts/ (subset and embedded), two-column job grid, no-break blocks kept on one page
+and a page break before Haltung.
+"""
+
+import sys
+import io
+import os
+import re
+import zlib
+import hashlib
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Optional, Tuple
+from urllib.parse import quote
+
+
+SCRIPT_DIR = Path(__file__).parent
+FONT_DIR = SCRIPT_DIR / 'assets' / 'fonts'
+
+try:
+    from fontTools.ttLib import TTFont  # optional: pip install fonttools brotli
+    from fontTools import subset as font_subset
+except ImportError:
+    TTFont = None
+
+try:
+    from PIL import Image, ImageOps  # optional: pip install pillow
+except ImportError:
+    Image = None
+
+
+def load_generator():
+    """Import generate-html.py (hyphenated file name → importlib)"""
+    spec = importlib.util.spec_from_file_location('generate_html', SCRIPT_DIR / 'generate-html.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# --- Page geometry: CSS px → pt, same numbers as template.html's print styles ---
+
+MM = 72 / 25.4
+PX = 0.75                       # 1 CSS px in pt
+REM = 16 * PX
+PAGE_W, PAGE_H = 210 * MM, 297 * MM
+MARGIN_X, MARGIN_Y = 18 * MM, 10 * MM      # @page { margin: 10mm 18mm }
+LEFT = MARGIN_X + 32 * PX                   # zone containers: px-8
+WIDTH = PAGE_W - 2 * LEFT
+TOP, BOTTOM = MARGIN_Y, PAGE_H - MARGIN_Y
+BODY = 0.7 * REM                            # print:text-[0.7rem]
+RELAXED = 1.625                             # leading-relaxed
+MEASURE = 44 * BODY                         # max-w-[44em]
+PHOTO = 110 * PX
+
+
+def tw(n: float) -> float:
+    """Tailwind spacing step (1 = 0.25rem) in pt"""
+    return n * REM / 4
+
+
+def _rgb(hex_color: str) -> Tuple[float, float, float]:
+    return tuple(int(hex_color[i:i + 2], 16) / 255 for i in (1, 3, 5))
+
+
+ZINC = {k: _rgb(v) for k, v in {'50': '#fafafa', '200': '#e4e4e7', '500': '#71717a', '600': '#52525b',
+                                '700': '#3f3f46', '900': '#18181b'}.items()}
+TEAL = {k: _rgb(v) for k, v in {'50': '#f0fdfa', '100': '#ccfbf1', '200': '#99f6e4', '400': '#2dd4bf',
+                                '600': '#0d9488', '700': '#0f766e'}.items()}
+INDIGO = {k: _rgb(v) for k, v in {'50': '#eef2ff', '200': '#c7d2fe', '700': '#4338ca'}.items()}
+
+
+# --- Fonts: Geist subset + embedded (fontTools), base-14 fallback ---
+
+FONT_FILES = {'regular': 'Geist-Regular.woff2', 'medium': 'Geist-Medium.woff2', 'mono': 'GeistMono-Medium.woff2'}
+
+# Every subset carries WinAnsi + German typography, so the same subset serves (almost) every CV
+_BASE_CHARS = {cp for cp in range(0x20, 0x100) if cp not in range(0x7f, 0xa0)} | set(map(ord, '–—‘’‚“”„•…€'))
+
+# Helvetica / Helvetica-Bold advance widths (AFM, 1/1000 em) for 0x20–0x7e
+_HELVETICA = (
+    '278 278 355 556 556 889 667 191 333 333 389 584 278 333 278 278 556 556 556 556 556 556 556 556 556 556 '
+    '278 278 584 584 584 556 1015 667 667 722 722 667 611 778 722 278 500 667 556 833 722 778 667 778 722 667 '
+    '611 722 667 944 667 667 611 278 278 278 469 556 333 556 556 500 556 556 278 556 556 222 222 500 222 833 '
+    '556 556 556 556 333 500 278 556 500 722 500 500 500 334 260 334 584')
+_HELVETICA_BOLD = (
+    '278 333 474 556 556 889 722 238 333 333 389 584 278 333 278 278 556 556 556 556 556 556 556 556 556 556 '
+    '333 333 584 584 584 611 975 722 722 722 722 667 611 778 722 278 556 722 611 833 722 778 667 778 722 667 '
+    '611 722 667 944 667 667 611 333 278 333 584 556 333 556 611 556 611 556 333 611 611 278 278 556 278 889 '
+    '611 611 611 611 389 556 333 611 556 778 556 556 500 389 280 389 584')
+_HELVETICA_EXTRA = {'Ä': 667, 'Ö': 778, 'Ü': 722, 'ä': 556, 'ö': 556, 'ü': 556, 'ß': 611, 'é': 556,
+                    '–': 556, '—': 1000, '•': 350, '·': 278, '„': 333, '“': 333, '”': 333, '’': 222}
+_HELVETICA_BOLD_EXTRA = dict(_HELVETICA_EXTRA, **{'ö': 611, 'ü': 611, '’': 278, '„': 500, '“': 500, '”': 500})
+
+
+class TrueTypeFace:
+    """Geist TrueType font: metrics via fontTools, embedded as CIDFontType2 subset (original glyph ids kept)"""
+
+    def __init__(self, path: Path):
+        font = TTFont(str(path), recalcTimestamp=False)     # WOFF2 decoded by fontTools (needs brotli)
+        font.flavor = None
+        buffer = io.BytesIO()
+        font.save(buffer)
+        self.data = buffer.getvalue()
+        self.name = re.sub(r'[^A-Za-z0-9-]', '', font['name'].getDebugName(6) or path.stem)
+
+        scale = 1000 / font['head'].unitsPerEm
+        glyph_ids = font.getReverseGlyphMap()
+        metrics = font['hmtx'].metrics
+        self.glyphs = {cp: (glyph_ids[name], metrics[name][0] * scale) for cp, name in font.getBestCmap().items()}
+        self.notdef = (0, metrics[font.getGlyphOrder()[0]][0] * scale)
+
+        os2, hhea, head = font['OS/2'], font['hhea'], font['head']
+        if os2.fsSelection & (1 << 7):       # USE_TYPO_METRICS – browsers then use the typo values
+            self.ascent, self.descent = os2.sTypoAscender * scale, os2.sTypoDescender * scale
+        else:
+            self.ascent, self.descent = hhea.ascent * scale, hhea.descent * scale
+        self.cap_height = (getattr(os2, 'sCapHeight', 0) or os2.sTypoAscender * 0.7) * scale
+        self.bbox = [round(v * scale) for v in (head.xMin, head.yMin, head.xMax, head.yMax)]
+        self.base = frozenset(self.glyphs[cp][0] for cp in _BASE_CHARS if cp in self.glyphs)
+        self.kerning = _kerning(font, self.base, scale)
+        self.codes = ['%04x' % gid for gid in range(len(glyph_ids))]
+        self.subsets: Dict[frozenset, Tuple[int, bytes]] = {}
+
+    def width(self, text: str) -> float:
+        glyphs, notdef, kerning = self.glyphs, self.notdef, self.kerning
+        metrics = [glyphs.get(ord(c), notdef) for c in text]
+        gids = [m[0] for m in metrics]
+        return sum(m[1] for m in metrics) + sum(kerning.get(pair, 0.0) for pair in zip(gids, gids[1:]))
+
+    def encode(self, text: str, used: Dict[int, str], missing: set) -> str:
+        """TJ array operand (Identity-H: 2-byte glyph ids, kerning as adjustments); records the glyphs.
+        Characters the font lacks are drawn as .notdef and only recorded in missing – gid 0 has no ToUnicode
+        entry, one code point per glyph id would make every missing character copy as the first one."""
+        glyphs, notdef, kerning, codes = self.glyphs, self.notdef, self.kerning, self.codes
+        for c in dict.fromkeys(text):
+            glyph = glyphs.get(ord(c))
+            if glyph is None:
+                missing.add(c)
+            else:
+                used.setdefault(glyph[0], c)
+        gids = [glyphs.get(ord(c), notdef)[0] for c in text]
+        out = ['[<']
+        start = 0
+        for i, pair in enumerate(zip(gids, gids[1:]), 1):
+            kern = kerning.get(pair)
+            if kern:
+                out.append(''.join([codes[g] for g in gids[start:i]]) + '> %.0f <' % -kern)
+                start = i
+        out.append(''.join([codes[g] for g in gids[start:]]) + '>]')
+        return ''.join(out)
+
+    def _subset(self, gids: frozenset) -> Tuple[int, bytes]:
+        """(length, deflated font program) – cached, most CVs share the same subset"""
+        data = self.subsets.get(gids)
+        if data is None:
+            font = TTFont(io.BytesIO(self.data), recalcTimestamp=False)
+            options = font_subset.Options()
+            options.retain_gids = True
+            options.layout_features = []
+            options.hinting = False
+            options.notdef_outline = True
+            options.name_IDs = []
+            options.drop_tables += ['GSUB', 'GPOS', 'GDEF', 'STAT', 'meta']
+            subsetter = font_subset.Subsetter(options)
+            subsetter.populate(gids=sorted(gids))
+            subsetter.subset(font)
+            buffer = io.BytesIO()
+            font.save(buffer)
+            data = self.subsets[gids] = (len(buffer.getvalue()), zlib.compress(buffer.getvalue(), 6))
+        return data
+
+    def embed(self, pdf: 'PDFWriter', used: Dict[int, str], number: int) -> None:
+        gids = sorted(used)
+        tag = ''.join(chr(65 + b % 26) for b in hashlib.sha256(repr(gids).encode()).digest()[:6])
+        name = f'{tag}+{self.name}'
+        length, data = self._subset(self.base | frozenset(gids))
+        fontfile = pdf.stream(data, f'/Length1 {length}', deflated=True)
+        descriptor = pdf.add(
+            f'<< /Type /FontDescriptor /FontName /{name} /Flags 32 /FontBBox [{" ".join(map(str, self.bbox))}] '
+            f'/ItalicAngle 0 /Ascent {self.ascent:.0f} /Descent {self.descent:.0f} /CapHeight {self.cap_height:.0f} '
+            f'/StemV 80 /FontFile2 {fontfile} 0 R >>')
+        widths = ' '.join([f'0 [{self.notdef[1]:.0f}]']
+                          + [f'{gid} [{self.glyphs[ord(used[gid])][1]:.0f}]' for gid in gids])
+        cid_font = pdf.add(
+            f'<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{name} '
+            f'/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> '
+            f'/FontDescriptor {descriptor} 0 R /DW 1000 /W [{widths}] /CIDToGIDMap /Identity >>')
+        to_unicode = pdf.stream(_to_unicode_cmap(used))
+        pdf.add(f'<< /Type /Font /Subtype /Type0 /BaseFont /{name} /Encoding /Identity-H '
+                f'/DescendantFonts [{cid_font} 0 R] /ToUnicode {to_unicode} 0 R >>', number)
+
+
+def _kerning(font: 'TTFont', glyphs: frozenset, scale: float) -> Dict[Tuple[int, int], float]:
+    """GPOS 'kern' pair adjustments (1/1000 em) between the given glyphs – browsers kern by default"""
+    pairs: Dict[Tuple[int, int], float] = {}
+    if 'GPOS' not in font:
+        return pairs
+    gpos = font['GPOS'].table
+    glyph_ids = font.getReverseGlyphMap()
+    lookups = sorted({index for record in gpos.FeatureList.FeatureRecord if record.FeatureTag == 'kern'
+                      for index in record.Feature.LookupListIndex})
+    for index in lookups:
+        lookup = gpos.LookupList.Lookup[index]
+        for table in lookup.SubTable:
+            if lookup.LookupType == 9:
+                table = table.ExtSubTable
+            if getattr(table, 'LookupType', 2) != 2:
+                continue
+            firsts = [(name, glyph_ids[name]) for name in table.Coverage.glyphs if glyph_ids[name] in glyphs]
+            if table.Format == 1:
+                by_name = dict(zip(table.Coverage.glyphs, table.PairSet))
+                for name, first in firsts:
+                    for record in by_name[name].PairValueRecord:
+                        second = glyph_ids[record.SecondGlyph]
+                        value = getattr(record.Value1, 'XAdvance', 0) if record.Value1 else 0
+                        if value and second in glyphs:
+                            pairs.setdefault((first, second), value * scale)
+            elif table.Format == 2:
+                seconds: Dict[int, List[int]] = {}
+                for name, cls in table.ClassDef2.classDefs.items():
+                    if glyph_ids[name] in glyphs:
+                        seconds.setdefault(cls, []).append(glyph_ids[name])
+                classes1 = table.ClassDef1.classDefs
+                for name, first in firsts:
+                    for cls, record in enumerate(table.Class1Record[classes1.get(name, 0)].Class2Record):
+                        value = getattr(record.Value1, 'XAdvance', 0) if record.Value1 else 0
+                        if value:
+                            for second in seconds.get(cls, ()):
+                                pairs.setdefault((first, second), value * scale)
+    return pairs
+
+
+class StandardFace:
+    """Base-14 fallback (Helvetica/Courier, WinAnsi) when fontTools or brotli is missing"""
+
+    def __init__(self, base: str, widths: Dict[str, float], default: float, ascent: float, descent: float):
+        self.base = base
+        self.widths = widths
+        self.default = default
+        self.ascent, self.descent = ascent, descent
+
+    def width(self, text: str) -> float:
+        widths, default = self.widths, self.default
+        return sum(widths.get(c, default) for c in text)
+
+    def encode(self, text: str, used: Dict[int, str], missing: set) -> str:
+        for c in dict.fromkeys(text):
+            try:
+                c.encode('cp1252')
+            except UnicodeEncodeError:
+                missing.add(c)
+        raw = text.encode('cp1252', errors='replace').decode('latin-1')
+        return '[(' + raw.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ')]'
+
+    def embed(self, pdf: 'PDFWriter', used: Dict[int, str], number: int) -> None:
+        pdf.add(f'<< /Type /Font /Subtype /Type1 /BaseFont /{self.base} /Encoding /WinAnsiEncoding >>', number)
+
+
+def _afm_widths(table: str, extra: Dict[str, int]) -> Dict[str, float]:
+    widths = {chr(0x20 + i): float(w) for i, w in enumerate(table.split())}
+    widths.update(extra)
+    return widths
+
+
+def _to_unicode_cmap(used: Dict[int, str]) -> bytes:
+    """ToUnicode CMap so text in the PDF stays searchable and copyable"""
+    entries = [f'<{gid:04x}> <{used[gid].encode("utf-16-be").hex()}>' for gid in sorted(used)]
+    chunks = [f'{len(entries[i:i + 100])} beginbfchar\n' + '\n'.join(entries[i:i + 100]) + '\nendbfchar'
+              for i in range(0, len(entries), 100)]
+    return ('/CIDInit /ProcSet findresource begin\n12 dict begin\nbegincmap\n'
+            '/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n'
+            '/CMapName /Adobe-Identity-UCS def\n/CMapType 2 def\n'
+            '1 begincodespacerange\n<0000> <ffff>\nendcodespacerange\n'
+            + '\n'.join(chunks) + '\nendcmap\nCMapName currentdict /CMapResource defineresource pop\nend\nend\n'
+            ).encode('ascii')
+
+
+_faces: Optional[Dict[str, Any]] = None
+
+
+def load_faces() -> Dict[str, Any]:
+    """Font faces by role, loaded once per process (WOFF2 decoding dominates a cold start)"""
+    global _faces
+    if _faces is None:
+        try:
+            if TTFont is None:
+                raise ImportError('fontTools')
+            _faces = {role: TrueTypeFace(FONT_DIR / name) for role, name in FONT_FILES.items()}
+        except Exception as e:
+            print(f"⚠  Geist-Fonts nicht einbettbar ({type(e).__name__}: {e}) – Fallback Helvetica/Courier "
+                  f"(pip install fonttools brotli)", file=sys.stderr)
+            _faces = {
+                'regular': StandardFace('Helvetica', _afm_widths(_HELVETICA, _HELVETICA_EXTRA), 556, 718, -207),
+                'medium': StandardFace('Helvetica-Bold', _afm_widths(_HELVETICA_BOLD, _HELVETICA_BOLD_EXTRA),
+                                       556, 718, -207),
+                'mono': StandardFace('Courier', {}, 600, 629, -157),
+            }
+    return _faces
+
+
+# --- PDF file structure ---
+
+class PDFWriter:
+    """Numbered objects, Flate streams and the xref table of a PDF 1.4 file"""
+
+    def __init__(self):
+        self.objects: List[Optional[bytes]] = []
+
+    def reserve(self) -> int:
+        self.objects.append(None)
+        return len(self.objects)
+
+    def add(self, body: str, number: Optional[int] = None) -> int:
+        data = body.encode('latin-1')
+        if number is None:
+            self.objects.append(data)
+            return len(self.objects)
+        self.objects[number - 1] = data
+        return number
+
+    def stream(self, data: bytes, entries: str = '', deflated: bool = False) -> int:
+        if not deflated:
+            data = zlib.compress(data, 6)
+        self.objects.append(b'<< /Length %d /Filter /FlateDecode %s>>\nstream\n' % (len(data), entries.encode('ascii'))
+                            + data + b'\nendstream')
+        return len(self.objects)
+
+    def image(self, photo: 'Photo') -> int:
+        """JPEG image XObject (passed through, DCTDecode)"""
+        self.objects.append(b'<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /%s '
+                            b'/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>\nstream\n'
+                            % (photo.width, photo.height, photo.colorspace.encode('ascii'), len(photo.data))
+                            + photo.data + b'\nendstream')
+        return len(self.objects)
+
+    def tobytes(self, root: int, info: int) -> bytes:
+        out = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = []
+        for number, body in enumerate(self.objects, 1):
+            offsets.append(len(out))
+            out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+        xref = len(out)
+        out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(self.objects) + 1)
+        out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+        # Document ID from the content: identical input → identical file
+        doc_id = hashlib.md5(bytes(out)).hexdigest().encode('ascii')
+        out += (b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R /ID [<%s> <%s>] >>\nstartxref\n%d\n%%%%EOF\n'
+                % (len(self.objects) + 1, root, info, doc_id, doc_id, xref))
+        return bytes(out)
+
+
+def _pdf_text(text: str) -> str:
+    """Text string for the document info (UTF-16BE with BOM)"""
+    return '<feff' + text.encode('utf-16-be').hex() + '>'
+
+
+def _pdf_uri(uri: str) -> str:
+    """URI action string: 7-bit ASCII (anything else percent-encoded), hex-written so ( ) \\ need no escaping"""
+    return '<' + ''.join(c if ord(c) < 128 else quote(c) for c in uri).encode('ascii').hex() + '>'
+
+
+# --- Drawing: one content stream per page, y measured from the top edge like the CSS layout ---
+
+class Style:
+    """Text style: font role, size (pt), colour, line-height factor, letter-spacing (em)"""
+    __slots__ = ('font', 'size', 'color', 'line', 'tracking')
+
+    def __init__(self, font: str, size: float, color: Tuple[float, float, float], line: float = RELAXED,
+                 tracking: float = 0.0):
+        self.font = font
+        self.size = size
+        self.color = color
+        self.line = line
+        self.tracking = tracking
+
+    @property
+    def leading(self) -> float:
+        return self.size * self.line
+
+
+LABEL = Style('mono', 0.72 * REM, ZINC['600'], tracking=0.05)    # section-label
+HERO = Style('medium', 1.4 * BODY, ZINC['900'], line=1.35)
+TEXT = Style('regular', BODY, ZINC['700'])
+MUTED = Style('regular', BODY, ZINC['600'])
+HEADING = Style('medium', REM, ZINC['900'])
+PERIOD = Style('regular', 0.85 * REM, ZINC['500'])
+SMALL = Style('regular', 0.85 * REM, ZINC['600'])
+CARD_TEXT = Style('regular', 0.75 * REM, ZINC['600'])
+GENERIC = Style('regular', 0.95 * REM, ZINC['700'])
+BADGE = Style('regular', 0.75 * REM, TEAL['600'])
+BADGE_URL = Style('regular', 0.65 * REM, TEAL['600'])     # a[href^="https://"]::after in print
+PILL = Style('medium', 0.68 * REM, TEAL['700'], tracking=0.01)
+PILL_ALT = Style('medium', 0.68 * REM, INDIGO['700'], tracking=0.01)
+
+_KAPPA = 0.5523
+_SVG_PATH = re.compile(r' d="([^"]*)"')
+_SVG_TOKEN = re.compile(r'[MLHVCZmlhvcz]|-?(?:\d+\.?\d*|\.\d+)(?:e-?\d+)?')
+
+
+class Canvas:
+    """Content stream of one page plus its link annotations"""
+
+    def __init__(self, fonts: 'FontSet'):
+        self.fonts = fonts
+        self.ops: List[str] = []
+        self.links: List[Tuple[float, float, float, float, str]] = []
+
+    def _color(self, rgb: Tuple[float, float, float], op: str) -> str:
+        return '%.3f %.3f %.3f %s' % (*rgb, op)
+
+    def text(self, x: float, y: float, text: str, style: Style) -> None:
+        """One line of text; y is the top of its line box (baseline centred as in CSS)"""
+        face = self.fonts.faces[style.font]
+        size = style.size
+        baseline = y + (style.leading - (face.ascent - face.descent) * size / 1000) / 2 + face.ascent * size / 1000
+        tracking = ' %.3f Tc' % (style.tracking * size) if style.tracking else ''
+        self.ops.append('BT /%s %.2f Tf%s %s 1 0 0 1 %.2f %.2f Tm %s TJ ET' % (
+            self.fonts.resource(style.font), size, tracking, self._color(style.color, 'rg'),
+            x, PAGE_H - baseline, face.encode(text, self.fonts.used[style.font], self.fonts.missing)))
+
+    def _rounded(self, x: float, y: float, w: float, h: float, r: float) -> str:
+        """Rounded rectangle path (PDF coordinates)"""
+        y = PAGE_H - y - h
+        r = min(r, w / 2, h / 2)
+        if not r:
+            return '%.2f %.2f %.2f %.2f re' % (x, y, w, h)
+        k = r * (1 - _KAPPA)
+        return ' '.join([
+            '%.2f %.2f m' % (x + r, y),
+            '%.2f %.2f l' % (x + w - r, y),
+            '%.2f %.2f %.2f %.2f %.2f %.2f c' % (x + w - k, y, x + w, y + k, x + w, y + r),
+            '%.2f %.2f l' % (x + w, y + h - r),
+            '%.2f %.2f %.2f %.2f %.2f %.2f c' % (x + w, y + h - k, x + w - k, y + h, x + w - r, y + h),
+            '%.2f %.2f l' % (x + r, y + h),
+            '%.2f %.2f %.2f %.2f %.2f %.2f c' % (x + k, y + h, x, y + h - k, x, y + h - r),
+            '%.2f %.2f l' % (x, y + r),
+            '%.2f %.2f %.2f %.2f %.2f %.2f c h' % (x, y + k, x + k, y, x + r, y),
+        ])
+
+    def box(self, x: float, y: float, w: float, h: float, fill=None, border=None, radius: float = 0) -> None:
+        """Filled and/or 1px-bordered box (border inside the box like border-box sizing)"""
+        if fill:
+            self.ops.append('%s %s f' % (self._color(fill, 'rg'), self._rounded(x, y, w, h, radius)))
+        if border:
+            half = PX / 2
+            self.ops.append('%s %.2f w %s S' % (self._color(border, 'RG'), PX,
+                                                self._rounded(x + half, y + half, w - PX, h - PX, radius - half)))
+
+    def disc(self, cx: float, cy: float, r: float, color: Tuple[float, float, float]) -> None:
+        self.ops.append('%s %s f' % (self._color(color, 'rg'), self._rounded(cx - r, cy - r, 2 * r, 2 * r, r)))
+
+    def icon(self, svg: str, x: float, y: float, size: float, color: Tuple[float, float, float]) -> None:
+        """SVG icon (viewBox 0 0 24 24, absolute M/L/H/V/C/Z paths) as a filled vector path"""
+        scale = size / 24
+        ops = []
+        for d in _SVG_PATH.findall(svg):
+            tokens = _SVG_TOKEN.findall(d)
+            cx = cy = 0.0
+            i = 0
+            command = 'M'
+            while i < len(tokens):
+                if tokens[i].isalpha():
+                    command = tokens[i].upper()
+                    i += 1
+                    if command == 'Z':
+                        ops.append('h')
+                        continue
+                args = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'C': 6}[command]
+                values = [float(t) for t in tokens[i:i + args]]
+                i += args
+                if command == 'H':
+                    cx = values[0]
+                elif command == 'V':
+                    cy = values[0]
+                else:
+                    cx, cy = values[-2], values[-1]
+                if command == 'C':
+                    points = [(values[j], values[j + 1]) for j in (0, 2, 4)]
+                else:
+                    points = [(cx, cy)]
+                ops.append(' '.join('%.2f %.2f' % (x + px * scale, PAGE_H - (y + py * scale)) for px, py in points)
+                           + {'M': ' m', 'C': ' c'}.get(command, ' l'))
+                if command == 'M':
+                    command = 'L'       # implicit lineto after moveto
+        self.ops.append('%s %s %s' % (self._color(color, 'rg'), ' '.join(ops),
+                                      'f*' if 'evenodd' in svg else 'f'))
+
+    def photo(self, image: 'Photo', x: float, y: float, size: float) -> None:
+        """Round portrait: object-cover + object-top, clipped to a circle"""
+        scale = size / min(image.width, image.height)
+        w, h = image.width * scale, image.height * scale
+        self.ops.append('q %s W n %.2f 0 0 %.2f %.2f %.2f cm /Im1 Do Q' % (
+            self._rounded(x, y, size, size, size / 2), w, h, x + (size - w) / 2, PAGE_H - y - h))
+
+    def link(self, x: float, y: float, w: float, h: float, uri: str) -> None:
+        self.links.append((x, PAGE_H - y - h, x + w, PAGE_H - y, uri))
+
+
+class FontSet:
+    """Faces of one document, their resource names and the glyphs the document used (for the subsets)"""
+
+    def __init__(self, faces: Dict[str, Any]):
+        self.faces = faces
+        self.names = {role: f'F{i}' for i, role in enumerate(faces, 1)}
+        self.used: Dict[str, Dict[int, str]] = {role: {} for role in faces}
+        self.missing: set = set()     # characters no face has a glyph for (drawn as .notdef / '?')
+
+    def resource(self, role: str) -> str:
+        return self.names[role]
+
+    def measure(self, text: str, style: Style) -> float:
+        return (self.faces[style.font].width(text) / 1000 + style.tracking * len(text)) * style.size
+
+    def wrap(self, text: str, style: Style, width: float) -> List[str]:
+        """Greedy line breaking at spaces (no hyphenation – like the browser with hyphens: manual)"""
+        space = self.measure(' ', style)
+        lines, line, line_width = [], [], 0.0
+        for word in text.split():
+            w = self.measure(word, style)
+            if line and line_width + space + w > width:
+                lines.append(' '.join(line))
+                line, line_width = [], 0.0
+            line_width = line_width + space + w if line else w
+            line.append(word)
+        if line:
+            lines.append(' '.join(line))
+        return lines
+
+
+# --- Layout: flow of boxes, paginated with the print rules of template.html ---
+
+class Box:
+    """Atomic block of fixed height; draw(canvas, y) paints it with its top edge at y"""
+    __slots__ = ('height', 'draw')
+
+    def __init__(self, height: float, draw: Callable[[Canvas, float], None] = None):
+        self.height = height
+        self.draw = draw
+
+
+class Space:
+    """Vertical margin – dropped at the top of a page (margins truncate at page breaks); padding is kept"""
+    __slots__ = ('height', 'truncate')
+
+    def __init__(self, height: float, truncate: bool = True):
+        self.height = height
+        self.truncate = truncate
+
+
+class Group:
+    """Consecutive items; keep=True is break-inside: avoid (ignored when the group exceeds a page)"""
+    __slots__ = ('items', 'keep')
+
+    def __init__(self, items: List[Any], keep: bool = False):
+        self.items = items
+        self.keep = keep
+
+    @property
+    def height(self) -> float:
+        return sum(item.height for item in self.items)
+
+
+class PageBreak:
+    """break-before: page"""
+    height = 0.0
+
+
+def paginate(flow: List[Any]) -> List[List[Tuple[float, Box]]]:
+    """Place the flow on pages: (top, box) per page"""
+    pages: List[List[Tuple[float, Box]]] = [[]]
+    y = TOP
+    page_height = BOTTOM - TOP
+
+    def new_page():
+        nonlocal y
+        pages.append([])
+        y = TOP
+
+    def place(item):
+        nonlocal y
+        if isinstance(item, Space):
+            if pages[-1] or not item.truncate:
+                y += item.height
+        elif isinstance(item, PageBreak):
+            if pages[-1]:
+                new_page()
+        elif isinstance(item, Group):
+            height = item.height
+            if item.keep and pages[-1] and y + height > BOTTOM and height <= page_height:
+                new_page()
+            for child in item.items:
+                place(child)
+        else:
+            if pages[-1] and y + item.height > BOTTOM:
+                new_page()
+            pages[-1].append((y, item))
+            y += item.height
+
+    for item in flow:
+        place(item)
+    return pages
+
+
+def _lines(fonts: FontSet, text: str, style: Style, x: float, width: float) -> List[Box]:
+    """Paragraph as one box per line (lines may break across pages)"""
+    def line_box(line):
+        return Box(style.leading, lambda canvas, y: canvas.text(x, y, line, style))
+    return [line_box(line) for line in fonts.wrap(text, style, width)]
+
+
+class Photo:
+    """Portrait image XObject data (JPEG, DCTDecode)"""
+    __slots__ = ('data', 'width', 'height', 'colorspace')
+
+    def __init__(self, data: bytes, width: int, height: int, colorspace: str):
+        self.data = data
+        self.width = width
+        self.height = height
+        self.colorspace = colorspace
+
+
+_JPEG_COLORSPACES = {1: 'DeviceGray', 3: 'DeviceRGB'}
+_photos: Dict[Tuple[str, int], Optional[Photo]] = {}
+
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int, int]]:
+    """(width, height, components) from the SOF marker of a JPEG"""
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker == 0xFF or marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            i += 2 if marker != 0xFF else 1
+            continue
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = int.from_bytes(data[i + 5:i + 7], 'big')
+            width = int.from_bytes(data[i + 7:i + 9], 'big')
+            return width, height, data[i + 9]
+        i += 2 + int.from_bytes(data[i + 2:i + 4], 'big')
+    return None
+
+
+def load_photo(photo: str) -> Optional[Photo]:
+    """Greyscale square crop (object-top) with Pillow, else the JPEG as is; cached per process"""
+    path = Path(photo)
+    if not path.is_absolute() and not path.exists():
+        path = SCRIPT_DIR / photo          # HTML-relative default (assets/…) also works from elsewhere
+    try:
+        stat = path.stat()
+    except OSError:
+        print(f"⚠  Foto nicht gefunden: {photo}", file=sys.stderr)
+        return None
+    key = (str(path.resolve()), stat.st_mtime_ns)
+    if key in _photos:
+        return _photos[key]
+
+    data = path.read_bytes()
+    result = None
+    if Image is not None:
+        size = round(PHOTO / PX * 2)       # 2x of the 110px CSS box
+        with Image.open(io.BytesIO(data)) as image:
+            image = ImageOps.fit(ImageOps.exif_transpose(image).convert('L'), (size, size),
+                                 Image.LANCZOS, centering=(0.5, 0.0))
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=85, optimize=True)
+        result = Photo(buffer.getvalue(), size, size, 'DeviceGray')
+    else:
+        info = _jpeg_size(data) if data[:2] == b'\xff\xd8' else None
+        if info and info[2] in _JPEG_COLORSPACES:
+            result = Photo(data, info[0], info[1], _JPEG_COLORSPACES[info[2]])
+        else:
+            print(f"⚠  Foto nur als JPEG (Graustufen/RGB) ohne Pillow einbettbar: {photo}", file=sys.stderr)
+    _photos[key] = result
+    return result
+
+
+class PDFRenderer:
+    """Lay out one parsed CV (CVParser.data) in the print design and serialise it as PDF"""
+
+    def __init__(self, gen, data, photo_path: Optional[str] = 'assets/Jan_Musiedlak_Foto.jpeg', lang: str = 'de'):
+        self.gen = gen
+        self.data = data
+        self.lang = lang
+        self.photo = load_photo(photo_path) if photo_path else None
+        self.fonts = FontSet(load_faces())
+        self.page_count = 0
+
+    # --- Blocks
+
+    def _label(self, title: str) -> Box:
+        return Box(LABEL.leading, lambda canvas, y: canvas.text(LEFT, y, title.upper(), LABEL))
+
+    def _with_label(self, title: str, margin: float, items: List[Any]) -> Group:
+        """Section label kept with the first block below it (section-label: break-after: avoid)"""
+        first = [self._label(title), Space(margin)] + items[:1]
+        return Group([Group(first, keep=True)] + items[1:])
+
+    def _header(self) -> List[Any]:
+        h = self.data.header
+        fonts = self.fonts
+        text_x = LEFT + PHOTO + tw(8)
+        text_w = LEFT + WIDTH - text_x
+        name_style = Style('medium', 1.5 * BODY, ZINC['900'], line=1.1)
+        title_style = Style('regular', REM, ZINC['700'])
+
+        name_lines = fonts.wrap(h.name or '', name_style, text_w)
+        title_lines = fonts.wrap(h.title or '', title_style, text_w)
+
+        # Badges: (icon, text, style, href) – https links print their URL instead of the label
+        icons = {'location': self.gen._SVG_LOCATION, 'email': self.gen._SVG_EMAIL,
+                 'phone': self.gen._SVG_PHONE, 'linkedin': self.gen._SVG_LINKEDIN}
+        badges = [(icons[kind], text, BADGE_URL if kind == 'linkedin' else BADGE, href)
+                  for kind, text, href in self.gen.contact_links(h.contact)]
+
+        icon = 14 * PX
+        pad_x, pad_y = tw(3), tw(1)
+        placed = []                  # (x, row, width, badge)
+        rows = [0.0]
+        x = text_x
+        for badge in badges:
+            content = max(icon, badge[2].leading)
+            width = PX * 2 + pad_x * 2 + icon + tw(1.5) + fonts.measure(badge[1], badge[2])
+            if x > text_x and x + width > text_x + text_w:
+                rows.append(0.0)
+                x = text_x
+            placed.append((x, len(rows) - 1, width, badge))
+            rows[-1] = max(rows[-1], content + pad_y * 2 + PX * 2)
+            x += width + tw(2)
+        row_tops = [sum(rows[:i]) + tw(2) * i for i in range(len(rows))]
+        badges_h = row_tops[-1] + rows[-1] if badges else 0.0
+
+        name_h = len(name_lines) * name_style.leading
+        badges_top = name_h + tw(3) + len(title_lines) * title_style.leading + tw(6)
+        height = max(PHOTO, badges_top + badges_h)
+
+        def draw(canvas, y):
+            if self.photo:
+                canvas.photo(self.photo, LEFT, y, PHOTO)
+            line_y = y
+            for line in name_lines:
+                canvas.text(text_x, line_y, line, name_style)
+                line_y += name_style.leading
+            line_y += tw(3)
+            for line in title_lines:
+                canvas.text(text_x, line_y, line, title_style)
+                line_y += title_style.leading
+            for bx, row, width, (svg_icon, text, style, href) in placed:
+                by = y + badges_top + row_tops[row]
+                bh = rows[row]
+                canvas.box(bx, by, width, bh, fill=TEAL['50'], border=TEAL['100'], radius=6 * PX)
+                cx = bx + PX + pad_x
+                canvas.icon(svg_icon, cx, by + (bh - icon) / 2, icon, TEAL['400'])
+                canvas.text(cx + icon + tw(1.5), by + (bh - style.leading) / 2, text, style)
+                if href:
+                    canvas.link(bx, by, width, bh, href)
+
+        return [Box(height, draw), Space(tw(10))]
+
+    def _profil(self, section) -> List[Any]:
+        items = []
+        tagline = self.data.header.tagline or ''
+        if tagline:
+            items += _lines(self.fonts, tagline, HERO, LEFT, WIDTH)
+        paragraphs = [item.text for item in section.content if item.type == 'text']
+        for i, text in enumerate(paragraphs):
+            items.append(Space(tw(3) if i else tw(4)))
+            items += _lines(self.fonts, text, TEXT, LEFT, min(WIDTH, MEASURE))
+        return items + [Space(tw(10))]
+
+    def _job(self, job) -> Group:
+        """Two-column grid row (9rem | 1fr, gap-x-6), kept on one page (no-break)"""
+        fonts = self.fonts
+        x = LEFT + 9 * REM + tw(6)
+        width = min(LEFT + WIDTH - x, MEASURE)
+        period, location = self.gen.split_period(job.period)
+        heading = self.gen.job_heading(job)
+
+        heading_lines = fonts.wrap(heading, HEADING, width)
+        items = []
+        for i, line in enumerate(heading_lines):
+            def draw(canvas, y, line=line, first=not i):
+                if first and period.strip():
+                    canvas.text(LEFT, y, period.strip(), PERIOD)
+                canvas.text(x, y, line, HEADING)
+            items.append(Box(HEADING.leading, draw))
+        if location.strip():
+            items.append(Space(tw(0.5)))
+            items += _lines(fonts, location.strip(), PERIOD, x, width)
+        if job.description is not None:
+            items.append(Space(tw(2)))
+            items += _lines(fonts, ' '.join(job.description), MUTED, x, width)
+        if job.bullets is not None:
+            items.append(Space(tw(2)))
+            indent = x + tw(4)
+            for i, bullet in enumerate(job.bullets):
+                if i:
+                    items.append(Space(tw(1)))
+                lines = _lines(fonts, bullet, MUTED, indent, width - tw(4))
+                if lines:
+                    text_draw = lines[0].draw
+
+                    def draw(canvas, y, text_draw=text_draw):
+                        text_draw(canvas, y)
+                        canvas.disc(indent - 0.55 * MUTED.size, y + MUTED.leading / 2, 0.17 * MUTED.size,
+                                    MUTED.color)
+                    lines[0] = Box(MUTED.leading, draw)
+                items += lines
+        return Group(items, keep=True)
+
+    def _berufserfahrung(self, section) -> List[Any]:
+        jobs = []
+        for i, job in enumerate(section.subsections):
+            if i:
+                jobs.append(Space(tw(10)))
+            jobs.append(self._job(job))
+        return [self._with_label(section.title, tw(8), jobs), Space(tw(16))]
+
+    def _ausbildung(self, section) -> List[Any]:
+        items = [self._label(section.title), Space(tw(8))]
+        for uni, degree, period in self.gen.education_entries(section):
+            items += _lines(self.fonts, uni, HEADING, LEFT, WIDTH)
+            if degree:
+                items += _lines(self.fonts, degree, SMALL, LEFT, WIDTH)
+            if period:
+                items += _lines(self.fonts, period, PERIOD, LEFT, WIDTH)
+        return [Group(items, keep=True), Space(tw(16))]
+
+    def _card_grid(self, cards: List[Tuple[str, str]]) -> Group:
+        """ref-grid: two columns (gap-4), cards of a row share its height; kept on one page"""
+        fonts = self.fonts
+        gap = tw(4)
+        width = (WIDTH - gap) / 2
+        pad_y, pad_x = 1.4 * REM, 1.5 * REM
+        inner = width - 2 * (pad_x + PX)
+        laid = []
+        for title, description in cards:
+            title_lines = fonts.wrap(title, HEADING, inner)
+            text_lines = fonts.wrap(description, CARD_TEXT, inner)
+            height = (2 * (pad_y + PX) + len(title_lines) * HEADING.leading + tw(2)
+                      + len(text_lines) * CARD_TEXT.leading)
+            laid.append((title_lines, text_lines, height))
+
+        items = []
+        for row in range(0, len(laid), 2):
+            pair = laid[row:row + 2]
+            height = max(card[2] for card in pair)
+
+            def draw(canvas, y, pair=pair, height=height):
+                for col, (title_lines, text_lines, _) in enumerate(pair):
+                    x = LEFT + col * (width + gap)
+                    canvas.box(x, y, width, height, fill=ZINC['50'], border=ZINC['200'], radius=8 * PX)
+                    line_y = y + PX + pad_y
+                    for line in title_lines:
+                        canvas.text(x + PX + pad_x, line_y, line, HEADING)
+                        line_y += HEADING.leading
+                    line_y += tw(2)
+                    for line in text_lines:
+                        canvas.text(x + PX + pad_x, line_y, line, CARD_TEXT)
+                        line_y += CARD_TEXT.leading
+            if row:
+                items.append(Space(gap, truncate=False))
+            items.append(Box(height, draw))
+        return Group(items, keep=True)
+
+    def _pills(self, bullets: List[str]) -> List[Box]:
+        """ref-tag pills (flex-wrap gap-2); '~' switches to ref-tag-alt"""
+        fonts = self.fonts
+        pad_y, pad_x = 0.2 * REM, 0.6 * REM
+        height = PILL.leading + 2 * (pad_y + PX)
+        rows: List[List[Tuple[float, float, str, Style]]] = [[]]
+        style = PILL
+        x = LEFT
+        for bullet in bullets:
+            if bullet.strip() == '~':
+                style = PILL_ALT
+                continue
+            width = fonts.measure(bullet, style) + 2 * (pad_x + PX)
+            if rows[-1] and x + width > LEFT + WIDTH:
+                rows.append([])
+                x = LEFT
+            rows[-1].append((x, width, bullet, style))
+            x += width + tw(2)
+
+        def row_box(row):
+            def draw(canvas, y):
+                for x, width, text, style in row:
+                    fill, border = (TEAL['50'], TEAL['200']) if style is PILL else (INDIGO['50'], INDIGO['200'])
+                    canvas.box(x, y, width, height, fill=fill, border=border, radius=4 * PX)
+                    canvas.text(x + PX + pad_x, y + PX + pad_y, text, style)
+            return Box(height, draw)
+
+        items = []
+        for i, row in enumerate(r for r in rows if r):
+            if i:
+                items.append(Space(tw(2), truncate=False))
+            items.append(row_box(row))
+        return items
+
+    def _hero(self, section) -> List[Any]:
+        paragraphs = [item.text for item in section.content if item.type == 'text']
+        if not paragraphs:
+            return []
+        return _lines(self.fonts, paragraphs[0], HERO, LEFT, WIDTH) + [Space(tw(10))]
+
+    def _schwerpunkte(self, section) -> List[Any]:
+        cards = []
+        methods = []
+        for sub in section.subsections:
+            if self.gen.is_method_list(sub):
+                methods = [Group(_lines(self.fonts, sub.title, HEADING, LEFT, WIDTH) + [Space(tw(3))]
+                                 + self._pills(sub.bullets or []), keep=True)]
+            else:
+                cards.append((sub.title, ' '.join(sub.content)))
+        intro = self._hero(section)
+        if cards:
+            intro += [self._card_grid(cards), Space(tw(10))]
+        blocks = [Group(intro, keep=True)] if intro else []
+        return [self._with_label(section.title, tw(8), blocks + methods), Space(tw(16))]
+
+    def _haltung(self, section) -> List[Any]:
+        cards = [(sub.title, ' '.join(sub.content)) for sub in section.subsections]
+        blocks = self._hero(section) + [self._card_grid(cards)]
+        return [PageBreak(), self._with_label(section.title, tw(4), blocks), Space(tw(16))]
+
+    def _sprachen(self, section) -> List[Any]:
+        languages = ' · '.join(item.text for item in section.content if item.type == 'bullet')
+        items = [self._label(section.title), Space(tw(4))] + _lines(self.fonts, languages, SMALL, LEFT, WIDTH)
+        return [Group(items, keep=True)]
+
+    def _generic(self, section) -> List[Any]:
+        items = []
+        for item in section.content:
+            if item.type == 'text':
+                items.append(Group(_lines(self.fonts, item.text, GENERIC, LEFT, WIDTH) + [Space(tw(3))]))
+            elif item.type == 'bullet':
+                items.append(Group(_lines(self.fonts, f'• {item.text}', GENERIC, LEFT, WIDTH)))
+        return [self._with_label(section.title, tw(8), items), Space(tw(14))]
+
+    def _section(self, section) -> List[Any]:
+        render = {
+            'profil': self._profil,
+            'berufserfahrung': self._berufserfahrung,
+            'ausbildung': self._ausbildung,
+            'schwerpunkte': self._schwerpunkte,
+            'haltung': self._haltung,
+            'sprachen': self._sprachen,
+        }.get(section.type, self._generic)
+        return render(section)
+
+    def flow(self) -> List[Any]:
+        """Zones as in template.html (print): white1 pt-12 pb-2, zinc50 py-0, white2 py-12"""
+        groups = self.gen.zone_sections(self.data.sections)
+        flow: List[Any] = [Space(tw(12), truncate=False)] + self._header()
+        for section in groups['white1']:
+            flow += self._section(section)
+        flow.append(Space(tw(2), truncate=False))
+        for section in groups['zinc50']:
+            flow += self._section(section)
+        flow.append(Space(tw(12), truncate=False))
+        for section in groups['white2']:
+            flow += self._section(section)
+        return flow
+
+    # --- Output
+
+    def render(self) -> bytes:
+        """Complete PDF file"""
+        pages = paginate(self.flow())
+        self.page_count = len(pages)
+        pdf = PDFWriter()
+        catalog = pdf.reserve()
+        page_tree = pdf.reserve()
+        font_refs = {role: pdf.reserve() for role in self.fonts.faces}
+        image = pdf.image(self.photo) if self.photo else None
+
+        fonts = ' '.join(f'/{self.fonts.names[role]} {number} 0 R' for role, number in font_refs.items())
+        xobjects = f' /XObject << /Im1 {image} 0 R >>' if image else ''
+        resources = f'<< /Font << {fonts} >>{xobjects} >>'
+        kids = []
+        for boxes in pages:
+            canvas = Canvas(self.fonts)
+            for y, box in boxes:
+                if box.draw:
+                    box.draw(canvas, y)
+            contents = pdf.stream('\n'.join(canvas.ops).encode('latin-1'))
+            annots = [pdf.add(f'<< /Type /Annot /Subtype /Link /Rect [{x0:.2f} {y0:.2f} {x1:.2f} {y1:.2f}] '
+                              f'/Border [0 0 0] /A << /S /URI /URI {_pdf_uri(uri)} >> >>')
+                      for x0, y0, x1, y1, uri in canvas.links]
+            annots_entry = f' /Annots [{" ".join(f"{a} 0 R" for a in annots)}]' if annots else ''
+            kids.append(pdf.add(f'<< /Type /Page /Parent {page_tree} 0 R /MediaBox [0 0 {PAGE_W:.2f} {PAGE_H:.2f}] '
+                                f'/Resources {resources} /Contents {contents} 0 R{annots_entry} >>'))
+
+        for role, number in font_refs.items():
+            self.fonts.faces[role].embed(pdf, self.fonts.used[role], number)
+        pdf.add(f'<< /Type /Pages /Kids [{" ".join(f"{k} 0 R" for k in kids)}] /Count {len(kids)} >>', page_tree)
+        pdf.add(f'<< /Type /Catalog /Pages {page_tree} 0 R /Lang ({"en" if self.lang == "en" else "de"}) >>', catalog)
+
+        h = self.data.header
+        title = f'{h.name or ""} – {h.title or ""}' if h.title else (h.name or '')
+        info = pdf.add(f'<< /Title {_pdf_text(title)} /Author {_pdf_text(h.name or "")} '
+                       f'/Creator (generate-pdf.py) >>')
+        return pdf.tobytes(catalog, info)
+
+
+# --- Pipeline ---
+
+def render_pdf(gen, markdown_file: str, output_file: str, photo_file: str, lang: str, models=None) -> Tuple[int, bool]:
+    """Parse + lay out + write one CV (atomic, skipped when byte-identical); returns page count and whether it changed"""
+    parser = gen.parse_markdown(markdown_file, models)
+    renderer = PDFRenderer(gen, parser.data, photo_file, lang)
+    changed = gen.write_if_changed(Path(output_file), renderer.render())
+    if renderer.fonts.missing:
+        print(f"⚠  {markdown_file}: Zeichen fehlen im Font (im PDF als Platzhalter): "
+              f"{' '.join(sorted(renderer.fonts.missing))}", file=sys.stderr)
+    return renderer.page_count, changed
+
+
+_worker_gen = None
+_worker_models = None
+
+
+def _init_worker(cache_dir: Optional[str]) -> None:
+    """Process pool initializer: generator module and fonts once per worker"""
+    global _worker_gen, _worker_models
+    _worker_gen = load_generator()
+    _worker_models = _worker_gen.model_cache_for(cache_dir)
+    load_faces()
+
+
+def _render_file(markdown_file: str, output_file: str, photo_file: str, lang: str) -> Tuple[str, str, str]:
+    """One PDF; returns (markdown, output, error) – error is '' on success"""
+    try:
+        render_pdf(_worker_gen, markdown_file, output_file, photo_file, lang, _worker_models)
+        return markdown_file, output_file, ''
+    except Exception as e:
+        return markdown_file, output_file, f'{type(e).__name__}: {e}'
+
+
+def render_batch(gen, inputs: List[Path], output_dir: str, photo_file: str, lang: str,
+                 jobs: Optional[int] = None, cache_dir: Optional[str] = None) -> int:
+    """Render many CVs across a process pool; prints one status line per file, returns failure count"""
+    outputs = gen.batch_outputs(inputs, output_dir, '.pdf')
+    tasks = [(str(md), str(output), photo_file, lang) for md, output in zip(inputs, outputs)]
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(tasks)))
+    chunksize = max(1, len(tasks) // (workers * 4))
+
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache_dir,)) as pool:
+        for markdown_file, output_file, error in pool.map(_render_file, *zip(*tasks), chunksize=chunksize):
+            if error:
+                failures += 1
+                print(f"✗ Fehler: {markdown_file}: {error}", file=sys.stderr)
+            else:
+                print(f"✓ Generated: {output_file}")
+
+    print(f"{len(tasks) - failures}/{len(tasks)} PDFs generated ({workers} workers)")
+    return failures
+
+
+def main():
+    """Main entry point"""
+    if len(sys.argv) < 2:
+        print("Usage: python3 generate-pdf.py <markdown> [-o OUTPUT.pdf] [-p PHOTO] [-l LANG] [--cache DIR]")
+        print("       python3 generate-pdf.py --batch <dir|glob> -o OUTPUT_DIR [-p PHOTO] [-l LANG] [-j JOBS] [--cache DIR]")
+        sys.exit(1)
+
+    markdown_file = sys.argv[1]
+    output_file = None
+    photo_file = 'assets/Jan_Musiedlak_Foto.jpeg'
+    lang = 'de'
+    batch = None
+    jobs = None
+    cache_dir = None
+
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '-o' and i+1 < len(sys.argv):
+            output_file = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '-p' and i+1 < len(sys.argv):
+            photo_file = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '-l' and i+1 < len(sys.argv):
+            lang = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--batch' and i+1 < len(sys.argv):
+            batch = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '-j' and i+1 < len(sys.argv):
+            jobs = int(sys.argv[i+1])
+            i += 2
+        elif sys.argv[i] == '--cache' and i+1 < len(sys.argv):
+            cache_dir = sys.argv[i+1]
+            i += 2
+        else:
+            i += 1
+
+    gen = load_generator()
+
+    # Batch mode: directory or glob → one PDF per markdown file in OUTPUT_DIR
+    if batch is not None:
+        inputs = gen.batch_inputs(batch)
+        if not inputs:
+            print(f"✗ Keine Markdown-Dateien gefunden: {batch}", file=sys.stderr)
+            sys.exit(1)
+        failures = render_batch(gen, inputs, output_file or '.', photo_file, lang, jobs, cache_dir)
+        sys.exit(1 if failures else 0)
+
+    output_file = output_file or str(Path(markdown_file).with_suffix('.pdf').name)
+    pages, changed = render_pdf(gen, markdown_file, output_file, photo_file, lang, gen.model_cache_for(cache_dir))
+    print(f"✓ Generated: {output_file} ({pages} Seiten)" if changed else f"· Unverändert: {output_file} ({pages} Seiten)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+CV Corpus Index
+Parses a corpus of CV markdown files (same format as CV_Jan_Musiedlak_final.md) once and keeps a
+persistent inverted index of methods, stations, job titles, periods and languages. Queries read the
+index through mmap (binary search over a sorted term table) and answer in milliseconds; re-indexing
+only parses files whose content changed.
+"""
+
+import sys
+import os
+import re
+import json
+import glob
+import mmap
+import time
+import struct
+import hashlib
+import contextlib
+import importlib.util
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional, Set, Tuple
+
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_INDEX = SCRIPT_DIR / '.cv-index'
+INDEX_VERSION = 2
+FIELDS = ('method', 'station', 'title', 'period', 'year', 'lang')
+
+# index.bin: header, term table (sorted by UTF-8 bytes), term strings, postings (uint32 doc ids), doc paths (JSON)
+_MAGIC = b'CVIX\x00\x00\x00\x01'
+_HEADER = struct.Struct('<8sIIQQQQ')       # magic, terms, docs, table, strings, postings, docs offsets
+_ENTRY = struct.Struct('<IIII')             # string offset, string length, postings offset, postings count
+_WORD = re.compile(r'\w+')
+
+
+def load_generator():
+    """Import generate-html.py (hyphenated file name → importlib)"""
+    spec = importlib.util.spec_from_file_location('generate_html', SCRIPT_DIR / 'generate-html.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def normalize(text: str) -> str:
+    """Case-folded, markdown emphasis removed, whitespace collapsed"""
+    return ' '.join(text.replace('**', '').replace('*', '').casefold().split())
+
+
+# --- Indexing: parsed model → terms ---
+
+_gen = None
+
+
+def _generator():
+    """generate-html.py, loaded once per process (pool workers included)"""
+    global _gen
+    if _gen is None:
+        _gen = load_generator()
+    return _gen
+
+
+def cv_terms(data: Any, this_year: int) -> List[str]:
+    """'field:phrase' and 'field:word' terms of one parsed CV"""
+    gen = _generator()
+    values: List[Tuple[str, str]] = []
+
+    def periods(period: str) -> None:
+        span, _ = gen.split_period(period)
+        if not span:
+            return
+        values.append(('period', span))
+        start, end = gen.iso_dates(span)
+        if start:
+            # An open end ("heute", "seit 2019") counts up to the year the file was indexed
+            last = int(end[:4]) if end else this_year if gen.is_open_ended(span) else int(start[:4])
+            values.extend(('year', str(year)) for year in range(int(start[:4]), max(int(start[:4]), last) + 1))
+
+    for section in data.sections:
+        if section.type == 'berufserfahrung':
+            for job in section.subsections:
+                values.append(('station', job.title))
+                if job.job_title:
+                    values.append(('title', job.job_title))
+                periods(job.period or '')
+        elif section.type == 'ausbildung':
+            for institution, _, period in gen.education_entries(section):
+                values.append(('station', institution))
+                periods(period)
+        elif section.type == 'schwerpunkte':
+            for sub in section.subsections:
+                if gen.is_method_list(sub):
+                    values.extend(('method', pill) for pill in gen.method_pills(sub.bullets))
+        elif section.type == 'sprachen':
+            values.extend(('lang', item.text) for item in section.content if item.type == 'bullet')
+
+    terms = set()
+    for field, value in values:
+        phrase = normalize(value)
+        if phrase:
+            terms.add(f'{field}:{phrase}')
+            terms.update(f'{field}:{word}' for word in _WORD.findall(phrase))
+    return sorted(terms)
+
+
+def index_file(path: str) -> Tuple[str, Optional[str], List[str], str]:
+    """(path, content hash, terms, error) – parse only, warnings are not printed; a file that cannot be read or
+    parsed is reported as its error instead of aborting the whole run"""
+    try:
+        raw = Path(path).read_bytes()
+        parser = _generator().parse_text(raw.decode('utf-8'))
+        terms = cv_terms(parser.data, time.localtime().tm_year)
+    except Exception as e:
+        return path, None, [], f'{type(e).__name__}: {e}'
+    return path, hashlib.sha256(raw).hexdigest(), terms, ''
+
+
+def corpus_files(patterns: List[str]) -> List[str]:
+    """Files, directories (all *.md inside) and globs → sorted unique markdown paths"""
+    files = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_file():
+            files.add(str(path))
+        elif path.is_dir():
+            files.update(str(p) for p in path.glob('*.md'))
+        else:
+            files.update(p for p in glob.glob(pattern, recursive=True) if p.endswith('.md'))
+    return sorted(files)
+
+
+def update_index(index_dir: Path, patterns: Optional[List[str]] = None, jobs: Optional[int] = None) -> Dict[str, int]:
+    """Bring the index up to date – only new or changed files (size/mtime, then content hash) are parsed"""
+    gen = _generator()
+    docs_path = index_dir / 'docs.json'
+    try:
+        state = json.loads(docs_path.read_text(encoding='utf-8'))
+        if state['version'] != [INDEX_VERSION, gen.PARSER_VERSION]:
+            state['docs'] = {}                  # parser or term rules changed: everything is re-parsed
+    except (OSError, ValueError, KeyError):
+        state = {'docs': {}}
+    sources = patterns or state.get('sources') or []
+    if not sources:
+        raise ValueError('keine Eingaben (Dateien, Verzeichnisse oder Globs) und kein bestehender Index')
+
+    old = state['docs']
+    docs: Dict[str, Dict[str, Any]] = {}
+    todo = []
+    for path in corpus_files(sources):
+        stat = os.stat(path)
+        doc = old.get(path)
+        if doc and doc['mtime_ns'] == stat.st_mtime_ns and doc['size'] == stat.st_size:
+            docs[path] = doc
+        else:
+            todo.append(path)
+            docs[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha': None, 'terms': []}
+
+    # Files whose content is unchanged (touched, checked out again) keep their terms
+    changed = []
+    for path in todo:
+        doc = old.get(path)
+        if doc and doc['sha'] == hashlib.sha256(Path(path).read_bytes()).hexdigest():
+            docs[path].update(sha=doc['sha'], terms=doc['terms'])
+        else:
+            changed.append(path)
+
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(changed) // gen.CHECK_FILES_PER_WORKER))
+    if workers == 1:
+        results = [index_file(path) for path in changed]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(index_file, changed, chunksize=max(1, len(changed) // (workers * 4))))
+    errors = 0
+    for path, digest, terms, error in results:
+        if error:
+            errors += 1
+            print(f"✗ {path}: {error}", file=sys.stderr)
+            del docs[path]
+        else:
+            docs[path].update(sha=digest, terms=terms)
+
+    removed = len(old.keys() - docs.keys())
+    if changed or removed or not (index_dir / 'index.bin').is_file():
+        write_index(index_dir / 'index.bin', docs)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    tmp = docs_path.with_name(f'docs.json.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps({'version': [INDEX_VERSION, gen.PARSER_VERSION], 'sources': sources, 'docs': docs},
+                              ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp, docs_path)
+    return {'docs': len(docs), 'parsed': len(changed) - errors, 'removed': removed, 'errors': errors}
+
+
+def write_index(path: Path, docs: Dict[str, Dict[str, Any]]) -> None:
+    """Inverted index from the per-file terms, written atomically (open readers keep their mapping)"""
+    paths = sorted(docs)
+    postings: Dict[bytes, List[int]] = {}
+    for doc_id, doc_path in enumerate(paths):
+        for term in docs[doc_path]['terms']:
+            postings.setdefault(term.encode('utf-8'), []).append(doc_id)
+
+    terms = sorted(postings)
+    table = bytearray()
+    strings = bytearray()
+    ids = array('I')
+    for term in terms:
+        table += _ENTRY.pack(len(strings), len(term), len(ids), len(postings[term]))
+        strings += term
+        ids.extend(postings[term])
+    if sys.byteorder == 'big':
+        ids.byteswap()
+    doc_blob = json.dumps(paths, ensure_ascii=False).encode('utf-8')
+
+    table_off = _HEADER.size
+    strings_off = table_off + len(table)
+    postings_off = strings_off + len(strings)
+    postings_off += -postings_off % 4          # uint32-aligned for zero-copy reads
+    docs_off = postings_off + len(ids) * 4
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp, 'wb') as out:
+        out.write(_HEADER.pack(_MAGIC, len(terms), len(paths), table_off, strings_off, postings_off, docs_off))
+        out.write(table)
+        out.write(strings)
+        out.write(b'\0' * (postings_off - strings_off - len(strings)))
+        out.write(ids.tobytes())
+        out.write(doc_blob)
+    os.replace(tmp, path)
+
+
+# --- Querying: mmap'ed index, AND / OR / prefix* ---
+
+class CVIndex:
+    """Read-only view of index.bin – terms and postings are read from the mapping on demand"""
+
+    def __init__(self, path: Path):
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.n_terms, self.n_docs, self.table_off,
+         self.strings_off, self.postings_off, self.docs_off) = _HEADER.unpack_from(self.mm)
+        if magic != _MAGIC:
+            raise ValueError(f'{path}: kein CV-Index (oder andere Version) – neu indexieren')
+        self._paths: Optional[List[str]] = None
+
+    def close(self) -> None:
+        self.mm.close()
+
+    @property
+    def paths(self) -> List[str]:
+        if self._paths is None:
+            self._paths = json.loads(self.mm[self.docs_off:].decode('utf-8'))
+        return self._paths
+
+    def _entry(self, i: int) -> Tuple[int, int, int, int]:
+        return _ENTRY.unpack_from(self.mm, self.table_off + i * _ENTRY.size)
+
+    def term(self, i: int) -> bytes:
+        offset, length, _, _ = self._entry(i)
+        start = self.strings_off + offset
+        return self.mm[start:start + length]
+
+    def postings(self, i: int) -> array:
+        _, _, offset, count = self._entry(i)
+        start = self.postings_off + offset * 4
+        ids = array('I')
+        ids.frombytes(self.mm[start:start + count * 4])
+        if sys.byteorder == 'big':
+            ids.byteswap()
+        return ids
+
+    def _lower_bound(self, key: bytes) -> int:
+        return bisect_left(range(self.n_terms), key, key=self.term)
+
+    def lookup(self, key: str, prefix: bool = False) -> Set[int]:
+        """Doc ids of one term, or of every term starting with key"""
+        raw = key.encode('utf-8')
+        i = self._lower_bound(raw)
+        found: Set[int] = set()
+        while i < self.n_terms:
+            term = self.term(i)
+            if term == raw or (prefix and term.startswith(raw)):
+                found.update(self.postings(i))
+            else:
+                break
+            i += 1
+        return found
+
+    def terms(self, prefix: str = '') -> Iterator[Tuple[str, int]]:
+        """(term, document count) for every term starting with prefix"""
+        raw = prefix.encode('utf-8')
+        for i in range(self._lower_bound(raw), self.n_terms):
+            term = self.term(i)
+            if not term.startswith(raw):
+                break
+            yield term.decode('utf-8'), self._entry(i)[3]
+
+
+_TOKEN = re.compile(r'\(|\)|[^\s()"]*"[^"]*"\*?|[^\s()]+')
+
+
+class QueryError(ValueError):
+    """Malformed query"""
+
+
+def parse_query(query: str) -> Any:
+    """'a b' and 'a AND b' → ('and', …), 'a OR b' → ('or', …), ( ) groups; AND binds tighter than OR.
+    A term is [field:]value[*] – value may be "quoted", * matches as prefix, no field means any field."""
+    tokens = _TOKEN.findall(query)
+    pos = 0
+
+    def peek() -> Optional[str]:
+        return tokens[pos] if pos < len(tokens) else None
+
+    def expr() -> Any:
+        nonlocal pos
+        parts = [conjunction()]
+        while peek() == 'OR':
+            pos += 1
+            parts.append(conjunction())
+        return parts[0] if len(parts) == 1 else ('or', parts)
+
+    def conjunction() -> Any:
+        nonlocal pos
+        parts = [atom()]
+        while peek() not in (None, 'OR', ')'):
+            if peek() == 'AND':
+                pos += 1
+            parts.append(atom())
+        return parts[0] if len(parts) == 1 else ('and', parts)
+
+    def atom() -> Any:
+        nonlocal pos
+        token = peek()
+        if token is None or token in ('AND', 'OR', ')'):
+            raise QueryError(f'Suchbegriff erwartet statt {token or "Ende der Anfrage"}')
+        pos += 1
+        if token == '(':
+            node = expr()
+            if peek() != ')':
+                raise QueryError("')' fehlt")
+            pos += 1
+            return node
+        field, sep, value = token.partition(':')
+        if not sep or field not in FIELDS:
+            if sep and '"' not in field:
+                raise QueryError(f'Unbekanntes Feld "{field}" (bekannt: {", ".join(FIELDS)})')
+            field, value = '', token
+        prefix = value.endswith('*')
+        value = normalize(value.rstrip('*').strip('"'))
+        if not value:
+            raise QueryError(f'Leerer Suchbegriff: {token}')
+        return ('term', field, value, prefix)
+
+    node = expr()
+    if peek() is not None:
+        raise QueryError(f'Unerwartet: {peek()}')
+    return node
+
+
+def evaluate(index: CVIndex, node: Any) -> Set[int]:
+    """Doc ids matching a parsed query"""
+    if node[0] == 'term':
+        _, field, value, prefix = node
+        found: Set[int] = set()
+        for name in ([field] if field else FIELDS):
+            found |= index.lookup(f'{name}:{value}', prefix)
+        return found
+    results = [evaluate(index, child) for child in node[1]]
+    if node[0] == 'and':
+        return set.intersection(*sorted(results, key=len))
+    return set.union(*results)
+
+
+def search(index_dir: Path, query: str) -> List[str]:
+    """Paths of the indexed CVs matching query, sorted"""
+    index = CVIndex(index_dir / 'index.bin')
+    try:
+        return sorted(index.paths[i] for i in evaluate(index, parse_query(query)))
+    finally:
+        index.close()
+
+
+def main():
+    """Main entry point"""
+    if len(sys.argv) < 2:
+        print("Usage: python3 index-cv.py <markdown|dir|glob>... [--index DIR] [-j JOBS]   # indexieren")
+        print("       python3 index-cv.py [--index DIR]                                 # aktualisieren")
+        print("       python3 index-cv.py -q QUERY [--index DIR] [--json]")
+        print("       python3 index-cv.py --terms [PREFIX] [--index DIR]")
+        print("Felder: " + ', '.join(FIELDS) + " – z. B. -q 'method:okr* AND (lang:englisch OR year:2019)'")
+        sys.exit(1)
+
+    index_dir = DEFAULT_INDEX
+    patterns = []
+    query = None
+    terms = None
+    jobs = None
+    as_json = False
+
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '--index' and i+1 < len(sys.argv):
+            index_dir = Path(sys.argv[i+1])
+            i += 2
+        elif sys.argv[i] in ('-q', '--query') and i+1 < len(sys.argv):
+            query = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--terms':
+            terms = ''
+            if i+1 < len(sys.argv) and not sys.argv[i+1].startswith('-'):
+                terms = sys.argv[i+1]
+                i += 1
+            i += 1
+        elif sys.argv[i] == '-j' and i+1 < len(sys.argv):
+            jobs = int(sys.argv[i+1])
+            i += 2
+        elif sys.argv[i] == '--json':
+            as_json = True
+            i += 1
+        elif not sys.argv[i].startswith('-'):
+            patterns.append(sys.argv[i])
+            i += 1
+        else:
+            i += 1
+
+    if query is not None or terms is not None:
+        if not (index_dir / 'index.bin').is_file():
+            print(f"✗ Kein Index in {index_dir} – erst python3 index-cv.py <dateien> ausführen", file=sys.stderr)
+            sys.exit(1)
+        if terms is not None:
+            index = CVIndex(index_dir / 'index.bin')
+            with contextlib.closing(index):
+                for term, count in index.terms(normalize(terms)):
+                    print(f'{count:>6}  {term}')
+            return
+        start = time.perf_counter()
+        try:
+            matches = search(index_dir, query)
+        except QueryError as e:
+            print(f"✗ Anfrage: {e}", file=sys.stderr)
+            sys.exit(1)
+        ms = (time.perf_counter() - start) * 1000
+        if as_json:
+            print(json.dumps({'query': query, 'matches': matches, 'ms': round(ms, 3)}, ensure_ascii=False, indent=1))
+        else:
+            for path in matches:
+                print(path)
+            print(f"✓ {len(matches)} Treffer ({ms:.1f} ms)", file=sys.stderr)
+        sys.exit(0 if matches else 1)
+
+    start = time.perf_counter()
+    try:
+        stats = update_index(index_dir, patterns, jobs)
+    except ValueError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✓ Index {index_dir}: {stats['docs']} CVs, {stats['parsed']} neu geparst, {stats['removed']} entfernt "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+    sys.exit(1 if stats['errors'] else 0)
+
+
+if __name__ == '__main__':
+    main()
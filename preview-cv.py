@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+CV Preview Server
+Serves the CV from memory while you edit: parsed model, compiled template and rendered
+sections stay loaded, the markdown, template.html and assets/ are watched, and the open
+browser tab reloads itself (Server-Sent Events) as soon as the re-rendered page is ready.
+"""
+
+import sys
+import hashlib
+import threading
+import time
+import importlib.util
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+SCRIPT_DIR = Path(__file__).parent
+LIVERELOAD_PATH = '/__livereload'
+LIVERELOAD_SNIPPET = (
+    '<script>new EventSource("%s").onmessage = function () { location.reload(); };</script>\n'
+    % LIVERELOAD_PATH
+)
+POLL_INTERVAL = 0.2        # seconds between mtime scans (each scan walks all of assets/)
+KEEPALIVE = 15             # seconds between SSE comments, keeps proxies from closing the stream
+
+
+def load_generator():
+    """Import generate-html.py (hyphenated file name → importlib)"""
+    spec = importlib.util.spec_from_file_location('generate_html', SCRIPT_DIR / 'generate-html.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class PreviewState:
+    """Rendered page plus everything needed to re-render it cheaply; version bumps wake the SSE streams"""
+
+    def __init__(self, gen, markdown_file: Path, photo_file: str, lang: str, css: Optional[str]):
+        self.gen = gen
+        self.markdown_file = markdown_file
+        self.photo_file = photo_file
+        self.lang = lang
+        self.css = css
+        self.fragments = gen.FragmentCache()          # in memory: only edited sections re-render
+        self.parser = None
+        self.page = (b'', '')                         # (body, etag) – replaced as one, never updated in place
+        self.version = 0
+        self.changed = threading.Condition()
+        self.mtimes = self._scan()
+        self._parse()
+        self._render()
+
+    def _scan(self) -> Dict[Path, int]:
+        """mtime of every watched file (markdown, template.html, assets/**)"""
+        mtimes = {}
+        watched = [self.markdown_file, self.gen.TEMPLATE_PATH, *(SCRIPT_DIR / 'assets').rglob('*')]
+        for path in watched:
+            try:
+                mtimes[path] = path.stat().st_mtime_ns
+            except OSError:
+                pass
+        return mtimes
+
+    def _parse(self) -> None:
+        text = self.markdown_file.read_text(encoding='utf-8')
+        self.parser = self.gen.CVParser.from_text(text)
+
+    def _render(self) -> None:
+        """Render into memory; a failure shows the error in the page instead of stopping the server"""
+        try:
+            generator = self.gen.HTMLGenerator(self.parser.data, self.photo_file, self.lang,
+                                               template=self.gen.load_template(), fragment_cache=self.fragments)
+            html = generator.generate()
+            if self.css:
+                html = self.gen.postprocess(html, str(SCRIPT_DIR / 'index.html'), {'css': self.css})
+        except Exception as e:
+            print(f"✗ Fehler: {type(e).__name__}: {e}", file=sys.stderr)
+            html = f'<!DOCTYPE html><html><body><pre>{type(e).__name__}: {e}</pre></body></html>'
+        at = html.rfind('</body>')
+        html = html[:at] + LIVERELOAD_SNIPPET + html[at:]
+        body = html.encode('utf-8')
+        self.page = body, '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+
+    def refresh(self) -> bool:
+        """Re-parse/re-render what the changed files affect; True if the page changed"""
+        mtimes = self._scan()
+        changed = {path for path in mtimes.keys() | self.mtimes.keys()
+                   if mtimes.get(path) != self.mtimes.get(path)}
+        self.mtimes = mtimes
+        if not changed:
+            return False
+
+        start = time.perf_counter()
+        try:
+            if self.markdown_file in changed:
+                self._parse()
+            if self.markdown_file in changed or self.gen.TEMPLATE_PATH in changed:
+                self._render()
+        except Exception as e:          # e.g. markdown saved half-way; the next save retries
+            print(f"✗ Fehler: {type(e).__name__}: {e}", file=sys.stderr)
+            return False
+        with self.changed:
+            self.version += 1
+            self.changed.notify_all()
+        names = ', '.join(sorted(p.name for p in changed))
+        print(f"↻ {names} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+        return True
+
+    def watch(self) -> None:
+        while True:
+            time.sleep(POLL_INTERVAL)
+            self.refresh()
+
+
+class PreviewHandler(SimpleHTTPRequestHandler):
+    """CV page from memory, live-reload stream, everything else as static files from the CV directory"""
+
+    state: PreviewState = None
+    page = '/'
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self, *args, **kwargs):
+        self._etag = None
+        super().__init__(*args, directory=str(SCRIPT_DIR), **kwargs)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path in (self.page, self.page + 'index.html'):
+            self._send_page()
+        elif path == LIVERELOAD_PATH:
+            self._stream_events()
+        else:
+            self._send_static()
+
+    def _not_modified(self, etag: str) -> bool:
+        if etag not in self.headers.get('If-None-Match', ''):
+            return False
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        return True
+
+    def _send_page(self):
+        body, etag = self.state.page
+        if self._not_modified(etag):
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_static(self):
+        try:
+            stat = Path(self.translate_path(self.path)).stat()
+        except OSError:
+            return super().do_GET()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if self._not_modified(etag):
+            return
+        self._etag = etag          # added by end_headers()
+        super().do_GET()
+
+    def end_headers(self):
+        if self._etag:
+            self.send_header('ETag', self._etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self._etag = None
+        super().end_headers()
+
+    def _stream_events(self):
+        """Server-Sent Events: one message per new version, comments as keepalive"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.close_connection = True
+        state = self.state
+        with state.changed:
+            seen = state.version
+        try:
+            while True:
+                with state.changed:
+                    state.changed.wait_for(lambda: state.version != seen, timeout=KEEPALIVE)
+                    version = state.version
+                if version != seen:
+                    seen = version
+                    self.wfile.write(f'data: {version}\n\n'.encode('ascii'))
+                else:
+                    self.wfile.write(b': keepalive\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_request(self, code='-', size='-'):
+        pass
+
+
+def main():
+    """Main entry point"""
+    markdown_file = SCRIPT_DIR / 'CV_Jan_Musiedlak_final.md'
+    photo_file = 'assets/Jan_Musiedlak_Foto.jpeg'
+    lang = 'de'
+    css = None
+    page = '/'
+    host = '127.0.0.1'
+    port = 8000
+
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '-p' and i+1 < len(sys.argv):
+            photo_file = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '-l' and i+1 < len(sys.argv):
+            lang = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--css' and i+1 < len(sys.argv):
+            css = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--at' and i+1 < len(sys.argv):
+            page = '/' + sys.argv[i+1].strip('/') + '/' if sys.argv[i+1].strip('/') else '/'
+            i += 2
+        elif sys.argv[i] == '--host' and i+1 < len(sys.argv):
+            host = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '--port' and i+1 < len(sys.argv):
+            port = int(sys.argv[i+1])
+            i += 2
+        elif sys.argv[i] in ('-h', '--help'):
+            print("Usage: python3 preview-cv.py [markdown] [-p PHOTO] [-l LANG] [--css inline] [--at URL_PATH]")
+            print("                             [--host HOST] [--port PORT]")
+            sys.exit(0)
+        elif not sys.argv[i].startswith('-'):
+            markdown_file = Path(sys.argv[i])
+            i += 1
+        else:
+            i += 1
+
+    state = PreviewState(load_generator(), markdown_file.resolve(), photo_file, lang, css)
+    PreviewHandler.state = state
+    PreviewHandler.page = page
+    threading.Thread(target=state.watch, daemon=True).start()
+
+    server = ThreadingHTTPServer((host, port), PreviewHandler)
+    server.daemon_threads = True
+    print(f"✓ Preview: http://{host}:{server.server_port}{page}  ({markdown_file.name}, Strg+C beendet)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,14 +3,34 @@
 # Publish CV to GitHub Pages
 # Pushes the cv/ directory to github.com/jlhoelter/cv
 #
+# Usage: ./publish-cv.sh [--dry-run] [--subtree]
+#
+#   (default)   Fast mode: commits the committed cv/ tree (HEAD:$CV_SUBTREE) directly on top of
+#               the published branch and pushes that single commit. No history split – cost does
+#               not grow with the workspace history.
+#   --dry-run   Only show what would change on the published branch.
+#   --subtree   Legacy mode: git subtree push (re-splits the whole history on every run).
+#               Don't mix with fast mode without force-pushing – the histories differ.
+#
 
 set -e
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-WORKSPACE_ROOT="$(cd "$SCRIPT_DIR/../../.." && pwd)"
-CV_SUBTREE="tracks/jobsuche/cv"
-REMOTE_REPO="git@github.com:jlhoelter/cv.git"
-BRANCH="main"
+WORKSPACE_ROOT="${WORKSPACE_ROOT:-$(cd "$SCRIPT_DIR/../../.." && pwd)}"
+CV_SUBTREE="${CV_SUBTREE:-tracks/jobsuche/cv}"
+REMOTE_REPO="${REMOTE_REPO:-git@github.com:jlhoelter/cv.git}"
+BRANCH="${BRANCH:-main}"
+PUBLISH_REF="refs/publish/cv"   # Local copy of the published branch tip
+
+DRY_RUN=false
+MODE=fast
+for arg in "$@"; do
+    case "$arg" in
+        --dry-run) DRY_RUN=true ;;
+        --subtree) MODE=subtree ;;
+        *) echo "Usage: $0 [--dry-run] [--subtree]"; exit 1 ;;
+    esac
+done
 
 echo "📤 Publishing CV to GitHub Pages..."
 echo "   Workspace: $WORKSPACE_ROOT"
@@ -21,7 +41,7 @@ echo ""
 cd "$WORKSPACE_ROOT"
 
 # Check if there are uncommitted changes in cv/
-if ! git diff --quiet HEAD -- "$CV_SUBTREE" 2>/dev/null; then
+if ! $DRY_RUN && ! git diff --quiet HEAD -- "$CV_SUBTREE" 2>/dev/null; then
     echo "⚠️  Warning: You have uncommitted changes in cv/"
     echo "   Commit them first or they won't be published."
     echo ""
@@ -33,9 +53,56 @@ if ! git diff --quiet HEAD -- "$CV_SUBTREE" 2>/dev/null; then
     fi
 fi
 
-# Push subtree
-echo "🚀 Pushing to GitHub Pages..."
-git subtree push --prefix="$CV_SUBTREE" "$REMOTE_REPO" "$BRANCH"
+if [ "$MODE" = "subtree" ]; then
+    if $DRY_RUN; then
+        echo "ℹ️  --dry-run is only supported in fast mode."
+        exit 1
+    fi
+    # Push subtree
+    echo "🚀 Pushing to GitHub Pages (git subtree)..."
+    git subtree push --prefix="$CV_SUBTREE" "$REMOTE_REPO" "$BRANCH"
+else
+    SOURCE="$(git rev-parse HEAD)"
+    TREE="$(git rev-parse "HEAD:$CV_SUBTREE")"
+
+    # Fetch only the published branch tip (incremental – just the new objects)
+    REMOTE_TIP=""
+    if git ls-remote --exit-code "$REMOTE_REPO" "refs/heads/$BRANCH" >/dev/null 2>&1; then
+        git fetch --quiet --no-tags "$REMOTE_REPO" "+refs/heads/$BRANCH:$PUBLISH_REF"
+        REMOTE_TIP="$(git rev-parse "$PUBLISH_REF")"
+    fi
+
+    if [ -n "$REMOTE_TIP" ] && [ "$(git rev-parse "$REMOTE_TIP^{tree}")" = "$TREE" ]; then
+        echo "✅ Already up to date – nothing to publish."
+        exit 0
+    fi
+
+    # Summary: changed files and workspace commits since the last fast publish
+    echo "📋 Changes to publish:"
+    if [ -n "$REMOTE_TIP" ]; then
+        git --no-pager diff --stat "$REMOTE_TIP" "$TREE"
+        LAST_SOURCE="$(git log -1 --format=%B "$REMOTE_TIP" | sed -n 's/^Source: //p')"
+        if [ -n "$LAST_SOURCE" ] && git merge-base --is-ancestor "$LAST_SOURCE" "$SOURCE" 2>/dev/null; then
+            echo ""
+            echo "   Commits since last publish:"
+            git --no-pager log --format='   %h %s' "$LAST_SOURCE..$SOURCE" -- "$CV_SUBTREE"
+        fi
+    else
+        echo "   (new branch) $(git ls-tree -r --name-only "$TREE" | wc -l | tr -d ' ') files"
+    fi
+    echo ""
+
+    if $DRY_RUN; then
+        echo "ℹ️  Dry run – nothing pushed."
+        exit 0
+    fi
+
+    echo "🚀 Pushing to GitHub Pages..."
+    COMMIT="$(git commit-tree "$TREE" ${REMOTE_TIP:+-p "$REMOTE_TIP"} \
+        -m "Publish CV ($(git log -1 --format=%h "$SOURCE"))" -m "Source: $SOURCE")"
+    git push --quiet "$REMOTE_REPO" "$COMMIT:refs/heads/$BRANCH"
+    git update-ref "$PUBLISH_REF" "$COMMIT"
+fi
 
 echo ""
 echo "✅ CV published successfully!"